@@ -0,0 +1,362 @@
+"""Teacher analytics: where a class struggles, from incrementally kept aggregates.
+
+Every attempt (a submitted exam part or a graded exercise) is appended to
+the ``attempts`` log in ``$FRENZGURU_ANALYTICS_DB`` and, in the same
+transaction, added to small aggregate tables: counts and sums per class and
+Prüfungsteil or vocab category, and histograms of the score per criterion
+and of the time on task. The dashboard only reads the aggregates (a few
+thousand rows however many attempts there are) and rolls them up with
+pandas/NumPy. `rebuild()` recomputes them from the log, e.g. after the bins
+change.
+
+    python analytics.py --simulate 1000000   # ingest and page-load timings
+"""
+import argparse
+import hmac
+import os
+import re
+import sqlite3
+import tempfile
+import time
+import uuid
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import duplicates
+from content import exam_info, vocab_data
+
+DB_PATH = os.environ.get("FRENZGURU_ANALYTICS_DB", ".analytics.db")
+# The dashboard is only offered when this is set, and asks for it
+TEACHER_PASSWORD = os.environ.get("FRENZGURU_TEACHER_PASSWORD", "")
+PARTS = ["Lesen", "Hören", "Schreiben", "Sprechen"]
+CRITERIA = {
+    "Lesen": ["Richtig"],
+    "Hören": ["Richtig"],
+    "Schreiben": ["Erfüllung", "Kohärenz", "Wortschatz", "Strukturen"],
+    "Sprechen": ["Erfüllung", "Kohärenz", "Wortschatz", "Strukturen", "Aussprache"],
+}
+CRITERION_COLUMNS = list(dict.fromkeys(c for names in CRITERIA.values() for c in names))
+OVERALL = "Gesamt"
+# "Score at least 60% overall ..."
+PASS_THRESHOLD = int(re.search(r"(\d+)%", exam_info["Passing Requirements"]["requirements"][0])[1]) / 100
+SCORE_BINS = 10  # 0-10%, ..., 90-100%
+TIME_EDGES_MINUTES = np.array([0, 1, 2, 5, 10, 15, 20, 30, 45, 60, 90])
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS attempts (
+    ts REAL, class TEXT, student TEXT, part TEXT, category TEXT, score REAL, seconds REAL,
+    {", ".join(f'"{c}" REAL' for c in CRITERION_COLUMNS)}
+);
+CREATE TABLE IF NOT EXISTS part_stats (
+    class TEXT, part TEXT, attempts INTEGER, graded INTEGER, passed INTEGER,
+    score_sum REAL, seconds_sum REAL, PRIMARY KEY (class, part)
+);
+CREATE TABLE IF NOT EXISTS category_stats (
+    class TEXT, category TEXT, attempts INTEGER, graded INTEGER, passed INTEGER,
+    score_sum REAL, PRIMARY KEY (class, category)
+);
+CREATE TABLE IF NOT EXISTS score_bins (
+    class TEXT, part TEXT, criterion TEXT, bin INTEGER, count INTEGER,
+    PRIMARY KEY (class, part, criterion, bin)
+);
+CREATE TABLE IF NOT EXISTS time_bins (
+    class TEXT, part TEXT, bin INTEGER, count INTEGER, PRIMARY KEY (class, part, bin)
+);
+"""
+_AGGREGATES = {
+    "part_stats": (["class", "part"], ["attempts", "graded", "passed", "score_sum", "seconds_sum"]),
+    "category_stats": (["class", "category"], ["attempts", "graded", "passed", "score_sum"]),
+    "score_bins": (["class", "part", "criterion", "bin"], ["count"]),
+    "time_bins": (["class", "part", "bin"], ["count"]),
+}
+
+
+def _connect(path: str = None):
+    db = sqlite3.connect(path or DB_PATH, timeout=30)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.executescript(_SCHEMA)
+    return db
+
+
+def _frame(attempts) -> pd.DataFrame:
+    """Attempts as a frame with one column per criterion (NaN if not graded)."""
+    frame = pd.DataFrame(attempts)
+    for column in ["category", "score", *CRITERION_COLUMNS]:
+        if column not in frame:
+            frame[column] = np.nan
+    criteria = frame[CRITERION_COLUMNS]
+    # Without an overall score, the mean of the graded criteria stands in
+    frame["score"] = frame["score"].fillna(criteria.mean(axis=1))
+    frame["class"] = frame["class"].fillna("").astype(str)
+    return frame
+
+
+def _deltas(frame: pd.DataFrame) -> dict:
+    """How much each aggregate row grows by when `frame` is added."""
+    frame = frame.assign(passed=(frame["score"] >= PASS_THRESHOLD).astype(int))
+    deltas = {}
+    deltas["part_stats"] = frame.groupby(["class", "part"]).agg(
+        attempts=("part", "size"), graded=("score", "count"), passed=("passed", "sum"),
+        score_sum=("score", "sum"), seconds_sum=("seconds", "sum"))
+    deltas["category_stats"] = frame.dropna(subset=["category"]).groupby(["class", "category"]).agg(
+        attempts=("category", "size"), graded=("score", "count"), passed=("passed", "sum"),
+        score_sum=("score", "sum"))
+
+    scores = frame.rename(columns={"score": OVERALL}).melt(
+        id_vars=["class", "part"], value_vars=[OVERALL, *CRITERION_COLUMNS],
+        var_name="criterion").dropna(subset=["value"])
+    scores["bin"] = np.minimum((scores["value"].to_numpy() * SCORE_BINS).astype(int), SCORE_BINS - 1)
+    deltas["score_bins"] = scores.groupby(["class", "part", "criterion", "bin"]).size().to_frame("count")
+
+    minutes = frame["seconds"].dropna() / 60
+    times = frame.loc[minutes.index, ["class", "part"]].assign(
+        bin=np.searchsorted(TIME_EDGES_MINUTES, minutes.to_numpy(), side="right") - 1)
+    deltas["time_bins"] = times.groupby(["class", "part", "bin"]).size().to_frame("count")
+    return deltas
+
+
+def _apply(db, deltas: dict):
+    for table, (keys, values) in _AGGREGATES.items():
+        delta = deltas[table].reset_index()
+        if delta.empty:
+            continue
+        columns = keys + values
+        updates = ", ".join(f"{v} = {v} + excluded.{v}" for v in values)
+        db.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}",
+            delta[columns].astype(object).itertuples(index=False, name=None))
+
+
+def record_many(attempts, path: str = None):
+    """Append attempts and update the aggregates in one transaction.
+
+    Each attempt has `class`, `student`, `part`, `seconds` and optionally a
+    vocab `category`, an overall `score` and per-criterion scores (all
+    scores as fractions of the maximum).
+    """
+    frame = _frame(attempts)
+    if frame.empty:
+        return
+    if "ts" not in frame:
+        frame["ts"] = time.time()
+    with closing(_connect(path)) as db, db:
+        columns = ["ts", "class", "student", "part", "category", "score", "seconds", *CRITERION_COLUMNS]
+        frame[columns].to_sql("attempts", db, if_exists="append", index=False)
+        _apply(db, _deltas(frame))
+
+
+def record(class_id: str, student: str, part: str, *, seconds: float = None, score: float = None,
+           category: str = None, criteria: dict = None, path: str = None):
+    """Record one attempt, see `record_many`."""
+    record_many([{"class": class_id, "student": student, "part": part, "seconds": seconds,
+                  "score": score, "category": category, **(criteria or {})}], path)
+
+
+def learner() -> tuple:
+    """(class, student) of this browser session, kept in the page URL.
+
+    Teachers hand out links with ``?klasse=...``; the student id
+    (``?schueler=...``) is created on the first visit.
+    """
+    if "schueler" not in st.query_params:
+        st.query_params["schueler"] = uuid.uuid4().hex[:12]
+    return st.query_params.get("klasse", ""), st.query_params["schueler"]
+
+
+def rebuild(path: str = None, chunksize: int = 200_000):
+    """Recompute all aggregates from the attempts log."""
+    with closing(_connect(path)) as db, db:
+        for table in _AGGREGATES:
+            db.execute(f"DELETE FROM {table}")
+        for chunk in pd.read_sql_query("SELECT * FROM attempts", db, chunksize=chunksize):
+            _apply(db, _deltas(_frame(chunk)))
+
+
+# --- Rollups --- #
+def load(path: str = None) -> dict:
+    """All aggregate tables as frames."""
+    with closing(_connect(path)) as db:
+        return {table: pd.read_sql_query(f"SELECT * FROM {table}", db) for table in _AGGREGATES}
+
+
+def _select(frame: pd.DataFrame, class_id):
+    return frame if class_id is None else frame[frame["class"] == class_id]
+
+
+def _with_rates(stats: pd.DataFrame) -> pd.DataFrame:
+    graded = stats["graded"].replace(0, np.nan)
+    return stats.assign(pass_rate=stats["passed"] / graded, mean_score=stats["score_sum"] / graded)
+
+
+def part_summary(aggregates: dict, class_id=None) -> pd.DataFrame:
+    stats = _select(aggregates["part_stats"], class_id).groupby("part")[
+        ["attempts", "graded", "passed", "score_sum", "seconds_sum"]].sum()
+    stats = _with_rates(stats).assign(mean_minutes=stats["seconds_sum"] / stats["attempts"] / 60)
+    return stats.reindex([p for p in PARTS if p in stats.index])
+
+
+def category_summary(aggregates: dict, class_id=None) -> pd.DataFrame:
+    stats = _select(aggregates["category_stats"], class_id).groupby("category")[
+        ["attempts", "graded", "passed", "score_sum"]].sum()
+    return _with_rates(stats).sort_values("pass_rate")
+
+
+def _histogram(frame: pd.DataFrame, columns: str, bins: int) -> pd.DataFrame:
+    """Counts per bin (rows) and `columns` value, with empty bins as 0."""
+    table = frame.pivot_table(index="bin", columns=columns, values="count", aggfunc="sum", fill_value=0)
+    return table.reindex(range(bins), fill_value=0)
+
+
+def _median_bins(histogram: pd.DataFrame) -> pd.Series:
+    """Index of the bin holding the median, per column."""
+    counts = histogram.to_numpy()
+    cumulative = counts.cumsum(axis=0)
+    medians = (cumulative >= cumulative[-1] / 2).argmax(axis=0)
+    return pd.Series(np.where(cumulative[-1] > 0, medians, -1), index=histogram.columns)
+
+
+def score_distribution(aggregates: dict, part: str, class_id=None) -> pd.DataFrame:
+    """Share of scores per 10% bin (rows) and criterion (columns)."""
+    bins = _select(aggregates["score_bins"], class_id)
+    histogram = _histogram(bins[bins["part"] == part], "criterion", SCORE_BINS)
+    histogram = histogram[[c for c in [OVERALL, *CRITERIA[part]] if c in histogram]]
+    histogram.index = [f"{10 * b}–{10 * (b + 1)}%" for b in histogram.index]
+    return histogram / histogram.sum().replace(0, np.nan)
+
+
+def time_distribution(aggregates: dict, class_id=None) -> pd.DataFrame:
+    """Number of attempts per time-on-task bin (rows) and Prüfungsteil (columns)."""
+    histogram = _histogram(_select(aggregates["time_bins"], class_id), "part", len(TIME_EDGES_MINUTES))
+    histogram = histogram[[p for p in PARTS if p in histogram]]
+    upper = [*TIME_EDGES_MINUTES[1:], None]
+    histogram.index = [f"{low}–{high} min" if high else f"> {low} min"
+                       for low, high in zip(TIME_EDGES_MINUTES, upper)]
+    return histogram
+
+
+# --- Dashboard --- #
+def _percent(value):
+    return "–" if pd.isna(value) else f"{value:.0%}"
+
+
+def _authorized() -> bool:
+    """Ask for FRENZGURU_TEACHER_PASSWORD once per browser session."""
+    if st.session_state.get("teacher"):
+        return True
+    password = st.text_input("Passwort für Lehrkräfte:", type="password", key="teacher_password")
+    if password and TEACHER_PASSWORD and hmac.compare_digest(password, TEACHER_PASSWORD):
+        st.session_state["teacher"] = True
+        return True
+    if password:
+        st.error("Falsches Passwort.")
+    return False
+
+
+def render():
+    """Render the teacher dashboard page of `apps.py`."""
+    st.header("📊 Auswertung für Lehrkräfte")
+    if not _authorized():
+        return
+    aggregates = load()
+    classes = sorted(aggregates["part_stats"]["class"].unique())
+    if not classes:
+        st.info("Noch keine Versuche aufgezeichnet.")
+        duplicates.render()
+        return
+    choice = st.selectbox("Klasse:", ["Alle Klassen", *classes])
+    class_id = None if choice == "Alle Klassen" else choice
+
+    st.subheader("Prüfungsteile")
+    parts = part_summary(aggregates, class_id)
+    st.dataframe(pd.DataFrame({
+        "Versuche": parts["attempts"],
+        "Bewertet": parts["graded"],
+        "Bestanden": parts["pass_rate"].map(_percent),
+        "Ø Punkte": parts["mean_score"].map(_percent),
+        "Ø Zeit (min)": parts["mean_minutes"].round(1),
+    }))
+    st.bar_chart(parts["pass_rate"].fillna(0).rename("Bestehensquote"))
+    st.caption(f"Bestanden heißt mindestens {PASS_THRESHOLD:.0%} der Punkte.")
+    weak = parts[parts["pass_rate"] < PASS_THRESHOLD].index.tolist()
+    if weak:
+        st.warning(f"Unter {PASS_THRESHOLD:.0%} Bestehensquote: {', '.join(weak)}")
+
+    st.subheader("Punkteverteilung nach Kriterium")
+    part = st.radio("Prüfungsteil:", PARTS, horizontal=True, key="analytics_part")
+    distribution = score_distribution(aggregates, part, class_id)
+    if distribution.notna().any().any():
+        st.bar_chart(distribution.fillna(0), stack=False)
+    else:
+        st.caption("Keine bewerteten Versuche.")
+
+    st.subheader("Bearbeitungszeit")
+    st.bar_chart(time_distribution(aggregates, class_id), stack=False)
+
+    st.subheader("Wortschatz-Kategorien")
+    categories = category_summary(aggregates, class_id)
+    if categories.empty:
+        st.caption("Keine bewerteten Wortschatz-Übungen.")
+    else:
+        st.dataframe(pd.DataFrame({
+            "Versuche": categories["attempts"],
+            "Bestanden": categories["pass_rate"].map(_percent),
+            "Ø Punkte": categories["mean_score"].map(_percent),
+        }))
+
+    duplicates.render(class_id)
+
+
+def _simulate(attempts: int, batch: int, path: str):
+    rng = np.random.default_rng(7)
+    categories = np.array(list(vocab_data))
+    start = time.perf_counter()
+    for offset in range(0, attempts, batch):
+        n = min(batch, attempts - offset)
+        part = rng.choice(PARTS, n)
+        ability = rng.beta(5, 3, n)
+        frame = {
+            "class": rng.choice([f"B1-{i:02d}" for i in range(40)], n),
+            "student": rng.integers(0, 5000, n).astype(str),
+            "part": part,
+            "seconds": rng.gamma(4, 300, n),
+            "category": np.where(rng.random(n) < 0.3, rng.choice(categories, n), None),
+        }
+        for criterion in CRITERION_COLUMNS:
+            applies = np.isin(part, [p for p in PARTS if criterion in CRITERIA[p]])
+            value = np.clip(ability + rng.normal(0, 0.1, n), 0, 1)
+            frame[criterion] = np.where(applies, value, np.nan)
+        record_many(frame, path)
+    ingest = time.perf_counter() - start
+
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        aggregates = load(path)
+        part_summary(aggregates)
+        category_summary(aggregates, "B1-03")
+        for part in PARTS:
+            score_distribution(aggregates, part)
+        time_distribution(aggregates)
+        timings.append(time.perf_counter() - start)
+    rows = sum(len(frame) for frame in aggregates.values())
+    print(f"{attempts} attempts ingested in {ingest:.1f}s ({attempts / ingest:,.0f}/s)")
+    print(f"aggregate rows: {rows}, page load (read + rollups): "
+          f"{1000 * min(timings):.1f} ms min, {1000 * max(timings):.1f} ms max")
+    print(part_summary(aggregates)[["attempts", "pass_rate", "mean_score", "mean_minutes"]].round(3))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Teacher analytics aggregates.")
+    parser.add_argument("--simulate", type=int, metavar="ATTEMPTS")
+    parser.add_argument("--batch", type=int, default=100_000)
+    parser.add_argument("--rebuild", action="store_true", help="recompute aggregates from the log")
+    parser.add_argument("--db", default=None)
+    args = parser.parse_args()
+    if args.simulate:
+        _simulate(args.simulate, args.batch, args.db or os.path.join(tempfile.mkdtemp(), "analytics.db"))
+    elif args.rebuild:
+        rebuild(args.db)
@@ -0,0 +1,343 @@
+"""Headless asyncio HTTP service for the AI, content and grading functions.
+
+One warm process holds the Ollama routing, prompt templates, conversations
+and study content, so the Streamlit apps (with ``FRENZGURU_API_URL`` set)
+and other clients such as the LMS integration stay thin.
+
+    python api.py --port 8600
+
+Endpoints (JSON in, JSON out):
+
+    POST /v1/ask        {"question", "template"?, "task"?, "session"?, "stream"?}
+    POST /v1/feedback   {"text", "template"?, "stream"?, "async"?, "student"?, "class"?}
+    GET  /v1/jobs/{key}  (an async feedback job)
+    GET  /v1/jobs        (queue depth, wait time, throughput)
+    GET  /v1/vocab?q=wegen
+    GET  /v1/exercises
+    GET  /v1/exercises/{part}?index=0
+    GET  /v1/cloze/{name}
+    POST /v1/cloze/{name}/grade  {"answers": [...]} or {"submissions": [[...], ...]}
+    POST /v1/reading/{index}/grade  {"answer": "..."} or {"answers": [...], "llm"?}
+    POST /v1/prefetch   {"part", "index", "session"?}  (predicted questions, answered while idle)
+    GET  /v1/prefetch   (prefetch and response cache report)
+    GET  /v1/conversations   (conversation memory report)
+    GET  /metrics, /healthz
+
+With ``"stream": true`` the answer is sent as newline-delimited JSON:
+``{"delta": "..."}`` lines followed by ``{"done": true}``. Without it, a
+failed model call is answered with 502 and ``{"error": "..."}``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+from contextlib import aclosing, nullcontext
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+import cloze
+import content
+import conversations
+import feedback_jobs
+import llm_metrics
+import model_router
+import prefetch
+import prompts
+import reading_grader
+
+# Blocking Ollama calls run on this pool; content endpoints never touch it
+LLM_WORKERS = int(os.environ.get("FRENZGURU_API_LLM_WORKERS", "16"))
+
+_executor = ThreadPoolExecutor(max_workers=LLM_WORKERS, thread_name_prefix="frenzguru-llm")
+_DONE = object()
+
+
+def _build_vocab_index():
+    index = {}
+    for category, items in content.vocab_data.items():
+        for word, meaning in items.items():
+            entry = {"category": category, "word": word, "meaning": meaning}
+            index.setdefault(word.lower(), []).append(entry)
+    return index
+
+
+VOCAB_INDEX = _build_vocab_index()
+
+
+async def _iterate_in_thread(make_iterator):
+    """Drive a blocking iterator on the LLM pool and yield its items here.
+
+    When the consumer stops early (client disconnected), the iterator is
+    closed at its next item, which ends the Ollama generation.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    cancelled = threading.Event()
+
+    def run():
+        iterator = make_iterator()
+        try:
+            for item in iterator:
+                if cancelled.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            iterator.close()
+            loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+
+    loop.run_in_executor(_executor, run)
+    try:
+        while (item := await queue.get()) is not _DONE:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        cancelled.set()
+
+
+async def _answer(request, body, user_input, template_name, task, session_id=None):
+    template = prompts.get(template_name)
+    kwargs = {
+        "template": template.name,
+        "template_version": template.version,
+        "system": template.system,
+    }
+    prompt = template.render(user_input)
+
+    def _conversation():
+        return conversations.session(session_id) if session_id else nullcontext()
+
+    def _generate():
+        with _conversation() as conversation:
+            return model_router.generate(task, prompt, conversation=conversation, **kwargs)
+
+    def _stream():
+        with _conversation() as conversation:
+            yield from model_router.stream(task, prompt, conversation=conversation, **kwargs)
+
+    if not body.get("stream"):
+        loop = asyncio.get_running_loop()
+        try:
+            response = await loop.run_in_executor(_executor, _generate)
+        except Exception as e:  # the model failed, not the request
+            llm_metrics.logger.warning(json.dumps({"event": "api_model_error", "task": task, "error": repr(e)}))
+            return web.json_response({"error": str(e) or repr(e)}, status=502)
+        return web.json_response({"answer": response["response"], "model": response.get("model")})
+
+    stream = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+    await stream.prepare(request)
+    try:
+        async with aclosing(_iterate_in_thread(_stream)) as deltas:
+            async for delta in deltas:
+                await stream.write(json.dumps({"delta": delta}, ensure_ascii=False).encode() + b"\n")
+        await stream.write(b'{"done": true}\n')
+    except ConnectionResetError:
+        llm_metrics.increment("api_streams_cancelled")
+        return stream
+    except Exception as e:
+        await stream.write(json.dumps({"error": str(e)}).encode() + b"\n")
+    await stream.write_eof()
+    return stream
+
+
+async def _json_body(request):
+    try:
+        body = await request.json()
+    except json.JSONDecodeError:
+        raise web.HTTPBadRequest(text="Request body must be JSON")
+    if not isinstance(body, dict):
+        raise web.HTTPBadRequest(text="Request body must be a JSON object")
+    return body
+
+
+def _template_arg(body, default):
+    name = body.get("template", default)
+    if name not in prompts.TEMPLATES:
+        raise web.HTTPBadRequest(text=f"Unknown template: {name}")
+    return name
+
+
+async def ask(request):
+    body = await _json_body(request)
+    question = (body.get("question") or "").strip()
+    if not question:
+        raise web.HTTPBadRequest(text="'question' is required")
+    task = body.get("task") or model_router.classify(question)
+    if task not in model_router.ROUTES:
+        raise web.HTTPBadRequest(text=f"Unknown task: {task}")
+    return await _answer(request, body, question, _template_arg(body, "experte_qa"), task,
+                         body.get("session"))
+
+
+async def feedback(request):
+    body = await _json_body(request)
+    text = (body.get("text") or "").strip()
+    if not text:
+        raise web.HTTPBadRequest(text="'text' is required")
+    template = _template_arg(body, "schreiben_feedback")
+    if body.get("async"):
+        key = await asyncio.to_thread(feedback_jobs.submit, str(body.get("student") or "api"), text, template,
+                                      class_id=str(body.get("class") or ""))
+        return web.json_response({"job": key}, status=202)
+    return await _answer(request, body, text, template, model_router.FEEDBACK)
+
+
+async def job(request):
+    result = await asyncio.to_thread(feedback_jobs.get, request.match_info["key"])
+    if result is None:
+        raise web.HTTPNotFound(text="Unknown job")
+    return web.json_response(result)
+
+
+async def job_stats(request):
+    return web.json_response(await asyncio.to_thread(feedback_jobs.stats))
+
+
+async def vocab(request):
+    query = request.query.get("q", "").strip().lower()
+    if not query:
+        raise web.HTTPBadRequest(text="'q' is required")
+    matches = VOCAB_INDEX.get(query)
+    if matches is None:
+        matches = [entry for word, entries in VOCAB_INDEX.items() if query in word
+                   for entry in entries][:20]
+    return web.json_response({"query": query, "matches": matches})
+
+
+async def exercise_parts(request):
+    return web.json_response({part: len(items) for part, items in content.exercises.items()})
+
+
+async def exercise(request):
+    part = request.match_info["part"]
+    items = content.exercises.get(part)
+    if items is None:
+        raise web.HTTPNotFound(text=f"Unknown part: {part}")
+    if "index" in request.query:
+        try:
+            index = int(request.query["index"])
+            item = items[index]
+        except (ValueError, IndexError):
+            raise web.HTTPBadRequest(text=f"'index' must be between 0 and {len(items) - 1}")
+    else:
+        index = random.randrange(len(items))
+        item = items[index]
+    return web.json_response({"part": part, "index": index, "exercise": item})
+
+
+def _cloze_set(request):
+    name = request.match_info["name"]
+    if name not in cloze.SETS:
+        raise web.HTTPNotFound(text=f"Unknown cloze set: {name}")
+    return cloze.SETS[name]
+
+
+async def cloze_set(request):
+    exercise = _cloze_set(request)
+    return web.json_response({"name": exercise.name, "title": exercise.title,
+                              "instruction": exercise.instruction,
+                              "items": [item.text for item in exercise.items]})
+
+
+async def cloze_grade(request):
+    exercise = _cloze_set(request)
+    body = await _json_body(request)
+    size = len(exercise.items)
+    if "submissions" in body:
+        submissions = body["submissions"]
+        if not isinstance(submissions, list) or any(
+                not isinstance(row, list) or len(row) != size for row in submissions):
+            raise web.HTTPBadRequest(text=f"'submissions' must be lists of {size} answers")
+        correct = exercise.grade_batch(submissions) if submissions else []
+        return web.json_response({"correct": [row.tolist() for row in correct],
+                                  "scores": [int(row.sum()) for row in correct]})
+    answers = body.get("answers")
+    if not isinstance(answers, list) or len(answers) != size:
+        raise web.HTTPBadRequest(text=f"'answers' must be a list of {size} answers")
+    results = exercise.grade([str(answer) for answer in answers])
+    return web.json_response({"results": [vars(result) for result in results],
+                              "score": sum(result.correct for result in results)})
+
+
+async def reading_grade(request):
+    try:
+        index = int(request.match_info["index"])
+    except ValueError:
+        raise web.HTTPNotFound(text="Unknown Lesen exercise")
+    if index not in content.reading_references:
+        raise web.HTTPNotFound(text=f"No reference answers for Lesen exercise {index}")
+    body = await _json_body(request)
+    answers = body.get("answers", [body.get("answer")] if "answer" in body else None)
+    if not isinstance(answers, list) or not answers or not all(isinstance(a, str) for a in answers):
+        raise web.HTTPBadRequest(text="'answer' (string) or 'answers' (list of strings) is required")
+    loop = asyncio.get_running_loop()
+    grades = await loop.run_in_executor(
+        _executor, lambda: reading_grader.grade_batch(index, answers, judge=body.get("llm", True)))
+    grades = [vars(grade) for grade in grades]
+    return web.json_response(grades[0] if "answers" not in body else {"grades": grades})
+
+
+async def prefetch_exercise(request):
+    body = await _json_body(request)
+    items = content.exercises.get(body.get("part"))
+    if items is None:
+        raise web.HTTPBadRequest(text="'part' must be an exercise part")
+    index = body.get("index")
+    if not isinstance(index, int) or not 0 <= index < len(items):
+        raise web.HTTPBadRequest(text=f"'index' must be between 0 and {len(items) - 1}")
+    questions = await asyncio.to_thread(prefetch.submit, body["part"], items[index],
+                                        body.get("session") or None)
+    return web.json_response({"questions": [vars(question) for question in questions]})
+
+
+async def prefetch_report(request):
+    return web.json_response(prefetch.PREFETCHER.report())
+
+
+async def conversation_report(request):
+    return web.json_response(await asyncio.to_thread(conversations.STORE.report))
+
+
+async def metrics(request):
+    return web.Response(text=llm_metrics.render_prometheus(),
+                        content_type="text/plain", charset="utf-8")
+
+
+async def healthz(request):
+    return web.json_response({"ok": True})
+
+
+def create_app() -> web.Application:
+    feedback_jobs.start_workers()
+    app = web.Application()
+    app.add_routes([
+        web.post("/v1/ask", ask),
+        web.post("/v1/feedback", feedback),
+        web.get("/v1/vocab", vocab),
+        web.get("/v1/exercises", exercise_parts),
+        web.get("/v1/exercises/{part}", exercise),
+        web.get("/v1/cloze/{name}", cloze_set),
+        web.post("/v1/cloze/{name}/grade", cloze_grade),
+        web.post("/v1/reading/{index}/grade", reading_grade),
+        web.get("/v1/jobs", job_stats),
+        web.get("/v1/jobs/{key}", job),
+        web.post("/v1/prefetch", prefetch_exercise),
+        web.get("/v1/prefetch", prefetch_report),
+        web.get("/v1/conversations", conversation_report),
+        web.get("/metrics", metrics),
+        web.get("/healthz", healthz),
+    ])
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    args = parser.parse_args()
+    web.run_app(create_app(), host=args.host, port=args.port)
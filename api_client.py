@@ -0,0 +1,35 @@
+"""Thin client for the api.py service, used by the apps when it is configured."""
+import json
+import os
+import urllib.request
+from typing import Optional
+
+API_URL = os.environ.get("FRENZGURU_API_URL", "").rstrip("/")
+TIMEOUT_SECONDS = float(os.environ.get("FRENZGURU_API_TIMEOUT", "300"))
+
+
+def _post(path: str, payload: dict) -> dict:
+    request = urllib.request.Request(
+        API_URL + path,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=TIMEOUT_SECONDS) as response:
+        return json.load(response)
+
+
+def ask(question: str, *, template: str, task: Optional[str] = None,
+        session: Optional[str] = None) -> str:
+    """Answer `question` with `template` on the shared backend."""
+    payload = {"question": question, "template": template, "task": task, "session": session}
+    return _post("/v1/ask", payload)["answer"]
+
+
+def grade_reading(index: int, answer: str) -> dict:
+    """Grade a Lesen answer on the shared backend (fields of `reading_grader.Grade`)."""
+    return _post(f"/v1/reading/{index}/grade", {"answer": answer})
+
+
+def prefetch(part: str, index: int, session: Optional[str] = None) -> list:
+    """Start prefetching answers for an exercise; returns the predicted questions."""
+    return _post("/v1/prefetch", {"part": part, "index": index, "session": session})["questions"]
@@ -0,0 +1,221 @@
+"""Local, content-addressed mirror of the external images and audio.
+
+Referenced media is stored once under ``$FRENZGURU_ASSET_DIR`` (default
+``.assets``) as ``objects/<sha256[:2]>/<sha256><ext>`` with a manifest that
+maps each source URL to its hash. The apps pass the local file to
+`st.image` / `st.audio`, so Streamlit serves it from its own media endpoint
+(which answers HTTP range requests, so audio seeking works) instead of every
+browser fetching it from the third-party site.
+
+Run the prefetch at deploy time, and verify the mirror afterwards:
+
+    python assets.py prefetch
+    python assets.py verify
+"""
+import argparse
+import fcntl
+import hashlib
+import json
+import mimetypes
+import os
+import sys
+import tempfile
+import threading
+import urllib.parse
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+
+import llm_metrics
+
+ASSET_DIR = Path(os.environ.get("FRENZGURU_ASSET_DIR", ".assets"))
+MANIFEST = ASSET_DIR / "manifest.json"
+FETCH_TIMEOUT_SECONDS = 30
+# Don't try to fetch missing assets while rendering (e.g. offline classrooms)
+OFFLINE = os.environ.get("FRENZGURU_ASSETS_OFFLINE") == "1"
+
+ASSETS = {
+    "praepositionen_tabelle":
+        "https://www.deutschtraining.org/wp-content/uploads/2020/04/präpositionen-tabelle.png",
+    "goethe_b1_hoeren":
+        "https://www.goethe.de/pro/relaunch/prf/de/GOETHE-ZERTIFIKAT_B1_HOEREN.mp3",
+}
+
+_lock = threading.Lock()
+_manifest = None
+_manifest_mtime = None  # of the file _manifest was read from
+_fetching = set()
+
+
+def _read_manifest() -> dict:
+    """The manifest, read again when another process (e.g. `assets.py prefetch`) replaced it."""
+    global _manifest, _manifest_mtime
+    try:
+        mtime = MANIFEST.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+    if _manifest is None or mtime != _manifest_mtime:
+        try:
+            _manifest = json.loads(MANIFEST.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            _manifest = {}
+        _manifest_mtime = mtime
+    return _manifest
+
+
+@contextmanager
+def _manifest_lock():
+    """Exclusive lock across processes for a read-modify-write of the manifest."""
+    ASSET_DIR.mkdir(parents=True, exist_ok=True)
+    with open(ASSET_DIR / "manifest.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _write_manifest(manifest: dict):
+    ASSET_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=ASSET_DIR, delete=False, encoding="utf-8") as tmp:
+        json.dump(manifest, tmp, indent=2, ensure_ascii=False)
+    os.replace(tmp.name, MANIFEST)
+
+
+def _object_path(sha256: str, suffix: str) -> Path:
+    return ASSET_DIR / "objects" / sha256[:2] / f"{sha256}{suffix}"
+
+
+def _quote(url: str) -> str:
+    parts = urllib.parse.urlsplit(url)
+    return urllib.parse.urlunsplit(parts._replace(path=urllib.parse.quote(parts.path)))
+
+
+def fetch(url: str) -> Path:
+    """Download `url` into the mirror and return the path of its object."""
+    global _manifest, _manifest_mtime
+    ASSET_DIR.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    request = urllib.request.Request(_quote(url), headers={"User-Agent": "frenzguru-assets"})
+    tmp = tempfile.NamedTemporaryFile(dir=ASSET_DIR, delete=False)
+    try:
+        with tmp, urllib.request.urlopen(request, timeout=FETCH_TIMEOUT_SECONDS) as response:
+            content_type = response.headers.get_content_type()
+            while chunk := response.read(1 << 16):
+                digest.update(chunk)
+                tmp.write(chunk)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+    sha256 = digest.hexdigest()
+    suffix = Path(urllib.parse.urlsplit(url).path).suffix or mimetypes.guess_extension(content_type) or ""
+    path = _object_path(sha256, suffix)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(tmp.name, path)  # same content, same name: replacing is harmless
+    with _lock, _manifest_lock():
+        _manifest_mtime = None  # re-read: another process may have added entries
+        manifest = dict(_read_manifest())
+        manifest[url] = {"sha256": sha256, "path": str(path.relative_to(ASSET_DIR)),
+                         "size": path.stat().st_size, "content_type": content_type}
+        _write_manifest(manifest)
+        _manifest, _manifest_mtime = manifest, MANIFEST.stat().st_mtime_ns
+    return path
+
+
+def _fetch_in_background(url: str):
+    with _lock:
+        if url in _fetching:
+            return
+        _fetching.add(url)
+
+    def run():
+        try:
+            fetch(url)
+        except OSError as e:
+            llm_metrics.logger.warning(json.dumps({"event": "asset_fetch_failed", "url": url,
+                                                   "error": repr(e)}))
+        finally:
+            with _lock:
+                _fetching.discard(url)
+
+    threading.Thread(target=run, name="frenzguru-asset-fetch", daemon=True).start()
+
+
+def local_path(url: str):
+    """Path of the mirrored copy of `url`, or None if it isn't mirrored."""
+    with _lock:
+        entry = _read_manifest().get(url)
+    if entry is None:
+        return None
+    path = ASSET_DIR / entry["path"]
+    return path if path.exists() else None
+
+
+def resolve(name: str) -> str:
+    """What to hand to `st.image`/`st.audio` for asset `name`.
+
+    Returns the local file on a cache hit. On a miss the remote URL is
+    returned for this render and, unless offline, the asset is mirrored in
+    the background for the next one.
+    """
+    url = ASSETS[name]
+    path = local_path(url)
+    llm_metrics.increment("asset_lookups", asset=name, result="hit" if path else "miss")
+    if path is not None:
+        return str(path)
+    if not OFFLINE:
+        _fetch_in_background(url)
+    return url
+
+
+def verify() -> list:
+    """Re-hash every registered asset; return a list of problems."""
+    problems = []
+    for name, url in ASSETS.items():
+        with _lock:
+            entry = _read_manifest().get(url)
+        if entry is None:
+            problems.append(f"{name}: not mirrored")
+            continue
+        path = ASSET_DIR / entry["path"]
+        if not path.exists():
+            problems.append(f"{name}: missing file {path}")
+            continue
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(1 << 16):
+                digest.update(chunk)
+        if digest.hexdigest() != entry["sha256"]:
+            problems.append(f"{name}: checksum mismatch for {path}")
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Mirror the apps' external media locally.")
+    parser.add_argument("command", choices=["prefetch", "verify"])
+    parser.add_argument("--force", action="store_true", help="re-download mirrored assets")
+    args = parser.parse_args(argv)
+
+    if args.command == "prefetch":
+        failed = 0
+        for name, url in ASSETS.items():
+            if local_path(url) is not None and not args.force:
+                print(f"{name}: cached")
+                continue
+            try:
+                path = fetch(url)
+                print(f"{name}: fetched {path}")
+            except OSError as e:
+                print(f"{name}: FAILED {e}", file=sys.stderr)
+                failed += 1
+        return 1 if failed else 0
+
+    problems = verify()
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    print(f"{len(ASSETS) - len(problems)}/{len(ASSETS)} assets ok")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""Pre-rendered static content blocks, emitted as one element each.
+
+The static sections of the apps (exam cards, vocab columns, template
+structures, exam info) used to be written with one `st.markdown` call per
+item, so every rerun sent dozens of separate deltas to the browser. Here
+each section is built once per process into a single markdown block,
+cached by content version and key (e.g. the selected part), and emitted
+with one call. With ``FRENZGURU_BATCHED_BLOCKS=0`` every piece is emitted
+separately again, which the measurement compares against:
+
+    python blocks.py measure --scale 1 --scale 25
+"""
+import argparse
+import copy
+import functools
+import hashlib
+import json
+import os
+import statistics
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import streamlit as st
+
+import content
+
+BATCHED = os.environ.get("FRENZGURU_BATCHED_BLOCKS", "1") == "1"
+
+
+def content_version() -> str:
+    """Hash of the content the blocks are built from."""
+    data = [content.exam_data, content.vocab_data, content.franz_vocab_data,
+            content.writing_templates, content.exam_info, content.franz_exam_info]
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+CONTENT_VERSION = content_version()
+
+
+@dataclass(frozen=True)
+class Block:
+    pieces: tuple  # markdown, one element each when not batched
+    html: bool = False
+
+    @functools.cached_property
+    def text(self) -> str:
+        """The pieces as one markdown document; adjacent list items stay one list."""
+        text = ""
+        for piece in self.pieces:
+            if text:
+                same_list = piece.startswith("- ") and text.rsplit("\n", 1)[-1].startswith("- ")
+                text += "\n" if same_list else "\n\n"
+            text += piece
+        return text
+
+
+# --- Builders --- #
+def _exam_card(part: str) -> Block:
+    """The card of one part in `apps.py`, up to its containers."""
+    data = content.exam_data[part]
+    pieces = [f"### {part}  \n⏱️ **Dauer:** {data['Dauer']}", "#### Aufgaben:"]
+    pieces += [f"- {task}" for task in data["Aufgaben"]]
+    if "Lesen" in part:
+        pieces += ["#### Strategien:", *(f"- {s}" for s in data["Strategien"]), "#### Beispiel:",
+                   f"*Text:* {data['Beispiel']['Text']}", f"*Frage:* {data['Beispiel']['Frage']}"]
+    elif "Schreiben" in part:
+        pieces += ["#### Textstruktur:"]
+    elif "Hören" in part:
+        pieces += ["#### Strategien:", *(f"- {s}" for s in data["Strategien"]),
+                   f"#### Übungstipp:  \n{data['Übung']}"]
+    elif "Sprechen" in part:
+        pieces += ["#### Bewertungskriterien:", *(f"- {c}" for c in data["Bewertung"]),
+                   "#### Nützliche Redemittel:"]
+    return Block(tuple(pieces))
+
+
+def _exam_card_tips(part: str) -> Block:
+    return Block(("#### Tipps:", *(f"- {tip}" for tip in content.exam_data[part]["Tipps"])))
+
+
+def _structure(part: str, text_type: str) -> Block:
+    return Block(tuple(f"- {item}" for item in content.exam_data[part]["Struktur"][text_type]))
+
+
+def _redemittel(part: str, column: int) -> Block:
+    phrases = content.exam_data[part]["Redemittel"][column::2]
+    return Block(tuple(f"- <span class='highlight'>{p}</span>" for p in phrases), html=True)
+
+
+def _vocab_column(app: str, category: str, column: int) -> Block:
+    """Every other item of a vocab category, in the app's format."""
+    if app == "franzfreinds":
+        items = list(content.franz_vocab_data[category].items())[column::2]
+        return Block(tuple(f"**{word}** - {meaning}" for word, meaning in items))
+    items = list(content.vocab_data[category].items())[column::2]
+    return Block(tuple(f"**{word}**  \n{meaning}" for word, meaning in items))
+
+
+def _template_structure(name: str) -> Block:
+    return Block(tuple(f"- {item}" for item in content.writing_templates[name]["structure"]))
+
+
+def _exam_info(app: str, title: str) -> Block:
+    info = (content.franz_exam_info if app == "franzfreinds" else content.exam_info)[title]
+    if "description" in info or "requirements" in info:
+        pieces = [info["description"]] if "description" in info else []
+        pieces += [f"- {req}" for req in info.get("requirements", [])]
+    else:
+        pieces = [f"**{part}**: {text}" for part, text in info.items()]
+    return Block(tuple(pieces))
+
+
+BUILDERS = {
+    "exam_card": _exam_card,
+    "exam_card_tips": _exam_card_tips,
+    "structure": _structure,
+    "redemittel": _redemittel,
+    "vocab_column": _vocab_column,
+    "template_structure": _template_structure,
+    "exam_info": _exam_info,
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached(version: str, name: str, key: tuple) -> Block:
+    return BUILDERS[name](*key)
+
+
+def get(name: str, *key) -> Block:
+    """Block `name` for `key` (e.g. the selected part), built once per content version."""
+    return _cached(CONTENT_VERSION, name, key)
+
+
+def emit(name: str, *key, container=st):
+    """Write block `name` to `container` (the page by default)."""
+    block = get(name, *key)
+    if BATCHED:
+        container.markdown(block.text, unsafe_allow_html=block.html)
+    else:
+        for piece in block.pieces:
+            container.markdown(piece, unsafe_allow_html=block.html)
+
+
+# --- Measurement --- #
+def _scale_content(factor: int):
+    """Grow the lists and dicts the blocks render `factor` times, in place.
+
+    `Aufgaben` stays as is: the time calculator of `apps.py` limits it to 10.
+    """
+    def grow(items):
+        if isinstance(items, list):
+            items[:] = [f"{item} ({i})" if i else item for i in range(factor) for item in items]
+        else:
+            original = list(items.items())
+            items.clear()
+            items.update({(f"{k} ({i})" if i else k): v for i in range(factor) for k, v in original})
+
+    for data in content.exam_data.values():
+        for key in ("Strategien", "Tipps", "Bewertung", "Redemittel"):
+            if key in data:
+                grow(data[key])
+        for structure in data.get("Struktur", {}).values():
+            grow(structure)
+    for vocab in (content.vocab_data, content.franz_vocab_data):
+        for items in vocab.values():
+            grow(items)
+    for template in content.writing_templates.values():
+        grow(template["structure"])
+
+
+def _measure_app(script: str, parts=(None,), runs: int = 5) -> dict:
+    from streamlit.delta_generator import DeltaGenerator
+    from streamlit.testing.v1 import AppTest
+
+    counts = {"elements": 0, "bytes": 0}
+    enqueue, block = DeltaGenerator._enqueue, DeltaGenerator._block
+
+    def counting_enqueue(self, delta_type, element_proto, *args, **kwargs):
+        counts["elements"] += 1
+        counts["bytes"] += element_proto.ByteSize()
+        return enqueue(self, delta_type, element_proto, *args, **kwargs)
+
+    def counting_block(self, block_proto=None, *args, **kwargs):
+        counts["elements"] += 1
+        counts["bytes"] += block_proto.ByteSize() if block_proto is not None else 0
+        return block(self, block_proto, *args, **kwargs)
+
+    DeltaGenerator._enqueue, DeltaGenerator._block = counting_enqueue, counting_block
+    try:
+        at = AppTest.from_file(str(Path(__file__).resolve().parent / script), default_timeout=60).run()
+        elements, sizes, seconds = [], [], []
+        for part in parts:
+            for _ in range(runs):
+                if part is not None:
+                    at.radio(key="selected_part").set_value(part)
+                counts.update(elements=0, bytes=0)
+                start = time.perf_counter()
+                at.run()
+                if at.exception:
+                    raise RuntimeError(f"{script}: {at.exception[0].value}")
+                seconds.append(time.perf_counter() - start)
+                elements.append(counts["elements"])
+                sizes.append(counts["bytes"])
+    finally:
+        DeltaGenerator._enqueue, DeltaGenerator._block = enqueue, block
+    return {"elements": round(statistics.mean(elements)), "bytes": round(statistics.mean(sizes)),
+            "ms": round(1000 * statistics.median(seconds), 1)}
+
+
+def measure(scales) -> list:
+    import blocks  # the module the apps use, also when this file runs as a script
+
+    rows, original = [], copy.deepcopy(
+        (content.exam_data, content.vocab_data, content.franz_vocab_data, content.writing_templates))
+    for scale in sorted(scales):
+        for current, saved in zip((content.exam_data, content.vocab_data, content.franz_vocab_data,
+                                   content.writing_templates), copy.deepcopy(original)):
+            current.clear()
+            current.update(saved)
+        _scale_content(scale)
+        blocks.CONTENT_VERSION = content_version()
+        for batched in (False, True):
+            blocks.BATCHED = batched
+            for script, parts in [("apps.py", tuple(content.exam_data)), ("franzfreinds.py", (None,)),
+                                  ("freundmitfranz.py", (None,))]:
+                result = _measure_app(script, parts)
+                rows.append({"scale": scale, "batched": batched, "app": script, **result})
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Static content blocks.")
+    parser.add_argument("command", choices=["measure"])
+    parser.add_argument("--scale", type=int, action="append", help="content size factor")
+    args = parser.parse_args()
+    print(f"{'scale':>5} {'app':18} {'mode':8} {'elements':>9} {'bytes':>9} {'ms/rerun':>9}")
+    for row in measure(args.scale or [1]):
+        print(f"{row['scale']:>5} {row['app']:18} {'batched' if row['batched'] else 'per-item':8} "
+              f"{row['elements']:>9} {row['bytes']:>9} {row['ms']:>9}")
@@ -0,0 +1,189 @@
+"""Fill-in-the-blank exercises from `content.cloze_exercises`, with fast answer matching.
+
+Every accepted answer is normalized once at import (case, umlaut and ß
+spellings such as "waehrend"/"während", "Strasse"/"Straße", surrounding
+whitespace and punctuation), so checking an answer is a dict lookup. Each
+exercise set also compiles a boolean matrix of item × known answer: grading
+a whole class normalizes every distinct answer string once and then looks
+all submissions up in that matrix in one NumPy indexing step.
+
+    python cloze.py benchmark --submissions 100000
+"""
+import argparse
+import json
+import re
+import time
+import unicodedata
+from dataclasses import dataclass
+
+import numpy as np
+import streamlit as st
+
+import analytics
+import content
+
+_FOLD = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue"})
+_BARE = str.maketrans({"ä": "a", "ö": "o", "ü": "u"})
+_EDGES = re.compile(r"^[\s.,;:!?\"'„“”‚‘’()-]+|[\s.,;:!?\"'„“”‚‘’()-]+$")
+_SPACE = re.compile(r"\s+")
+UMLAUT_HINT = "Achten Sie auf die Umlaute (ä/ö/ü oder ae/oe/ue)."
+
+
+def _clean(text: str) -> str:
+    # casefold() also turns ß into ss
+    text = unicodedata.normalize("NFC", text or "").casefold()
+    return _SPACE.sub(" ", _EDGES.sub("", text))
+
+
+def normalize(text: str) -> str:
+    """The form answers are compared in: "  Während." -> "waehrend"."""
+    return _clean(text).translate(_FOLD)
+
+
+def _bare(text: str) -> str:
+    """Umlauts reduced to their base vowel, to recognize a missing umlaut."""
+    return _clean(text).translate(_BARE)
+
+
+@dataclass(frozen=True)
+class Result:
+    correct: bool
+    expected: str  # the first accepted answer
+    explanation: str
+    hint: str = ""  # why this answer is wrong, when known
+
+
+@dataclass(frozen=True)
+class Item:
+    text: str
+    answers: tuple
+    explanation: str
+    keys: frozenset  # normalized accepted answers
+    bare: frozenset
+    mistakes: dict  # normalized wrong answer -> explanation
+
+    def check(self, answer: str) -> Result:
+        key = normalize(answer)
+        if key in self.keys:
+            return Result(True, self.answers[0], self.explanation)
+        hint = self.mistakes.get(key, "")
+        if not hint and key and _bare(answer) in self.bare:
+            hint = UMLAUT_HINT
+        return Result(False, self.answers[0], self.explanation, hint)
+
+
+class ClozeSet:
+    """One exercise set, compiled for single and batch grading."""
+
+    def __init__(self, name: str, data: dict):
+        self.name = name
+        self.title = data["title"]
+        self.category = data.get("category", self.title)
+        self.instruction = data["instruction"]
+        self.items = [Item(
+            text=item["text"],
+            answers=tuple(item["answers"]),
+            explanation=item["explanation"],
+            keys=frozenset(normalize(a) for a in item["answers"]),
+            bare=frozenset(_bare(a) for a in item["answers"]),
+            mistakes={normalize(wrong): why for wrong, why in item.get("mistakes", {}).items()},
+        ) for item in data["items"]]
+        # Column per known answer, plus a last column for every other answer
+        self.columns = {key: i for i, key in enumerate(sorted({k for it in self.items for k in it.keys}))}
+        self.accepted = np.zeros((len(self.items), len(self.columns) + 1), dtype=bool)
+        for row, item in enumerate(self.items):
+            self.accepted[row, [self.columns[key] for key in item.keys]] = True
+
+    def grade(self, answers) -> list:
+        """One student's answers, in item order, with explanations."""
+        return [item.check(answer) for item, answer in zip(self.items, answers)]
+
+    def grade_batch(self, submissions) -> np.ndarray:
+        """Boolean matrix (submission × item) for a list of answer lists."""
+        answers = np.asarray(submissions, dtype=str).reshape(-1, len(self.items))
+        unique, inverse = np.unique(answers, return_inverse=True)
+        other = len(self.columns)
+        ids = np.fromiter((self.columns.get(normalize(a), other) for a in unique),
+                          dtype=np.intp, count=len(unique))
+        return self.accepted[np.arange(len(self.items)), ids[inverse.reshape(answers.shape)]]
+
+
+SETS = {name: ClozeSet(name, data) for name, data in content.cloze_exercises.items()}
+
+
+def grade(name: str, answers) -> list:
+    return SETS[name].grade(answers)
+
+
+def grade_batch(name: str, submissions) -> np.ndarray:
+    return SETS[name].grade_batch(submissions)
+
+
+def render(name: str):
+    """The set as text inputs with a check button."""
+    cloze = SETS[name]
+    st.markdown(f"**{cloze.instruction}**")
+    answers = [st.text_input(f"{i}. {item.text}", key=f"cloze_{name}_{i}")
+               for i, item in enumerate(cloze.items, 1)]
+    if st.button("Antworten überprüfen", key=f"cloze_{name}_check"):
+        results = cloze.grade(answers)
+        for i, result in enumerate(results, 1):
+            if result.correct:
+                st.success(f"{i}. Richtig! {result.explanation}")
+            else:
+                hint = f" – {result.hint}" if result.hint else ""
+                st.error(f"{i}. Falsch! Richtige Antwort: {result.expected}{hint}  \n{result.explanation}")
+        st.markdown(f"**{sum(r.correct for r in results)} von {len(results)} richtig**")
+        class_id, student = analytics.learner()
+        analytics.record(class_id, student, "Wortschatz", category=cloze.category,
+                         score=sum(r.correct for r in results) / len(results))
+
+
+# --- Benchmark --- #
+def _variants(answer: str) -> list:
+    return [answer, answer.upper(), f" {answer}. ", answer.replace("ä", "ae").replace("ü", "ue")]
+
+
+def _submissions(cloze: ClozeSet, count: int, seed: int = 0) -> list:
+    """Synthetic class answers: mostly right in some spelling, some typical mistakes."""
+    rng = np.random.default_rng(seed)
+    choices = []
+    for item in cloze.items:
+        right = [v for a in item.answers for v in _variants(a)]
+        wrong = list(item.mistakes) + ["", "weiss nicht", item.answers[0][:-1]]
+        choices.append((right, wrong))
+    rows = []
+    for _ in range(count):
+        rows.append([right[rng.integers(len(right))] if rng.random() < 0.7 else wrong[rng.integers(len(wrong))]
+                     for right, wrong in choices])
+    return rows
+
+
+def benchmark(count: int) -> dict:
+    report = {}
+    for name, cloze in SETS.items():
+        rows = _submissions(cloze, count)
+        start = time.perf_counter()
+        batch = cloze.grade_batch(rows)
+        batch_seconds = time.perf_counter() - start
+        sample = rows[:min(count, 5000)]
+        start = time.perf_counter()
+        single = [[r.correct for r in cloze.grade(row)] for row in sample]
+        single_seconds = (time.perf_counter() - start) * count / len(sample)
+        assert (batch[:len(sample)] == np.array(single)).all()
+        report[name] = {
+            "items": len(cloze.items),
+            "submissions": count,
+            "mean_score": round(float(batch.mean()), 3),
+            "batch_per_second": round(count / batch_seconds),
+            "loop_per_second": round(count / single_seconds),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cloze exercises.")
+    parser.add_argument("command", choices=["benchmark"])
+    parser.add_argument("--submissions", type=int, default=10000)
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.submissions), indent=2, ensure_ascii=False))
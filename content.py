@@ -0,0 +1,517 @@
+"""Study content shared by the apps, the API service and the static export."""
+import json
+from pathlib import Path
+
+vocab_data = {
+    "Wichtige Präpositionen (mit Fällen)": {
+        "wegen": "wegen + Genitiv (because of) - Wegen des Wetters...",
+        "trotz": "trotz + Genitiv (despite) - Trotz der Kälte...",
+        "während": "während + Genitiv (during) - Während des Kurses...",
+        "gegenüber": "gegenüber + Dativ (opposite) - Gegenüber dem Bahnhof...",
+        "bis": "bis + Akkusativ (until) - Bis nächsten Montag...",
+        "durch": "durch + Akkusativ (through) - Durch den Park...",
+        "für": "für + Akkusativ (for) - Für meine Prüfung...",
+        "ohne": "ohne + Akkusativ (without) - Ohne mein Buch..."
+    },
+    "Essentielle Verben": {
+        "sich bewerben um": "to apply for (Bewirbst du dich um die Stelle?)",
+        "erledigen": "to complete (Ich erledige meine Hausaufgaben)",
+        "verschieben": "to postpone (Wir verschieben den Termin)",
+        "verstehen": "to understand (Verstehst du die Frage?)",
+        "mitteilen": "to inform (Teilen Sie mir bitte mit...)",
+        "sich erkundigen nach": "to inquire about (Ich erkundige mich nach dem Kurs)",
+        "zustimmen": "to agree (Stimmst du mir zu?)",
+        "ablehnen": "to refuse (Sie lehnte die Einladung ab)"
+    },
+    "Zeitformen (Verb Tenses)": {
+        "Präsens": "Ich lerne Deutsch (I learn/am learning German)",
+        "Perfekt": "Ich habe gelernt (I learned/have learned)",
+        "Präteritum": "Ich lernte Deutsch (I learned German) - mostly written",
+        "Plusquamperfekt": "Ich hatte gelernt (I had learned)",
+        "Futur I": "Ich werde lernen (I will learn)",
+        "Futur II": "Ich werde gelernt haben (I will have learned)"
+    },
+    "Konjunktionen (Conjunctions)": {
+        "weil": "because (Hauptsatz + Nebensatz) - Ich bleibe zu Hause, weil ich krank bin.",
+        "denn": "because (Hauptsatz + Hauptsatz) - Ich bleibe zu Hause, denn ich bin krank.",
+        "obwohl": "although - Obwohl es regnet, gehe ich spazieren.",
+        "damit": "so that - Ich lerne viel, damit ich die Prüfung bestehe.",
+        "wenn": "if/when - Wenn ich Zeit habe, lese ich ein Buch.",
+        "als": "when (past) - Als ich jung war, spielte ich Fußball.",
+        "während": "while - Während ich koche, höre ich Musik.",
+        "nachdem": "after - Nachdem ich gegessen habe, trinke ich Kaffee."
+    },
+    "Weil vs. Denn": {
+        "Position": "WEIL: Verb at end | DENN: Normal word order",
+        "Example 1": "WEIL: Ich bin müde, weil ich spät ins Bett gegangen bin.",
+        "Example 2": "DENN: Ich bin müde, denn ich bin spät ins Bett gegangen.",
+        "Comma": "Both ALWAYS need a comma before them",
+        "Usage": "DENN is more formal, WEIL is more common"
+    },
+    "Übergangswörter (Transition Words)": {
+        "zuerst": "first - Zuerst lese ich die Anleitung.",
+        "dann": "then - Dann beginne ich mit der Aufgabe.",
+        "anschließend": "afterwards - Anschließend überprüfe ich die Antworten.",
+        "schließlich": "finally - Schließlich gebe ich den Test ab.",
+        "deshalb": "therefore - Ich bin krank, deshalb bleibe ich im Bett.",
+        "trotzdem": "nevertheless - Es regnet, trotzdem gehe ich spazieren."
+    },
+    "Prüfungsschlüsselwörter": {
+        "die Aufgabe": "task/question - Lesen Sie die Aufgabe genau!",
+        "die Lösung": "solution - Die Lösung steht auf Seite 10.",
+        "die Note": "grade - Ich habe eine gute Note bekommen.",
+        "bestehen": "to pass - Ich möchte die Prüfung bestehen.",
+        "durchfallen": "to fail - Leider ist er durchgefallen.",
+        "der Fehler": "mistake - Korrigieren Sie die Fehler."
+    }
+}
+
+writing_templates = {
+    "Formal Letter": {
+        "structure": [
+            "Ort, Datum (right aligned)",
+            "Betreff: (subject line)",
+            "Sehr geehrte Damen und Herren,",
+            "Einleitung: State reason for writing",
+            "Hauptteil: Provide details, ask questions",
+            "Schluss: Request response, thank reader",
+            "Mit freundlichen Grüßen,",
+            "Ihr Name"
+        ],
+        "example": """
+München, 15. März 2024
+
+Betreff: Bewerbung für Praktikumsstelle
+
+Sehr geehrte Damen und Herren,
+
+mit großem Interesse habe ich Ihre Anzeige für ein Praktikum gelesen. 
+Ich möchte mich für diese Stelle bewerben.
+
+Ich studiere derzeit Wirtschaft an der Universität München und 
+suche ein Praktikum im Bereich Marketing. In meinem Studium habe ich 
+schon mehrere Kurse in diesem Bereich belegt.
+
+Über eine positive Rückmeldung würde ich mich sehr freuen. 
+Für weitere Informationen stehe ich gerne zur Verfügung.
+
+Mit freundlichen Grüßen,
+Anna Müller
+"""
+    },
+    "Informal Email": {
+        "structure": [
+            "Betreff: (subject line)",
+            "Liebe/Lieber [Name],",
+            "Einleitung: Greeting, reason for writing",
+            "Hauptteil: Share news, ask questions",
+            "Schluss: Closing remarks",
+            "Viele Grüße,",
+            "Dein Name"
+        ],
+        "example": """
+Betreff: Treffen am Wochenende
+
+Liebe Sarah,
+
+wie geht's dir? Ich hoffe, alles ist gut bei dir.
+
+Ich schreibe dir, weil ich wissen wollte, ob du am Samstag Zeit hast. 
+Ich möchte mit dir ins Kino gehen. Der neue Marvel-Film läuft jetzt.
+
+Was hältst du davon? Lass mich bitte wissen, ob du kommen kannst.
+
+Viele Grüße,
+Deine Lisa
+"""
+    }
+}
+
+exam_info = {
+    "Passing Requirements": {
+        "description": "To pass the Goethe-Zertifikat B1 exam, you must:",
+        "requirements": [
+            "Score at least 60% overall (180 points)",
+            "Score at least 60% in each module (Reading, Writing, Listening, Speaking)"
+        ]
+    },
+    "Exam Structure": {
+        "Lesen": "65 Minuten - 5 Teile",
+        "Schreiben": "60 Minuten - 2 Aufgaben",
+        "Hören": "40 Minuten - 4 Teile",
+        "Sprechen": "15 Minuten - 3 Teile (mit Partner)"
+    }
+}
+
+exercises = {
+    "Lesen": [
+        {"question": "Lesen Sie den Text und beantworten Sie die Fragen:", "text": """
+In Deutschland gibt es vier Jahreszeiten: Frühling, Sommer, Herbst und Winter. 
+Der Frühling beginnt im März und endet im Mai. Viele Menschen freuen sich auf 
+den Frühling, weil die Tage länger werden und die Blumen blühen. Im Sommer 
+gehen viele Deutsche in den Urlaub, besonders an die Nordsee oder Ostsee.
+"""},
+        {"question": "Welche Aussage passt zu welchem Abschnitt?", "text": """
+1. Verkehrsmittel: In deutschen Städten gibt es Busse, Bahnen und U-Bahnen. 
+2. Freizeitaktivitäten: Viele Deutsche treiben Sport oder gehen wandern.
+"""}
+    ],
+    "Schreiben": [
+        {"task": "Schreiben Sie eine formelle Email an eine Sprachschule (80-100 Wörter)", "hints": """
+- Fragen Sie nach einem Deutschkurs
+- Geben Sie Ihr Sprachniveau an
+- Fragen Sie nach dem Preis und dem Startdatum
+"""},
+        {"task": "Schreiben Sie einen Brief an einen Freund über Ihren letzten Urlaub", "hints": """
+- Wohin sind Sie gefahren?
+- Was haben Sie gemacht?
+- Wie war das Wetter?
+- Wollen Sie wieder dorthin fahren?
+"""}
+    ],
+    "Hören": [
+        {"task": "Hören Sie die Durchsage und beantworten Sie die Fragen:", "questions": """
+1. Wann fährt der nächste Zug nach Berlin?
+2. Von welchem Gleis fährt der Zug?
+"""},
+        {"task": "Welche Antwort passt zu welchem Dialog?", "options": """
+A) "Entschuldigung, wo ist die Post?" 
+B) "Ich möchte ein Ticket nach Hamburg kaufen"
+"""}
+    ],
+    "Sprechen": [
+        {"task": "Stellen Sie sich vor:", "prompts": """
+- Name, Alter
+- Hobbys
+- Beruf/Studium
+- Warum lernen Sie Deutsch?
+"""},
+        {"task": "Diskutieren Sie mit einem Partner:", "topics": """
+- Vor- und Nachteile des Lebens in der Stadt
+- Wie verbringen junge Leute ihre Freizeit?
+"""}
+    ]
+}
+
+# Strategies per Prüfungsteil (apps.py)
+exam_data = {
+    "Teil 1: Lesen": {
+        "Dauer": "65 Minuten",
+        "Aufgaben": [
+            "Teil 1: Kurze Texte mit Multiple-Choice-Fragen",
+            "Teil 2: Zuordnung von Überschriften zu Abschnitten",
+            "Teil 3: Lückentext mit Wortauswahl",
+            "Teil 4: Lange Texte mit Verständnisfragen"
+        ],
+        "Strategien": [
+            "⏱️ Zeitmanagement: Max. 15 Min. pro Teil",
+            "🔍 Zuerst Fragen lesen, dann Text scannen",
+            "📌 Schlüsselwörter in Fragen markieren",
+            "❌ Offensichtlich falsche Antworten sofort streichen"
+        ],
+        "Beispiel": {
+            "Text": "In deutschen Städten gibt es viele Parks. Diese sind oft...",
+            "Frage": "Was ist richtig? a) Parks sind selten b) Parks haben Spielplätze c) Parks sind immer geschlossen"
+        }
+    },
+    "Teil 2: Schreiben": {
+        "Dauer": "60 Minuten",
+        "Aufgaben": [
+            "Aufgabe 1: Formeller Brief/Email (80-100 Wörter)",
+            "Aufgabe 2: Informeller Brief/Forumbeitrag (80-100 Wörter)"
+        ],
+        "Struktur": {
+            "Formeller Brief": [
+                "Ort, Datum (rechtsbündig)",
+                "Betreffzeile",
+                "Formelle Anrede (Sehr geehrte...)",
+                "Einleitung: Grund des Schreibens",
+                "Hauptteil: Details/Argumente",
+                "Schluss: Höflichkeitsformel",
+                "Grußformel (Mit freundlichen Grüßen)"
+            ],
+            "Informelle Email": [
+                "Betreffzeile",
+                "Persönliche Anrede (Liebe...)",
+                "Einleitung: Smalltalk",
+                "Hauptteil: Informationen/Fragen",
+                "Schluss: Wunsch/Abschied",
+                "Grußformel (Viele Grüße)"
+            ]
+        },
+        "Tipps": [
+            "✍️ Mindestens 100 Wörter schreiben",
+            "⏳ 20 Min. für Planung, 30 Min. für Text, 10 Min. für Korrektur",
+            "📌 3-4 Absätze verwenden",
+            "✅ Typische Redemittel lernen"
+        ]
+    },
+    "Teil 3: Hören": {
+        "Dauer": "40 Minuten",
+        "Aufgaben": [
+            "Teil 1: Kurze Dialoge mit Bildern",
+            "Teil 2: Radioansagen/Informationen",
+            "Teil 3: Lange Dialoge mit Detailfragen",
+            "Teil 4: Meinungen/Interviews verstehen"
+        ],
+        "Strategien": [
+            "👂 Vor dem Hören: Fragen genau lesen",
+            "✏️ Während des Hörens: Stichworte notieren",
+            "🔁 Audio wird 2x abgespielt - beim ersten Mal Hauptidee, beim zweiten Mal Details",
+            "❓ Unbekannte Wörter ignorieren - auf Kontext konzentrieren"
+        ],
+        "Übung": "Hören Sie deutsche Podcasts (Langsam gesprochene Nachrichten)"
+    },
+    "Teil 4: Sprechen": {
+        "Dauer": "15 Minuten",
+        "Aufgaben": [
+            "Teil 1: Vorstellung (Name, Herkunft, Interessen)",
+            "Teil 2: Thema präsentieren (2 Min. Monolog)",
+            "Teil 3: Diskussion mit Partner"
+        ],
+        "Bewertung": [
+            "🗣️ Aussprache und Verständlichkeit",
+            "📚 Wortschatz und Grammatik",
+            "💡 Ideenentwicklung und Logik",
+            "🤝 Interaktion mit Partner"
+        ],
+        "Redemittel": [
+            "Meiner Meinung nach... / Ich finde, dass...",
+            "Was meinst du dazu? / Stimmt das deiner Ansicht nach?",
+            "Einerseits... andererseits...",
+            "Vielleicht sollten wir..."
+        ]
+    }
+}
+
+# English glosses used by franzfreinds.py
+franz_vocab_data = {
+    "Important Prepositions": {
+        "wegen": "because of (+Genitiv)",
+        "trotz": "despite (+Genitiv)",
+        "während": "during (+Genitiv)",
+        "gegenüber": "opposite (+Dativ)",
+        "bis": "until (+Akkusativ)",
+        "durch": "through (+Akkusativ)",
+        "für": "for (+Akkusativ)",
+        "ohne": "without (+Akkusativ)"
+    },
+    "Key Verbs": {
+        "sich bewerben um": "to apply for",
+        "erledigen": "to complete",
+        "verschieben": "to postpone",
+        "verstehen": "to understand",
+        "mitteilen": "to inform",
+        "sich erkundigen nach": "to inquire about",
+        "zustimmen": "to agree",
+        "ablehnen": "to refuse"
+    },
+    "Formal Phrases": {
+        "Sehr geehrte Damen und Herren,": "Dear Sir or Madam,",
+        "mit freundlichen Grüßen": "Kind regards",
+        "Ich möchte mich erkundigen...": "I would like to inquire...",
+        "Ich wäre Ihnen dankbar, wenn...": "I would be grateful if...",
+        "Ich beziehe mich auf...": "I'm referring to..."
+    }
+}
+
+franz_exam_info = {
+    "Passing Requirements": {
+        "description": "To pass the Zertifikat B1 exam, you must:",
+        "requirements": [
+            "Score at least 60% overall (180 points)",
+            "Score at least 60% in each module (Reading, Writing, Listening, Speaking)"
+        ]
+    },
+    "Exam Structure": {
+        "Reading": "65 minutes - 5 parts",
+        "Writing": "60 minutes - 2 tasks",
+        "Listening": "40 minutes - 4 parts",
+        "Speaking": "15 minutes - 3 parts (with partner)"
+    }
+}
+
+# Static text of the Übersicht, Wortschatz and Schreiben tabs
+franz_study_plan = {
+    "Tag 1: Grundlagen": [
+        "⏰ 2 Stunden - Wichtiger Wortschatz & Präpositionen",
+        "⏰ 1.5 Stunden - Leseverstehen Strategien",
+        "⏰ 2 Stunden - Schreiben Vorlagen (Emails, Briefe)",
+        "⏰ 1 Stunde - Hörverstehen Praxis"
+    ],
+    "Tag 2: Prüfungssimulation": [
+        "⏰ 3 Stunden - Komplette Übungsprüfung",
+        "⏰ 1 Stunde - Sprechen Rollenspiele",
+        "⏰ 1 Stunde - Schwachstellen wiederholen",
+        "⏰ 1 Stunde - Letzte Tipps und Strategien"
+    ]
+}
+
+study_plan = {
+    "Tag 1: Grundlagen": [
+        "⏰ 2h - Wichtiger Wortschatz & Präpositionen",
+        "⏰ 1.5h - Leseverstehen Strategien",
+        "⏰ 2h - Schreiben Vorlagen",
+        "⏰ 1h - Hörverstehen Praxis"
+    ],
+    "Tag 2: Prüfungssimulation": [
+        "⏰ 3h - Komplette Übungsprüfung",
+        "⏰ 1h - Sprechen üben",
+        "⏰ 1h - Schwachstellen wiederholen"
+    ]
+}
+
+franz_exam_parts = [
+    ("Lesen", "65 min", "Textverständnis, Zuordnung"),
+    ("Schreiben", "60 min", "Formeller Brief, Email"),
+    ("Hören", "40 min", "Dialoge, Ansagen"),
+    ("Sprechen", "15 min", "Vorstellung, Diskussion")
+]
+
+franz_writing_tips = [
+    "Struktur immer einhalten (Anrede, Einleitung, Hauptteil, Schluss)",
+    "Mindestens 80 Wörter schreiben",
+    "Auf Formal/Informal achten",
+    "5 Minuten für Planung verwenden",
+    "10 Minuten für Korrektur am Ende"
+]
+
+writing_tips = [
+    "Struktur immer einhalten (Anrede, Einleitung, Hauptteil, Schluss)",
+    "Mindestens 100 Wörter schreiben",
+    "Auf Formal/Informal achten",
+    "5 Minuten für Planung verwenden",
+    "10 Minuten für Korrektur am Ende"
+]
+
+verb_conjugation = [
+    ["Pronomen", "lernen (Präsens)", "gelernt (Perfekt)", "lernen (Futur I)"],
+    ["ich", "lerne", "habe gelernt", "werde lernen"],
+    ["du", "lernst", "hast gelernt", "wirst lernen"],
+    ["er/sie/es", "lernt", "hat gelernt", "wird lernen"],
+    ["wir", "lernen", "haben gelernt", "werden lernen"],
+    ["ihr", "lernt", "habt gelernt", "werdet lernen"],
+    ["sie/Sie", "lernen", "haben gelernt", "werden lernen"]
+]
+
+scoring = {
+    "Teil": ["Lesen", "Schreiben", "Hören", "Sprechen"],
+    "Punkte": [100, 100, 100, 100],
+    "Bestanden": [60, 60, 60, 60],
+    "Zeit": ["65 min", "60 min", "40 min", "15 min"]
+}
+
+# Fill-in-the-blank sets (cloze.py, freundmitfranz.py): "___" marks the gap; "answers" are all accepted
+# solutions, "mistakes" explain typical wrong answers
+cloze_exercises = {
+    "weil_denn": {
+        "title": "Weil/Denn",
+        "category": "Weil vs. Denn",  # vocab_data category, for the teacher analytics
+        "instruction": "Ergänzen Sie mit 'weil' oder 'denn':",
+        "items": [
+            {"text": "Ich nehme einen Regenschirm, ___ es regnet.", "answers": ["weil"],
+             "explanation": "Verb 'regnet' am Ende → Nebensatz",
+             "mistakes": {"denn": "Nach 'denn' steht das Verb an Position 2: ..., denn es regnet."}},
+            {"text": "Sie geht früh ins Bett, ___ sie ist müde.", "answers": ["denn"],
+             "explanation": "'ist' direkt nach dem Subjekt (Position 2) → Hauptsatz",
+             "mistakes": {"weil": "Nach 'weil' steht das Verb am Ende: ..., weil sie müde ist."}},
+            {"text": "Er lernt jeden Tag, ___ er die Prüfung bestehen möchte.", "answers": ["weil"],
+             "explanation": "Verb 'möchte' am Ende → Nebensatz"},
+            {"text": "Wir bleiben zu Hause, ___ das Wetter ist schlecht.", "answers": ["denn"],
+             "explanation": "Verb 'ist' an Position 2 → Hauptsatz"},
+        ],
+    },
+    "praepositionen": {
+        "title": "Präpositionen mit Fällen",
+        "category": "Wichtige Präpositionen (mit Fällen)",  # vocab_data category, for the teacher analytics
+        "instruction": "Ergänzen Sie die Präposition oder den Artikel:",
+        "items": [
+            {"text": "___ des schlechten Wetters fällt das Spiel aus.", "answers": ["wegen"],
+             "explanation": "wegen + Genitiv (des Wetters)",
+             "mistakes": {"trotz": "'trotz' heißt 'obwohl es so ist' – hier ist das Wetter der Grund."}},
+            {"text": "___ der Kälte gehen wir spazieren.", "answers": ["trotz"],
+             "explanation": "trotz + Genitiv: Gegensatz (der Kälte)"},
+            {"text": "___ des Kurses darf man nicht telefonieren.", "answers": ["während"],
+             "explanation": "während + Genitiv: Zeitraum (des Kurses)"},
+            {"text": "Das Hotel liegt gegenüber ___ Bahnhof.", "answers": ["dem"],
+             "explanation": "gegenüber + Dativ: der Bahnhof → dem Bahnhof",
+             "mistakes": {"den": "'den' ist Akkusativ – gegenüber verlangt den Dativ.",
+                          "des": "'des' ist Genitiv – gegenüber verlangt den Dativ."}},
+            {"text": "Wir gehen durch ___ Park.", "answers": ["den"],
+             "explanation": "durch + Akkusativ: der Park → den Park",
+             "mistakes": {"dem": "'dem' ist Dativ – durch verlangt den Akkusativ."}},
+            {"text": "Ich komme ohne ___ Buch.", "answers": ["mein", "das", "ein"],
+             "explanation": "ohne + Akkusativ: das Buch bleibt im Akkusativ 'das/ein/mein Buch'",
+             "mistakes": {"meinem": "'meinem' ist Dativ – ohne verlangt den Akkusativ."}},
+            {"text": "Er fährt mit ___ Bus zur Arbeit.", "answers": ["dem"],
+             "explanation": "mit + Dativ: der Bus → dem Bus"},
+        ],
+    },
+    "verbformen": {
+        "title": "Verbformen",
+        "category": "Zeitformen (Verb Tenses)",  # vocab_data category, for the teacher analytics
+        "instruction": "Setzen Sie das Verb in der richtigen Form ein:",
+        "items": [
+            {"text": "Gestern ___ ich ins Kino gegangen. (sein)", "answers": ["bin"],
+             "explanation": "Perfekt mit 'sein' bei Bewegungsverben: ich bin gegangen",
+             "mistakes": {"habe": "'gehen' ist ein Bewegungsverb → Perfekt mit 'sein'."}},
+            {"text": "Letztes Jahr ___ wir in Berlin. (sein, Präteritum)", "answers": ["waren"],
+             "explanation": "Präteritum von 'sein': wir waren"},
+            {"text": "Wenn ich Zeit hätte, ___ ich mehr lesen. (werden, Konjunktiv II)", "answers": ["würde"],
+             "explanation": "Konjunktiv II mit 'würde' + Infinitiv",
+             "mistakes": {"wurde": "'wurde' ist Präteritum – für Wünsche und Bedingungen: 'würde'."}},
+            {"text": "Ich ___ mich um die Stelle. (sich bewerben, Präsens)", "answers": ["bewerbe"],
+             "explanation": "sich bewerben um: ich bewerbe mich"},
+            {"text": "Bis morgen ___ ich die Arbeit erledigt haben. (werden, Futur II)", "answers": ["werde"],
+             "explanation": "Futur II: werden + Partizip II + haben/sein"},
+            {"text": "Wir ___ den Termin auf nächste Woche. (verschieben, Präsens)", "answers": ["verschieben"],
+             "explanation": "Präsens, 1. Person Plural: wir verschieben"},
+            {"text": "Die Kinder ___ im Park gespielt. (haben)", "answers": ["haben"],
+             "explanation": "Perfekt mit 'haben': die Kinder haben gespielt"},
+            {"text": "Ich habe den Brief schon ___. (schreiben, Partizip II)", "answers": ["geschrieben"],
+             "explanation": "Partizip II von 'schreiben': geschrieben"},
+            {"text": "Er ___ gern Fußball. (spielen, Präsens)", "answers": ["spielt"],
+             "explanation": "Präsens, 3. Person Singular: er spielt"},
+            {"text": "Sie ___ nach Hause, weil sie müde war. (gehen, Präteritum)", "answers": ["ging"],
+             "explanation": "Präteritum von 'gehen': sie ging"},
+            {"text": "Ich ___ mich nach dem Kurs. (sich erkundigen, Präsens)", "answers": ["erkundige"],
+             "explanation": "sich erkundigen nach: ich erkundige mich"},
+            {"text": "Das Essen ___ mir gut. (schmecken, Präsens)", "answers": ["schmeckt"],
+             "explanation": "Präsens, 3. Person Singular: es schmeckt"},
+            {"text": "Ich ___ früher oft Tennis gespielt. (haben)", "answers": ["habe"],
+             "explanation": "Perfekt mit 'haben': ich habe gespielt"},
+            {"text": "Teilen Sie mir bitte ___, wann der Kurs beginnt. (mitteilen)", "answers": ["mit"],
+             "explanation": "Trennbares Verb: mitteilen → Teilen Sie ... mit"},
+        ],
+    },
+}
+
+# Reference answers for the Lesen exercises (reading_grader.py), by index in exercises["Lesen"].
+# "keywords" are groups of alternatives; a group counts as covered when one of them occurs.
+reading_references = {
+    0: {
+        "answers": [
+            "Der Frühling beginnt im März und endet im Mai. Viele Menschen freuen sich auf den "
+            "Frühling, weil die Tage länger werden und die Blumen blühen. Im Sommer fahren viele "
+            "Deutsche in den Urlaub, besonders an die Nordsee oder Ostsee.",
+            "Es gibt vier Jahreszeiten. Der Frühling dauert von März bis Mai; man freut sich, weil "
+            "es länger hell ist und Blumen blühen. Im Sommer machen viele Urlaub an der Nordsee "
+            "oder an der Ostsee.",
+        ],
+        "keywords": [["März"], ["Mai"], ["länger"], ["Blumen", "blühen"], ["Urlaub"],
+                     ["Nordsee", "Ostsee", "Meer"]],
+    },
+    1: {
+        "answers": [
+            "Abschnitt 1 passt zu Verkehrsmitteln: In den Städten gibt es Busse, Bahnen und "
+            "U-Bahnen. Abschnitt 2 passt zu Freizeitaktivitäten: Viele Deutsche treiben Sport "
+            "oder gehen wandern.",
+            "1 – Verkehrsmittel (Bus, Bahn, U-Bahn); 2 – Freizeit (Sport, Wandern).",
+        ],
+        "keywords": [["Verkehr"], ["Bus", "Bahn"], ["Freizeit"], ["Sport"], ["wander"]],
+    },
+}
+
+# Generated offline by enrich_vocab.py: "<category>/<word>" -> examples, gender, case, distractors
+ENRICHMENT_PATH = Path(__file__).resolve().parent / "vocab_enrichment.json"
+vocab_enrichment = json.loads(ENRICHMENT_PATH.read_text(encoding="utf-8")) if ENRICHMENT_PATH.exists() else {}
@@ -0,0 +1,273 @@
+"""Bounded per-session conversation memory with eviction and spill-to-disk.
+
+Follow-up questions need the previous turns, but hundreds of concurrent
+sessions must not keep unbounded histories in RAM. A `Conversation` keeps
+the last few turns verbatim and folds older ones into a short truncated
+summary; Ollama contexts are stored as 4-byte `array`s instead of lists of
+Python ints. The process-wide `STORE` keeps conversations within a memory
+budget: idle sessions, then the least recently used ones, are spilled to a
+local SQLite file and loaded back transparently on their next question.
+
+    python conversations.py --simulate 1000   # resident memory report
+"""
+import argparse
+import base64
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional
+
+import llm_metrics
+
+MAX_TURNS = 6  # turns kept verbatim
+MAX_SUMMARY_CHARS = 1500
+# Drop a model's context once it grows past this many tokens
+MAX_CONTEXT_TOKENS = 3072
+
+MEMORY_BUDGET_BYTES = int(os.environ.get("FRENZGURU_CONVERSATION_BUDGET_MB", "64")) * 1024 * 1024
+IDLE_SECONDS = float(os.environ.get("FRENZGURU_CONVERSATION_IDLE", "900"))
+SPILL_TTL_SECONDS = 7 * 24 * 3600
+IDLE_SCAN_SECONDS = 30  # how often to look for idle sessions
+SPILL_PATH = os.environ.get("FRENZGURU_CONVERSATION_SPILL", ".conversations.db")
+
+
+@dataclass
+class Conversation:
+    """Ollama `context` per model plus the recent turns of one session."""
+    contexts: dict = field(default_factory=dict)
+    turns: list = field(default_factory=list)  # [prompt, answer] pairs, oldest first
+    summary: str = ""
+    last_prompt: Optional[str] = None
+    last_answer: Optional[str] = None
+    last_used: float = field(default_factory=time.time)
+
+    def context_for(self, model: str):
+        context = self.contexts.get(model)
+        return context.tolist() if context else None
+
+    def history(self) -> str:
+        """Earlier turns as text, for a model that has no context yet."""
+        lines = [self.summary] if self.summary else []
+        lines += [f"{prompt}\n{answer}" for prompt, answer in self.turns]
+        return "\n".join(lines)
+
+    def update(self, model: str, prompt: str, response):
+        context = response.get("context")
+        if context and len(context) <= MAX_CONTEXT_TOKENS:
+            self.contexts[model] = array("i", context)
+        else:
+            self.contexts.pop(model, None)
+        self.last_prompt, self.last_answer = prompt, response["response"]
+        self.turns.append([prompt, self.last_answer])
+        while len(self.turns) > MAX_TURNS:
+            old_prompt, old_answer = self.turns.pop(0)
+            self.summary = (self.summary + f"\n- {old_prompt[:120]} → {old_answer[:200]}")
+            self.summary = self.summary[-MAX_SUMMARY_CHARS:].lstrip()
+
+    def nbytes(self) -> int:
+        """Approximate resident size."""
+        size = 400 + len(self.summary) * 2
+        size += sum(len(p) + len(a) for p, a in self.turns) * 2 + 120 * len(self.turns)
+        size += sum(ctx.itemsize * len(ctx) + 80 for ctx in self.contexts.values())
+        size += (len(self.last_prompt or "") + len(self.last_answer or "")) * 2
+        return size
+
+    def dumps(self) -> bytes:
+        data = {
+            "contexts": {model: base64.b64encode(ctx.tobytes()).decode("ascii")
+                         for model, ctx in self.contexts.items()},
+            "turns": self.turns,
+            "summary": self.summary,
+            "last_prompt": self.last_prompt,
+            "last_answer": self.last_answer,
+            "last_used": self.last_used,
+        }
+        return zlib.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+    @classmethod
+    def loads(cls, blob: bytes) -> "Conversation":
+        data = json.loads(zlib.decompress(blob))
+        contexts = {}
+        for model, encoded in data.pop("contexts").items():
+            contexts[model] = array("i")
+            contexts[model].frombytes(base64.b64decode(encoded))
+        return cls(contexts=contexts, **data)
+
+
+class ConversationStore:
+    """Conversations kept in memory within a budget, the rest in SQLite."""
+
+    def __init__(self, budget_bytes: int = MEMORY_BUDGET_BYTES,
+                 idle_seconds: float = IDLE_SECONDS, spill_path: str = SPILL_PATH):
+        self.budget_bytes = budget_bytes
+        self.idle_seconds = idle_seconds
+        self.spill_path = spill_path
+        self._live = OrderedDict()  # session id -> Conversation, least recent first
+        self._sizes = {}  # session id -> nbytes when last released
+        self._resident = 0
+        self._in_use = {}  # session id -> number of holders and waiters
+        self._session_locks = {}  # session id -> Lock serializing its requests
+        self._lock = threading.RLock()
+        self._db = None
+        self._last_scan = time.time()
+        self._last_purge = 0.0
+
+    def _conn(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.spill_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS conversations "
+                             "(id TEXT PRIMARY KEY, data BLOB, last_used REAL)")
+        return self._db
+
+    def _spill(self, session_id: str):
+        conversation = self._live.pop(session_id)
+        self._resident -= self._sizes.pop(session_id, 0)
+        with self._conn() as db:
+            db.execute("INSERT OR REPLACE INTO conversations VALUES (?, ?, ?)",
+                       (session_id, conversation.dumps(), conversation.last_used))
+        llm_metrics.increment("conversation_spills")
+
+    def _load(self, session_id: str) -> Optional[Conversation]:
+        if self._db is None and not os.path.exists(self.spill_path):
+            return None
+        with self._conn() as db:
+            row = db.execute("SELECT data FROM conversations WHERE id = ?", (session_id,)).fetchone()
+            if row is None:
+                return None
+            db.execute("DELETE FROM conversations WHERE id = ?", (session_id,))
+        llm_metrics.increment("conversation_loads")
+        return Conversation.loads(row[0])
+
+    def started(self, session_id: str) -> bool:
+        """Whether the session has had a turn, without loading or waiting for it."""
+        with self._lock:
+            conversation = self._live.get(session_id)
+            if conversation is not None:
+                return bool(conversation.turns or conversation.summary)
+            if self._db is None and not os.path.exists(self.spill_path):
+                return False
+            return self._conn().execute("SELECT 1 FROM conversations WHERE id = ?",
+                                        (session_id,)).fetchone() is not None
+
+    @contextmanager
+    def session(self, session_id: str):
+        """The conversation of `session_id`, pinned in memory while in use.
+
+        Requests of one session are serialized: a second `session()` for the
+        same id waits until the first one has updated the conversation.
+        """
+        with self._lock:
+            conversation = self._live.get(session_id)
+            if conversation is None:
+                conversation = self._load(session_id) or Conversation()
+                self._live[session_id] = conversation
+            self._live.move_to_end(session_id)
+            self._in_use[session_id] = self._in_use.get(session_id, 0) + 1
+            session_lock = self._session_locks.setdefault(session_id, threading.Lock())
+        session_lock.acquire()  # outside the store lock: other sessions go on
+        try:
+            yield conversation
+        finally:
+            with self._lock:
+                conversation.last_used = time.time()
+                size = conversation.nbytes()
+                self._resident += size - self._sizes.get(session_id, 0)
+                self._sizes[session_id] = size
+                session_lock.release()
+                self._in_use[session_id] -= 1
+                if not self._in_use[session_id]:
+                    del self._in_use[session_id]
+                    del self._session_locks[session_id]
+                self.enforce()
+
+    def enforce(self):
+        """Spill idle sessions, then least recently used ones over the budget."""
+        with self._lock:
+            now = time.time()
+            if now - self._last_scan > IDLE_SCAN_SECONDS:
+                for session_id, conversation in list(self._live.items()):
+                    if session_id not in self._in_use and now - conversation.last_used > self.idle_seconds:
+                        self._spill(session_id)
+                self._last_scan = now
+            if self._resident > self.budget_bytes:
+                for session_id in list(self._live):
+                    if self._resident <= self.budget_bytes:
+                        break
+                    if session_id not in self._in_use:
+                        self._spill(session_id)
+            if now - self._last_purge > 3600 and self._db is not None:
+                with self._db as db:
+                    db.execute("DELETE FROM conversations WHERE last_used < ?",
+                               (now - SPILL_TTL_SECONDS,))
+                self._last_purge = now
+            llm_metrics.set_gauge("conversation_resident_bytes", self._resident)
+            llm_metrics.set_gauge("conversation_sessions", len(self._live), state="memory")
+
+    def report(self) -> dict:
+        """Resident memory per session and spill statistics."""
+        with self._lock:
+            sizes = sorted(c.nbytes() for c in self._live.values())
+            spilled = 0
+            if self._db is not None:
+                spilled = self._db.execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
+        return {
+            "sessions_in_memory": len(sizes),
+            "sessions_spilled": spilled,
+            "resident_bytes": sum(sizes),
+            "budget_bytes": self.budget_bytes,
+            "per_session_bytes": {
+                "p50": llm_metrics.quantile(sizes, 0.5),
+                "p95": llm_metrics.quantile(sizes, 0.95),
+                "max": sizes[-1] if sizes else 0,
+            },
+        }
+
+
+STORE = ConversationStore()
+
+
+def session(session_id: str):
+    """Shortcut for `STORE.session`."""
+    return STORE.session(session_id)
+
+
+def _simulate(sessions: int, turns: int, budget_mb: int):
+    """Fill a store like `sessions` concurrent students asking follow-ups."""
+    import random
+    import tempfile
+    import tracemalloc
+
+    spill = os.path.join(tempfile.mkdtemp(), "conversations.db")
+    store = ConversationStore(budget_bytes=budget_mb * 1024 * 1024, spill_path=spill)
+    answer = "Verwenden Sie 'weil' mit dem Verb am Ende des Nebensatzes. " * 6
+    tracemalloc.start()
+    start = time.perf_counter()
+    for turn in range(turns):
+        for i in range(sessions):
+            with store.session(f"s{i}") as conversation:
+                context = [random.randrange(32000) for _ in range(250 * (turn + 1))]
+                conversation.update("deepseek-r1:8b", f"Frage {turn}: Wann benutze ich weil?",
+                                    {"response": answer, "context": context})
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    report = store.report()
+    report.update(traced_bytes=current, traced_peak_bytes=peak,
+                  traced_bytes_per_session=current // max(1, report["sessions_in_memory"]),
+                  seconds=round(elapsed, 2))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Conversation store memory report.")
+    parser.add_argument("--simulate", type=int, default=500, metavar="SESSIONS")
+    parser.add_argument("--turns", type=int, default=8)
+    parser.add_argument("--budget-mb", type=int, default=16)
+    args = parser.parse_args()
+    _simulate(args.simulate, args.turns, args.budget_mb)
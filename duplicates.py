@@ -0,0 +1,370 @@
+"""Near-duplicate detection across Schreiben submissions with MinHash/LSH.
+
+Every submission is reduced to its word 3-shingles (case, umlauts and
+punctuation folded) and a MinHash signature of NUM_PERM 32-bit values,
+which estimates the Jaccard similarity of two shingle sets. The signature
+is cut into BANDS bands; submissions sharing a band land in the same
+bucket, so an insert only compares against the few submissions in its
+buckets instead of all of them. Candidates whose estimated similarity is
+at least THRESHOLD are flagged. The `writing_templates` examples are in
+the index too, so a pasted template is flagged as such.
+
+Signatures and flags are appended to ``$FRENZGURU_DUPLICATES_DB`` (SQLite);
+a process loads them once and catches up on rows other processes added
+before each insert.
+
+    python duplicates.py benchmark --submissions 100000
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import content
+import llm_metrics
+from suggestions import normalize
+
+DB_PATH = os.environ.get("FRENZGURU_DUPLICATES_DB", ".duplicates.db")
+SHINGLE_WORDS = 3
+NUM_PERM = 64
+BANDS = 16  # of NUM_PERM // BANDS rows: candidates from a Jaccard similarity of about 0.5
+THRESHOLD = 0.5  # estimated Jaccard similarity that counts as a near-duplicate
+MIN_WORDS = 20  # shorter texts share too much boilerplate to judge
+MAX_MATCHES = 10  # reported per submission, most similar first
+TEMPLATE_PREFIX = "vorlage:"
+
+_rng = np.random.default_rng(20240601)
+# Multiply-shift hashing: (a * x + b) >> 32 with odd 64-bit a, one (a, b) per permutation
+_A = _rng.integers(1, 2 ** 63, NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_B = _rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64)
+_BAND_MIX = _rng.integers(1, 2 ** 63, NUM_PERM // BANDS, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id TEXT PRIMARY KEY, class TEXT, student TEXT, task TEXT, created REAL, signature BLOB
+);
+CREATE TABLE IF NOT EXISTS flags (
+    submission TEXT, match TEXT, similarity REAL, class TEXT, created REAL,
+    PRIMARY KEY (submission, match)
+);
+"""
+
+
+@dataclass(frozen=True)
+class Match:
+    id: str
+    similarity: float  # estimated Jaccard similarity of the shingle sets
+
+
+def shingles(text: str) -> np.ndarray:
+    """CRC32 hashes of the word 3-shingles of `text`."""
+    words = normalize(text).split()
+    if len(words) < MIN_WORDS:
+        return np.empty(0, dtype=np.uint64)
+    grams = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+def signature(text: str):
+    """MinHash signature of `text`, or None if it is too short."""
+    hashes = shingles(text)
+    if not len(hashes):
+        return None
+    return ((hashes[:, None] * _A + _B) >> np.uint64(32)).min(axis=0).astype(np.uint32)
+
+
+def signatures(texts) -> tuple:
+    """Signatures of many texts at once; returns (matrix, indices of the texts long enough)."""
+    hashes = [shingles(text) for text in texts]
+    keep = [i for i, h in enumerate(hashes) if len(h)]
+    matrix = np.empty((len(keep), NUM_PERM), dtype=np.uint32)
+    for start in range(0, len(keep), 2000):  # bounds the (shingles x NUM_PERM) temporary
+        chunk = [hashes[i] for i in keep[start:start + 2000]]
+        flat = np.concatenate(chunk)
+        offsets = np.cumsum([0] + [len(h) for h in chunk[:-1]])
+        permuted = (flat[:, None] * _A + _B) >> np.uint64(32)
+        matrix[start:start + len(chunk)] = np.minimum.reduceat(permuted, offsets, axis=0)
+    return matrix, keep
+
+
+def band_keys(matrix: np.ndarray) -> np.ndarray:
+    """One 64-bit key per band and signature (rows x BANDS)."""
+    bands = matrix.reshape(len(matrix), BANDS, NUM_PERM // BANDS).astype(np.uint64)
+    return (bands * _BAND_MIX).sum(axis=2, dtype=np.uint64)
+
+
+class Index:
+    """MinHash signatures in one growing matrix plus one bucket dict per band."""
+
+    def __init__(self):
+        self.ids = []
+        self.meta = []  # (class, student) per row
+        self._row = {}  # id -> row
+        self._matrix = np.empty((1024, NUM_PERM), dtype=np.uint32)
+        self._buckets = [dict() for _ in range(BANDS)]  # key -> row, or list of rows
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, submission_id):
+        return submission_id in self._row
+
+    def _insert(self, submission_id, sig, keys, meta):
+        row = len(self.ids)
+        if row == len(self._matrix):
+            self._matrix = np.concatenate([self._matrix, np.empty_like(self._matrix)])
+        self._matrix[row] = sig
+        self.ids.append(submission_id)
+        self.meta.append(meta)
+        self._row[submission_id] = row
+        for bucket, key in zip(self._buckets, keys.tolist()):
+            present = bucket.get(key)
+            if present is None:
+                bucket[key] = row
+            elif isinstance(present, list):
+                present.append(row)
+            else:
+                bucket[key] = [present, row]
+
+    def query(self, sig, keys=None) -> list:
+        """Indexed submissions with an estimated similarity of at least THRESHOLD."""
+        keys = band_keys(sig[None])[0] if keys is None else keys
+        candidates = set()
+        for bucket, key in zip(self._buckets, keys.tolist()):
+            present = bucket.get(key)
+            if isinstance(present, list):
+                candidates.update(present)
+            elif present is not None:
+                candidates.add(present)
+        if not candidates:
+            return []
+        rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        similarity = (self._matrix[rows] == sig).mean(axis=1)
+        hits = np.flatnonzero(similarity >= THRESHOLD)
+        order = hits[np.argsort(-similarity[hits], kind="stable")]
+        return [Match(self.ids[rows[i]], round(float(similarity[i]), 3)) for i in order]
+
+    def add(self, submission_id, sig, meta=("", "")) -> list:
+        """Insert a signature; returns its near-duplicates among the earlier ones."""
+        keys = band_keys(sig[None])[0]
+        matches = [m for m in self.query(sig, keys) if m.id != submission_id]
+        if submission_id not in self._row:
+            self._insert(submission_id, sig, keys, meta)
+        return matches
+
+    def add_many(self, ids, matrix, metas):
+        """Bulk insert without queries (loading from disk)."""
+        for submission_id, sig, keys, meta in zip(ids, matrix, band_keys(matrix), metas):
+            if submission_id not in self._row:
+                self._insert(submission_id, sig, keys, meta)
+
+
+def _connect(path: str = None):
+    db = sqlite3.connect(path or DB_PATH, timeout=30, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.executescript(_SCHEMA)
+    return db
+
+
+class Store:
+    """The index of one process, kept in step with the SQLite file."""
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.index = None
+        self._db = None
+        self._last_rowid = 0
+        self._lock = threading.Lock()
+
+    def _sync(self):
+        """Load rows added since the last sync (all of them the first time)."""
+        if self._db is None:
+            self._db = _connect(self.path)
+            self.index = Index()
+            self._add_templates()
+        rows = self._db.execute("SELECT rowid, id, class, student, signature FROM submissions "
+                                "WHERE rowid > ? ORDER BY rowid", (self._last_rowid,)).fetchall()
+        if rows:
+            matrix = np.frombuffer(b"".join(r[4] for r in rows), dtype=np.uint32).reshape(len(rows), NUM_PERM)
+            self.index.add_many([r[1] for r in rows], matrix, [(r[2], r[3]) for r in rows])
+            self._last_rowid = rows[-1][0]
+
+    def _add_templates(self):
+        names = list(content.writing_templates)
+        matrix, keep = signatures(content.writing_templates[name]["example"] for name in names)
+        self.index.add_many([TEMPLATE_PREFIX + names[i] for i in keep], matrix, [("", "")] * len(keep))
+
+    def add(self, submission_id: str, text: str, *, class_id: str = "", student: str = "",
+            task: str = "") -> list:
+        """Index a submission and record its near-duplicates; returns them."""
+        sig = signature(text)
+        if sig is None:
+            return []
+        start = time.perf_counter()
+        with self._lock:
+            self._sync()
+            if submission_id in self.index:
+                return []
+            matches = self.index.add(submission_id, sig, (class_id, student))
+            # Several texts of the same student (drafts) are not copies
+            matches = [m for m in matches if m.id.startswith(TEMPLATE_PREFIX)
+                       or self.index.meta[self.index._row[m.id]][1] != student][:MAX_MATCHES]
+            now = time.time()
+            with self._db as db:
+                db.execute("INSERT OR IGNORE INTO submissions VALUES (?, ?, ?, ?, ?, ?)",
+                                    (submission_id, class_id, student, task, now, sig.tobytes()))
+                db.executemany("INSERT OR IGNORE INTO flags VALUES (?, ?, ?, ?, ?)",
+                               [(submission_id, m.id, m.similarity, class_id, now) for m in matches])
+        llm_metrics.increment("duplicate_checks", flagged=bool(matches))
+        llm_metrics.set_gauge("duplicate_check_seconds", round(time.perf_counter() - start, 4))
+        return matches
+
+    def flags(self, class_id: str = None) -> pd.DataFrame:
+        with self._lock:
+            self._sync()
+            query = ("SELECT f.created, f.class, s.student, s.task, f.submission, f.match, f.similarity, "
+                     "m.student AS match_student FROM flags f JOIN submissions s ON s.id = f.submission "
+                     "LEFT JOIN submissions m ON m.id = f.match")
+            params = ()
+            if class_id is not None:
+                query += " WHERE f.class = ?"
+                params = (class_id,)
+            return pd.read_sql_query(query + " ORDER BY f.created DESC LIMIT 200", self._db, params=params)
+
+
+STORE = Store()
+
+
+def add(submission_id: str, text: str, **kwargs) -> list:
+    """Index a submission; a failing check never blocks the student's submission."""
+    try:
+        return STORE.add(submission_id, text, **kwargs)
+    except Exception as e:
+        llm_metrics.logger.warning(json.dumps({"event": "duplicate_check_failed", "id": submission_id,
+                                               "error": repr(e)}))
+        return []
+
+
+def render(class_id: str = None):
+    """Flagged Schreiben submissions for the teacher dashboard."""
+    st.subheader("Auffällig ähnliche Schreiben-Texte")
+    flags = STORE.flags(class_id)
+    if flags.empty:
+        st.caption("Keine auffälligen Texte.")
+        return
+    matched = np.where(flags["match"].str.startswith(TEMPLATE_PREFIX),
+                       "Vorlage " + flags["match"].str.removeprefix(TEMPLATE_PREFIX),
+                       flags["match_student"].fillna(""))
+    st.dataframe(pd.DataFrame({
+        "Zeit": pd.to_datetime(flags["created"], unit="s").dt.strftime("%d.%m. %H:%M"),
+        "Klasse": flags["class"],
+        "Schüler/in": flags["student"],
+        "Aufgabe": flags["task"],
+        "Ähnlich zu": matched,
+        "Ähnlichkeit": (flags["similarity"] * 100).round().astype(int).astype(str) + " %",
+    }), hide_index=True)
+    st.caption(f"Geschätzte Übereinstimmung der Wortfolgen (3 Wörter), ab {THRESHOLD:.0%}.")
+
+
+# --- Benchmark --- #
+def _synthetic(count: int, copy_share: float, template_share: float, seed: int = 0):
+    """Random letters from the study content's words, with injected copies.
+
+    Returns texts and, per text, the index it was copied from (-1: none,
+    -2: a template example).
+    """
+    rng = np.random.default_rng(seed)
+    corpus = normalize(json.dumps([content.exam_data, content.vocab_data, content.exercises],
+                                  ensure_ascii=False)).split()
+    words = np.array(sorted(set(w for w in corpus if len(w) > 2)))
+    templates = [normalize(t["example"]).split() for t in content.writing_templates.values()]
+    texts, source = [], np.full(count, -1)
+    for i in range(count):
+        roll = rng.random()
+        if i and roll < copy_share:
+            source[i] = rng.integers(i)
+            base = texts[source[i]].split()
+        elif roll < copy_share + template_share:
+            base, source[i] = list(templates[rng.integers(len(templates))]), -2
+        else:
+            texts.append(" ".join(words[rng.integers(len(words), size=rng.integers(80, 121))]))
+            continue
+        # A copy with about 5 % of the words changed
+        for j in rng.choice(len(base), size=max(1, len(base) // 20), replace=False):
+            base[j] = words[rng.integers(len(words))]
+        texts.append(" ".join(base))
+    return texts, source
+
+
+def benchmark(count: int, sample: int = 2000) -> dict:
+    import tempfile
+
+    texts, source = _synthetic(count, copy_share=0.02, template_share=0.01)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Store(os.path.join(tmp, "duplicates.db"))
+        start = time.perf_counter()
+        matrix, keep = signatures(texts)
+        hashing = time.perf_counter() - start
+
+        latencies, flagged = [], np.zeros(count, dtype=bool)
+        with store._lock:
+            store._sync()
+        start = time.perf_counter()
+        for i, sig in zip(keep, matrix):
+            t = time.perf_counter()
+            flagged[i] = bool(store.index.add(str(i), sig))
+            latencies.append(time.perf_counter() - t)
+        indexing = time.perf_counter() - start
+
+        # Durable path: insert into SQLite with the flags, then reload from disk
+        start = time.perf_counter()
+        for i in range(min(sample, count)):
+            store.add(f"extra-{i}", texts[i], student=f"s{i}")
+        add_seconds = (time.perf_counter() - start) / min(sample, count)
+        with store._lock, store._db as db:
+            db.executemany("INSERT OR IGNORE INTO submissions VALUES (?, '', '', '', 0, ?)",
+                           [(str(i), sig.tobytes()) for i, sig in zip(keep, matrix)])
+        start = time.perf_counter()
+        reloaded = Store(store.path)
+        with reloaded._lock:
+            reloaded._sync()
+        load_seconds = time.perf_counter() - start
+
+        # Exhaustive comparison of a sample, extrapolated to all pairs
+        rows = matrix[:sample]
+        start = time.perf_counter()
+        for sig in rows:
+            (matrix == sig).mean(axis=1)
+        pairwise = (time.perf_counter() - start) / len(rows)
+
+    copied = source != -1
+    return {
+        "submissions": count,
+        "hash_seconds": round(hashing, 2),
+        "insert_query_seconds": round(indexing, 2),
+        "insert_query_p50_ms": round(llm_metrics.quantile(latencies, 0.5) * 1000, 3),
+        "insert_query_p95_ms": round(llm_metrics.quantile(latencies, 0.95) * 1000, 3),
+        "durable_add_ms": round(add_seconds * 1000, 3),
+        "exhaustive_query_ms": round(pairwise * 1000, 3),
+        "reload_seconds": round(load_seconds, 2),
+        "reloaded_rows": len(reloaded.index),
+        "injected_copies": int(copied.sum()),
+        "recall": round(float(flagged[copied].mean()), 3),
+        "false_positive_rate": round(float(flagged[~copied].mean()), 5),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Near-duplicate Schreiben submissions.")
+    parser.add_argument("command", choices=["benchmark"])
+    parser.add_argument("--submissions", type=int, default=100000)
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.submissions), indent=2))
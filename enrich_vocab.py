@@ -0,0 +1,146 @@
+"""Offline enrichment of `vocab_data` with example sentences, case/gender and distractors.
+
+Each vocab entry is sent to the local Ollama model once; the results are
+written to ``vocab_enrichment.json`` next to `content.py`, which loads them
+as `content.vocab_enrichment`. Every result stores a hash of its entry
+(category, word, meaning), the prompt template version and the model, so a
+rebuild only regenerates entries whose hash changed: editing five words
+regenerates five entries. Entries removed from `vocab_data` are dropped.
+
+    python enrich_vocab.py                 # incremental rebuild
+    python enrich_vocab.py --dry-run       # show what would be regenerated
+    python enrich_vocab.py --workers 4 --force
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import content
+import generation_profiles
+import llm
+import model_router
+import prompts
+
+TEMPLATE = prompts.get("vocab_enrichment")
+PROFILE = generation_profiles.PROFILES["enrichment"]
+# Offline: always the primary exercise model, never the SLO fallback
+MODEL = os.environ.get("FRENZGURU_ENRICH_MODEL", model_router.ROUTES[model_router.EXERCISE].model)
+# Ollama serves one request per model at a time unless OLLAMA_NUM_PARALLEL is raised
+WORKERS = int(os.environ.get("FRENZGURU_ENRICH_WORKERS", "2"))
+ATTEMPTS = 3
+
+
+def entry_key(category: str, word: str) -> str:
+    return f"{category}/{word}"
+
+
+def entry_hash(category: str, word: str, meaning: str, model: str = MODEL) -> str:
+    """Changes when the entry, the prompt template or the model changes."""
+    data = [category, word, meaning, TEMPLATE.name, TEMPLATE.version, model]
+    return hashlib.sha256(json.dumps(data, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def plan(vocab: dict, store: dict, force: bool = False):
+    """Split `vocab` into entries to (re)generate and entries to keep; list stale keys."""
+    todo, keep = [], {}
+    for category, items in vocab.items():
+        for word, meaning in items.items():
+            key = entry_key(category, word)
+            digest = entry_hash(category, word, meaning)
+            if not force and store.get(key, {}).get("hash") == digest:
+                keep[key] = store[key]
+            else:
+                todo.append((key, digest, category, word, meaning))
+    removed = sorted(set(store) - set(keep) - {key for key, *_ in todo})
+    return todo, keep, removed
+
+
+def _validate(data, word: str) -> dict:
+    examples = [e.strip() for e in data.get("examples") or [] if isinstance(e, str) and e.strip()]
+    distractors = [d.strip() for d in data.get("distractors") or []
+                   if isinstance(d, str) and d.strip() and d.strip().lower() != word.lower()]
+    if len(examples) < 2 or len(distractors) < 3:
+        raise ValueError(f"incomplete answer: {data!r}")
+    gender = data.get("gender")
+    return {
+        "examples": examples[:2],
+        "gender": gender if gender in ("der", "die", "das") else None,
+        "case": data.get("case") or None,
+        "distractors": distractors[:3],
+    }
+
+
+def enrich(category: str, word: str, meaning: str) -> dict:
+    """Ask the model for one entry; retries answers that aren't usable JSON."""
+    prompt = TEMPLATE.render(f"Kategorie: {category}\nEintrag: {word}\nBedeutung: {meaning}")
+    for attempt in range(1, ATTEMPTS + 1):
+        response = llm.generate(MODEL, prompt, template=TEMPLATE.name, template_version=TEMPLATE.version,
+                                route="enrichment", profile=PROFILE, system=TEMPLATE.system, format="json")
+        try:
+            return _validate(json.loads(response["response"]), word)
+        except (ValueError, AttributeError) as e:  # JSONDecodeError is a ValueError
+            if attempt == ATTEMPTS:
+                raise ValueError(f"{category}/{word}: {e}") from e
+
+
+def save(store: dict, path=content.ENRICHMENT_PATH):
+    with tempfile.NamedTemporaryFile("w", dir=path.parent, delete=False, encoding="utf-8") as tmp:
+        json.dump(dict(sorted(store.items())), tmp, ensure_ascii=False, indent=2)
+        tmp.write("\n")
+    os.replace(tmp.name, path)
+
+
+def rebuild(vocab: dict = None, *, workers: int = WORKERS, force: bool = False,
+            dry_run: bool = False, path=content.ENRICHMENT_PATH) -> dict:
+    """Regenerate changed entries with at most `workers` requests in flight."""
+    vocab = content.vocab_data if vocab is None else vocab
+    store = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+    todo, keep, removed = plan(vocab, store, force)
+    summary = {"unchanged": len(keep), "regenerate": len(todo), "removed": len(removed), "failed": []}
+    if dry_run:
+        summary["keys"] = [key for key, *_ in todo]
+        return summary
+
+    # Keep old results of entries that fail again, and save as entries complete
+    result = {**{key: store[key] for key, *_ in todo if key in store}, **keep}
+    lock = threading.Lock()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="frenzguru-enrich") as pool:
+        futures = {pool.submit(enrich, category, word, meaning): (key, digest, category, word)
+                   for key, digest, category, word, meaning in todo}
+        for future in as_completed(futures):
+            key, digest, category, word = futures[future]
+            try:
+                data = future.result()
+            except Exception as e:
+                summary["failed"].append(f"{key}: {e}")
+                continue
+            with lock:
+                result[key] = {"category": category, "word": word, "hash": digest, "model": MODEL,
+                               "template_version": TEMPLATE.version, **data}
+                save(result, path)
+    if removed or not todo:
+        save(result, path)
+    summary["seconds"] = round(time.perf_counter() - start, 1)
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Enrich vocab_data with the local Ollama model.")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--force", action="store_true", help="regenerate every entry")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+    summary = rebuild(workers=args.workers, force=args.force, dry_run=args.dry_run)
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
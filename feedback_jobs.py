@@ -0,0 +1,296 @@
+"""Durable queue of writing-feedback jobs, processed by worker threads and processes.
+
+"Feedback erhalten" no longer blocks on the model: the request becomes a
+row in ``$FRENZGURU_JOBS_DB`` (SQLite, WAL) keyed by a hash of the student,
+template and text, so a double click or rerun finds the existing job
+instead of starting another. Workers claim jobs with a lease they renew
+while the model runs; a job whose worker died (tab closed, Streamlit or
+machine restart) is claimed again once its lease expires. Failed attempts
+are retried with exponential backoff. Students find their results under
+"Meine Feedback-Aufträge", also after reopening the app with the same link.
+
+    python feedback_jobs.py worker --processes 4   # extra workers for exam week
+    python feedback_jobs.py stats
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import socket
+import sqlite3
+import threading
+import time
+
+import streamlit as st
+
+import analytics
+import api_client
+import duplicates
+import llm_metrics
+import model_router
+import prompts
+
+DB_PATH = os.environ.get("FRENZGURU_JOBS_DB", ".feedback_jobs.db")
+# Worker threads in each app/API process; more via `python feedback_jobs.py worker`
+EMBEDDED_WORKERS = int(os.environ.get("FRENZGURU_JOB_WORKERS", "1"))
+WAIT_SECONDS = float(os.environ.get("FRENZGURU_JOB_WAIT", "60"))  # the app waits this long for a result
+LEASE_SECONDS = 120
+MAX_ATTEMPTS = 4
+BACKOFF_SECONDS = 10  # 10 s, 20 s, 40 s (plus jitter) before attempts 2-4
+POLL_SECONDS = 1.0
+STATS_WINDOW_SECONDS = 3600
+GAUGE_SECONDS = 5.0  # how often a worker refreshes the queue gauges
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    key TEXT PRIMARY KEY, owner TEXT, template TEXT, template_version TEXT, text TEXT,
+    status TEXT, attempts INTEGER DEFAULT 0, not_before REAL, created REAL, started REAL,
+    finished REAL, lease_until REAL, worker TEXT, model TEXT, result TEXT, error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, not_before);
+CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (owner, created);
+"""
+
+
+def _connect(path: str = None):
+    db = sqlite3.connect(path or DB_PATH, timeout=30, isolation_level=None)
+    db.row_factory = sqlite3.Row
+    db.execute("PRAGMA journal_mode=WAL")
+    db.executescript(_SCHEMA)
+    return db
+
+
+def job_key(owner: str, template: str, template_version: str, text: str) -> str:
+    data = [owner, template, template_version, " ".join(text.split())]
+    return hashlib.sha256(json.dumps(data, ensure_ascii=False).encode("utf-8")).hexdigest()[:20]
+
+
+def submit(owner: str, text: str, template: str = "schreiben_feedback", db=None, class_id: str = "") -> str:
+    """Queue feedback on `text`; the same request again returns the same job.
+
+    `class_id` only labels the text's near-duplicate check (`duplicates.py`).
+    """
+    prompt = prompts.get(template)
+    key = job_key(owner, prompt.name, prompt.version, text)
+    now = time.time()
+    db = db or _connect()
+    db.execute("INSERT INTO jobs (key, owner, template, template_version, text, status, not_before, created) "
+               "VALUES (?, ?, ?, ?, ?, 'queued', ?, ?) "
+               # Asking again after a final failure starts over
+               "ON CONFLICT (key) DO UPDATE SET status = 'queued', attempts = 0, not_before = ?, error = NULL "
+               "WHERE status = 'failed'",
+               (key, owner, prompt.name, prompt.version, text, now, now, now))
+    duplicates.add(key, text, class_id=class_id, student=owner, task=prompt.name)
+    return key
+
+
+def get(key: str, db=None):
+    row = (db or _connect()).execute("SELECT * FROM jobs WHERE key = ?", (key,)).fetchone()
+    return dict(row) if row else None
+
+
+def jobs_for(owner: str, limit: int = 10, db=None) -> list:
+    rows = (db or _connect()).execute("SELECT * FROM jobs WHERE owner = ? ORDER BY created DESC LIMIT ?",
+                                      (owner, limit)).fetchall()
+    return [dict(row) for row in rows]
+
+
+# --- Workers --- #
+def _claim(db, worker: str):
+    """Take the oldest ready job (or one whose worker's lease expired)."""
+    now = time.time()
+    # A job whose worker died on its last attempt (e.g. it crashes the process) is not retried
+    lost = db.execute(
+        "UPDATE jobs SET status = 'failed', lease_until = NULL, "
+        "error = 'worker lost on attempt ' || attempts "
+        "WHERE status = 'running' AND lease_until < ? AND attempts >= ? RETURNING key",
+        (now, MAX_ATTEMPTS)).fetchall()
+    if lost:
+        llm_metrics.increment("feedback_jobs_failed", len(lost))
+    rows = db.execute(
+        "UPDATE jobs SET status = 'running', worker = ?, started = COALESCE(started, ?), "
+        "lease_until = ?, attempts = attempts + 1 "
+        "WHERE key = (SELECT key FROM jobs WHERE (status = 'queued' AND not_before <= ?) "
+        "OR (status = 'running' AND lease_until < ? AND attempts < ?) ORDER BY created LIMIT 1) "
+        "RETURNING *", (worker, now, now + LEASE_SECONDS, now, now, MAX_ATTEMPTS)).fetchall()
+    return dict(rows[0]) if rows else None
+
+
+def _renew(key: str, worker: str, done: threading.Event):
+    db = _connect()
+    while not done.wait(LEASE_SECONDS / 4):
+        try:
+            db.execute("UPDATE jobs SET lease_until = ? WHERE key = ? AND worker = ? AND status = 'running'",
+                       (time.time() + LEASE_SECONDS, key, worker))
+        except sqlite3.Error as e:  # e.g. locked; the lease has time for the next try
+            llm_metrics.logger.warning(json.dumps({"event": "feedback_lease_renew_failed", "key": key,
+                                                   "error": repr(e)}))
+
+
+def _generate(job: dict):
+    if api_client.API_URL:
+        answer = api_client.ask(job["text"], template=job["template"], task=model_router.FEEDBACK)
+        return {"response": answer, "model": None}
+    template = prompts.get(job["template"])
+    return model_router.generate(model_router.FEEDBACK, template.render(job["text"]), template=template.name,
+                                 template_version=template.version, system=template.system)
+
+
+def run_one(db, worker: str, generate=_generate) -> bool:
+    """Process one job; False if none was ready."""
+    job = _claim(db, worker)
+    if job is None:
+        return False
+    llm_metrics.increment("feedback_jobs_started")
+    done = threading.Event()
+    threading.Thread(target=_renew, args=(job["key"], worker, done), daemon=True).start()
+    try:
+        response = generate(job)
+        if not response["response"]:
+            raise ValueError("empty answer (reasoning used up the output budget)")
+    except Exception as e:
+        final = job["attempts"] >= MAX_ATTEMPTS
+        delay = BACKOFF_SECONDS * 2 ** (job["attempts"] - 1) * random.uniform(1, 1.5)
+        db.execute("UPDATE jobs SET status = ?, not_before = ?, error = ?, lease_until = NULL "
+                   "WHERE key = ? AND worker = ?",
+                   ("failed" if final else "queued", time.time() + delay, repr(e), job["key"], worker))
+        llm_metrics.increment("feedback_jobs_failed" if final else "feedback_jobs_retried")
+        llm_metrics.logger.warning(json.dumps({"event": "feedback_job_error", "key": job["key"],
+                                               "attempt": job["attempts"], "final": final, "error": repr(e)}))
+    else:
+        db.execute("UPDATE jobs SET status = 'done', finished = ?, result = ?, model = ?, error = NULL, "
+                   "lease_until = NULL WHERE key = ? AND worker = ?",
+                   (time.time(), response["response"], response.get("model"), job["key"], worker))
+        llm_metrics.increment("feedback_jobs_completed")
+    finally:
+        done.set()
+    return True
+
+
+def work(stop: threading.Event = None, generate=_generate):
+    """Process jobs until `stop` is set."""
+    stop = stop or threading.Event()
+    db = _connect()
+    worker = f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+    gauges_at = 0.0
+    while not stop.is_set():
+        try:
+            ran = run_one(db, worker, generate)
+            # Keep /metrics current even when nobody opens GET /v1/jobs
+            if time.monotonic() - gauges_at >= GAUGE_SECONDS:
+                stats(db)
+                gauges_at = time.monotonic()
+            if not ran:
+                stop.wait(POLL_SECONDS)
+        except sqlite3.OperationalError as e:  # e.g. locked for longer than the timeout
+            llm_metrics.logger.warning(json.dumps({"event": "feedback_worker_error", "error": repr(e)}))
+            stop.wait(POLL_SECONDS)
+
+
+_workers = []
+_workers_lock = threading.Lock()
+
+
+def start_workers(count: int = EMBEDDED_WORKERS):
+    """Start `count` worker threads in this process, once."""
+    with _workers_lock:
+        while len(_workers) < count:
+            thread = threading.Thread(target=work, name=f"frenzguru-jobs-{len(_workers)}", daemon=True)
+            thread.start()
+            _workers.append(thread)
+
+
+def stats(db=None, window: float = STATS_WINDOW_SECONDS) -> dict:
+    """Queue depth, wait times and throughput over the last `window` seconds."""
+    db = db or _connect()
+    now = time.time()
+    counts = dict(db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+    waits = [row[0] for row in db.execute(
+        "SELECT started - created FROM jobs WHERE started >= ?", (now - window,))]
+    done = [row[0] for row in db.execute(
+        "SELECT finished - created FROM jobs WHERE status = 'done' AND finished >= ?", (now - window,))]
+    oldest = db.execute("SELECT MIN(created) FROM jobs WHERE status = 'queued'").fetchone()[0]
+    report = {
+        "queued": counts.get("queued", 0),
+        "running": counts.get("running", 0),
+        "done": counts.get("done", 0),
+        "failed": counts.get("failed", 0),
+        "oldest_queued_seconds": round(now - oldest, 1) if oldest else 0.0,
+        "wait_p50_seconds": round(llm_metrics.quantile(waits, 0.5), 2) if waits else 0.0,
+        "wait_p95_seconds": round(llm_metrics.quantile(waits, 0.95), 2) if waits else 0.0,
+        "turnaround_p95_seconds": round(llm_metrics.quantile(done, 0.95), 2) if done else 0.0,
+        "completed_per_minute": round(len(done) / (window / 60), 2),
+    }
+    for name in ("queued", "running", "oldest_queued_seconds", "wait_p95_seconds", "completed_per_minute"):
+        llm_metrics.set_gauge(f"feedback_jobs_{name}", report[name])
+    return report
+
+
+# --- App --- #
+def owner() -> str:
+    """This student's id, kept in the page URL so results survive a closed tab."""
+    return analytics.learner()[1]
+
+
+def request(text: str, template: str = "schreiben_feedback"):
+    """Queue feedback on `text` and wait up to WAIT_SECONDS for it; the answer or None."""
+    if not text.strip():
+        st.warning("Bitte schreibe zuerst deinen Text.")
+        return None
+    class_id, student = analytics.learner()
+    db = _connect()  # one connection for the whole wait
+    try:
+        key = submit(student, text, template, db=db, class_id=class_id)
+        deadline = time.monotonic() + WAIT_SECONDS
+        with st.spinner("Dein Feedback wird erstellt..."):
+            while (job := get(key, db))["status"] in ("queued", "running") and time.monotonic() < deadline:
+                time.sleep(0.5)
+    finally:
+        db.close()
+    if job["status"] == "done":
+        return job["result"]
+    if job["status"] == "failed":
+        st.error(f"Feedback konnte nicht erstellt werden: {job['error']}")
+    else:
+        st.info("Viele Anfragen gerade – dein Feedback wird weiter erstellt. "
+                "Du findest es später unter „Meine Feedback-Aufträge“ (auch nach dem Schließen des Tabs "
+                "über denselben Link).")
+    return None
+
+
+STATUS_LABELS = {"queued": "⏳ in der Warteschlange", "running": "✍️ wird erstellt",
+                 "done": "✅ fertig", "failed": "❌ fehlgeschlagen"}
+
+
+def render_jobs():
+    """The student's recent feedback jobs with their results."""
+    jobs = jobs_for(owner())
+    if not jobs:
+        return
+    with st.expander(f"📬 Meine Feedback-Aufträge ({len(jobs)})"):
+        st.button("🔄 Aktualisieren", key="feedback_jobs_refresh")
+        for job in jobs:
+            created = time.strftime("%d.%m. %H:%M", time.localtime(job["created"]))
+            st.markdown(f"**{created}** – {STATUS_LABELS[job['status']]}  \n*{job['text'][:80]}...*")
+            if job["status"] == "done":
+                st.markdown(job["result"])
+            elif job["status"] == "failed":
+                st.caption(job["error"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Durable writing-feedback jobs.")
+    parser.add_argument("command", choices=["worker", "stats"])
+    parser.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args()
+    if args.command == "stats":
+        print(json.dumps(stats(), indent=2))
+    else:
+        processes = [multiprocessing.Process(target=work, name=f"frenzguru-jobs-{i}")
+                     for i in range(args.processes)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
@@ -1,10 +1,25 @@
 import streamlit as st
-import ollama  # Ollama Python client
 import pandas as pd
 import random
+import uuid
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from typing import Optional
 
+import api_client
+import assets
+import blocks
+import conversations
+import feedback_jobs
+import llm_metrics
+import model_router
+import profiling
+import prompts
+import styles
+import suggestions
+from content import (franz_exam_info as exam_info, franz_exam_parts, franz_study_plan,
+                     franz_vocab_data as vocab_data, franz_writing_tips, writing_templates)
+
 
 # App configuration
 st.set_page_config(
@@ -14,169 +29,23 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
-<style>
-    .teil-card {
-        border-radius: 10px;
-        padding: 1.5rem;
-        margin-bottom: 1rem;
-        background-color: white;
-        box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-        transition: transform 0.2s;
-    }
-    .teil-card:hover {
-        transform: translateY(-2px);
-    }
-    .vocab-card {
-        border-left: 4px solid #1a73e8;
-        padding: 1rem;
-        margin-bottom: 1rem;
-        background-color: #f8f9fa;
-    }
-    .time-slot {
-        background-color: #f0f7ff;
-        padding: 1rem;
-        border-radius: 8px;
-        margin-bottom: 1rem;
-    }
-    .progress-container {
-        margin: 1rem 0;
-    }
-    .stProgress > div > div > div > div {
-        background-color: #1a73e8;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Data for the app
-vocab_data = {
-    "Important Prepositions": {
-        "wegen": "because of (+Genitiv)",
-        "trotz": "despite (+Genitiv)",
-        "während": "during (+Genitiv)",
-        "gegenüber": "opposite (+Dativ)",
-        "bis": "until (+Akkusativ)",
-        "durch": "through (+Akkusativ)",
-        "für": "for (+Akkusativ)",
-        "ohne": "without (+Akkusativ)"
-    },
-    "Key Verbs": {
-        "sich bewerben um": "to apply for",
-        "erledigen": "to complete",
-        "verschieben": "to postpone",
-        "verstehen": "to understand",
-        "mitteilen": "to inform",
-        "sich erkundigen nach": "to inquire about",
-        "zustimmen": "to agree",
-        "ablehnen": "to refuse"
-    },
-    "Formal Phrases": {
-        "Sehr geehrte Damen und Herren,": "Dear Sir or Madam,",
-        "mit freundlichen Grüßen": "Kind regards",
-        "Ich möchte mich erkundigen...": "I would like to inquire...",
-        "Ich wäre Ihnen dankbar, wenn...": "I would be grateful if...",
-        "Ich beziehe mich auf...": "I'm referring to..."
-    }
-}
-
-writing_templates = {
-    "Formal Letter": {
-        "structure": [
-            "Ort, Datum (right aligned)",
-            "Betreff: (subject line)",
-            "Sehr geehrte Damen und Herren,",
-            "Einleitung: State reason for writing",
-            "Hauptteil: Provide details, ask questions",
-            "Schluss: Request response, thank reader",
-            "Mit freundlichen Grüßen,",
-            "Ihr Name"
-        ],
-        "example": """
-München, 15. März 2024
-
-Betreff: Bewerbung für Praktikumsstelle
-
-Sehr geehrte Damen und Herren,
-
-mit großem Interesse habe ich Ihre Anzeige für ein Praktikum gelesen. 
-Ich möchte mich für diese Stelle bewerben.
-
-Ich studiere derzeit Wirtschaft an der Universität München und 
-suche ein Praktikum im Bereich Marketing. In meinem Studium habe ich 
-schon mehrere Kurse in diesem Bereich belegt.
-
-Über eine positive Rückmeldung würde ich mich sehr freuen. 
-Für weitere Informationen stehe ich gerne zur Verfügung.
-
-Mit freundlichen Grüßen,
-Anna Müller
-"""
-    },
-    "Informal Email": {
-        "structure": [
-            "Betreff: (subject line)",
-            "Liebe/Lieber [Name],",
-            "Einleitung: Greeting, reason for writing",
-            "Hauptteil: Share news, ask questions",
-            "Schluss: Closing remarks",
-            "Viele Grüße,",
-            "Dein Name"
-        ],
-        "example": """
-Betreff: Treffen am Wochenende
-
-Liebe Sarah,
-
-wie geht's dir? Ich hoffe, alles ist gut bei dir.
+st.markdown(f"<style>{styles.BLITZ}</style>", unsafe_allow_html=True)
 
-Ich schreibe dir, weil ich wissen wollte, ob du am Samstag Zeit hast. 
-Ich möchte mit dir ins Kino gehen. Der neue Marvel-Film läuft jetzt.
-
-Was hältst du davon? Lass mich bitte wissen, ob du kommen kannst.
-
-Viele Grüße,
-Deine Lisa
-"""
-    }
-}
-
-# In the exam_info dictionary, change this:
-
-exam_info = {
-    "Passing Requirements": {
-        "description": "To pass the Zertifikat B1 exam, you must:",
-        "requirements": [
-            "Score at least 60% overall (180 points)",
-            "Score at least 60% in each module (Reading, Writing, Listening, Speaking)"
-        ]
-    },
-    "Exam Structure": {
-        "Reading": "65 minutes - 5 parts",
-        "Writing": "60 minutes - 2 tasks",
-        "Listening": "40 minutes - 4 parts",
-        "Speaking": "15 minutes - 3 parts (with partner)"
-    }
-}
 
 
 
 # App functions
-def display_vocab_card(title, items):
+def display_vocab_card(title):
     with st.expander(title):
-        col1, col2 = st.columns(2)
-        for i, (word, meaning) in enumerate(items.items()):
-            if i % 2 == 0:
-                col1.markdown(f"**{word}** - {meaning}")
-            else:
-                col2.markdown(f"**{word}** - {meaning}")
+        for i, col in enumerate(st.columns(2)):
+            blocks.emit("vocab_column", "franzfreinds", title, i, container=col)
 
 def display_writing_template(template_type):
     template = writing_templates[template_type]
     st.subheader(template_type)
     
     st.markdown("**Structure:**")
-    for item in template["structure"]:
-        st.markdown(f"- {item}")
+    blocks.emit("template_structure", template_type)
     
     st.markdown("**Example:**")
     st.code(template["example"], language=None)
@@ -204,27 +73,37 @@ def generate_practice_question(teil):
 
 
 ### --- OLLAMA + DEEPSEEK R1 INTEGRATION --- ###
-def get_ai_response(user_question: str) -> Optional[str]:
-    """Get a concise answer using Ollama's DeepSeek R1 model."""
+def get_ai_response(user_question: str, task: Optional[str] = None,
+                    template: str = "expert_qa", follow_up: bool = False) -> Optional[str]:
+    """Get a concise answer from the model routed for this kind of request.
+
+    With `follow_up`, the question continues this session's conversation.
+    """
+    if api_client.API_URL:
+        session = st.session_state.setdefault("api_session", uuid.uuid4().hex) if follow_up else None
+        try:
+            return api_client.ask(user_question, template=template, task=task, session=session) or None
+        except Exception as e:
+            st.error(f"Error fetching AI response: {e}")
+            return None
+
+    prompt_template = prompts.get(template)
+    session = nullcontext()
+    if follow_up:
+        session = conversations.session(st.session_state.setdefault("conversation_id", uuid.uuid4().hex))
     try:
-        response = ollama.generate(
-            model="deepseek-r1:8b",
-            prompt=f"""
-            You are a German B1 exam (Goethe-Zertifikat B1) expert. 
-            Provide a **short, clear, and precise** answer to help the student prepare.
-            
-            Question: {user_question}
-            
-            Answer in **English or German** (based on the question language).
-            Focus on:
-            - Exam strategies
-            - Key vocabulary
-            - Grammar rules
-            - Time management
-            - Common mistakes
-            """,
-            options={"temperature": 0.3}  # Lower temp for factual answers
-        )
+        with session as conversation:
+            response = model_router.generate(
+                task or model_router.classify(user_question),
+                prompt_template.render(user_question),
+                template=prompt_template.name,
+                template_version=prompt_template.version,
+                system=prompt_template.system,
+                conversation=conversation,
+            )
+        if not response["response"]:
+            st.warning("The model used up its answer budget while reasoning. Please ask a more specific question.")
+            return None
         return response["response"]
     except Exception as e:
         st.error(f"Error fetching AI response: {e}")
@@ -255,6 +134,10 @@ def get_deepseek_response(question):
 
 # Main app
 def main():
+    llm_metrics.start_metrics_server()
+    feedback_jobs.start_workers()
+    profiling.render_debug_panel()
+
     st.title("🇩🇪 B1 Prüfung Blitzvorbereitung")
     st.subheader("2-Tage-Intensivkurs für die Goethe B1 Prüfung")
     
@@ -269,40 +152,18 @@ def main():
     # Navigation
     tab1, tab2, tab3, tab4, tab5 = st.tabs(["Übersicht", "Wortschatz", "Schreiben", "Prüfungsinfo", "Übungen"])
     
-    with tab1:  # Overview tab
+    with tab1, profiling.section("overview"):  # Overview tab
         st.header("2-Tage-Lernplan")
         
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("### **Tag 1: Grundlagen**")
-            st.markdown("""
-            - ⏰ 2 Stunden - Wichtiger Wortschatz & Präpositionen
-            - ⏰ 1.5 Stunden - Leseverstehen Strategien
-            - ⏰ 2 Stunden - Schreiben Vorlagen (Emails, Briefe)
-            - ⏰ 1 Stunde - Hörverstehen Praxis
-            """)
-            
-        with col2:
-            st.markdown("### **Tag 2: Prüfungssimulation**")
-            st.markdown("""
-            - ⏰ 3 Stunden - Komplette Übungsprüfung
-            - ⏰ 1 Stunde - Sprechen Rollenspiele
-            - ⏰ 1 Stunde - Schwachstellen wiederholen
-            - ⏰ 1 Stunde - Letzte Tipps und Strategien
-            """)
+        for column, (day, items) in zip(st.columns(2), franz_study_plan.items()):
+            with column:
+                st.markdown(f"### **{day}**")
+                st.markdown("\n".join(f"- {item}" for item in items))
         
         st.header("Prüfungsteile")
         cols = st.columns(4)
         
-        teile = [
-            ("Lesen", "65 min", "Textverständnis, Zuordnung"),
-            ("Schreiben", "60 min", "Formeller Brief, Email"),
-            ("Hören", "40 min", "Dialoge, Ansagen"),
-            ("Sprechen", "15 min", "Vorstellung, Diskussion")
-        ]
-        
-        for i, (teil, time, desc) in enumerate(teile):
+        for i, (teil, time, desc) in enumerate(franz_exam_parts):
             with cols[i]:
                 st.markdown(f"""
                 <div class="teil-card">
@@ -313,17 +174,17 @@ def main():
                 if st.button(f"Zu {teil} übungen", key=f"teil_{i}"):
                     st.session_state.current_tab = "Übungen"
     
-    with tab2:  # Vocabulary tab
+    with tab2, profiling.section("vocab"):  # Vocabulary tab
         st.header("Wichtiger Wortschatz für B1")
         
-        for title, items in vocab_data.items():
-            display_vocab_card(title, items)
+        for title in vocab_data:
+            display_vocab_card(title)
         
         st.markdown("### Präpositionen mit Fallen")
-        st.image("https://www.deutschtraining.org/wp-content/uploads/2020/04/präpositionen-tabelle.png", 
+        st.image(assets.resolve("praepositionen_tabelle"), 
                 caption="Präpositionen mit Dativ, Akkusativ und Genitiv")
     
-    with tab3:  # Writing tab
+    with tab3, profiling.section("writing"):  # Writing tab
         st.header("Schreiben Vorlagen")
         
         template_type = st.radio("Vorlage auswählen:", 
@@ -333,36 +194,21 @@ def main():
         display_writing_template(template_type)
         
         st.markdown("### Tipps für das Schreiben")
-        st.markdown("""
-        1. Struktur immer einhalten (Anrede, Einleitung, Hauptteil, Schluss)
-        2. Mindestens 80 Wörter schreiben
-        3. Auf Formal/Informal achten
-        4. 5 Minuten für Planung verwenden
-        5. 10 Minuten für Korrektur am Ende
-        """)
+        st.markdown("\n".join(f"{i}. {tip}" for i, tip in enumerate(franz_writing_tips, 1)))
     
     # And modify the display code in tab4 to:
-    with tab4:  # Exam info tab
+    with tab4, profiling.section("exam_info"):  # Exam info tab
         st.header("Prüfungsinformationen")
         
-        for title, content in exam_info.items():
+        for title in exam_info:
             with st.expander(title):
-                if isinstance(content, dict):
-                    if "description" in content:  # Check if description exists
-                        st.markdown(content["description"])
-                    if "requirements" in content:  # Handle requirements if they exist
-                        for req in content["requirements"]:
-                            st.markdown(f"- {req}")
-                else:
-                    # Handle the Exam Structure case
-                    for part, info in content.items():
-                        st.markdown(f"**{part}**: {info}")
+                blocks.emit("exam_info", "franzfreinds", title)
     
     
 # Modify the practice tab to include DeepSeek
 
 ### --- MODIFIED PRACTICE TAB WITH AI ANSWERS --- ###
-    with tab5:  # Practice tab
+    with tab5, profiling.section("exercise"):  # Practice tab
         st.header("Übungen")
         
         teil = st.radio("Wähle einen Prüfungsteil:", 
@@ -375,10 +221,12 @@ def main():
         if teil == "Writing":
             user_text = st.text_area("Deine Antwort:", height=200)
             if st.button("Feedback erhalten"):
-                feedback = get_ai_response(f"Give brief feedback on this B1 German writing task:\n\n{user_text}")
-                if feedback:
-                    st.success("✏️ **Schreiben Feedback:**")
-                    st.markdown(feedback)
+                with profiling.section("ai"):
+                    feedback = feedback_jobs.request(user_text, template="writing_feedback")
+                    if feedback:
+                        st.success("✏️ **Schreiben Feedback:**")
+                        st.markdown(feedback)
+            feedback_jobs.render_jobs()
 
         # --- NEW: AI QUESTION ANSWERING SECTION --- #
         st.markdown("### 🤖 **Frag den B1-Prüfungsexperten (AI)**")
@@ -389,22 +237,17 @@ def main():
         )
 
         if user_question:
-            with st.spinner("🧠 DeepSeek R1 sucht die beste Antwort..."):
-                ai_answer = get_ai_response(user_question)
+            with st.spinner("🧠 Die AI sucht die beste Antwort..."), profiling.section("ai"):
+                ai_answer = get_ai_response(user_question, follow_up=True)
                 if ai_answer:
                     st.success("🎯 **Antwort:**")
                     st.markdown(ai_answer)
                     
                     # Suggest follow-up exercises
                     st.markdown("---")
-                    st.markdown("**🔍 Weiterführende Übungen:**")
-                    if "hören" in user_question.lower() or "listening" in user_question.lower():
-                        st.markdown("- [Hörverstehen Übung 1](#)")
-                        st.markdown("- [Dialoge verstehen](#)")
-                    elif "schreiben" in user_question.lower() or "writing" in user_question.lower():
-                        st.markdown("- [Formeller Brief üben](#)")
-                        st.markdown("- [E-Mail an Freund schreiben](#)")
+                    suggestions.render(user_question)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with profiling.rerun("franzfreinds"):
+        main()
\ No newline at end of file
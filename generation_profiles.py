@@ -0,0 +1,131 @@
+"""Named generation budgets (output cap, context size, reasoning handling).
+
+Each request type gets a profile that caps `num_predict`, sizes `num_ctx`
+to the prompt plus that cap instead of the model default, and decides what happens to the
+`<think>...</think>` block reasoning models emit before their answer.
+"""
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+# Rough characters-per-token ratio for German/English text
+CHARS_PER_TOKEN = 4
+# Ollama reloads a model whenever num_ctx changes, so only a few sizes are used
+CONTEXT_SIZES = (2048, 4096, 8192)
+
+_THINK_RE = re.compile(r"<think>.*?(</think>|$)", re.DOTALL)
+
+
+@dataclass(frozen=True)
+class Profile:
+    name: str
+    num_predict: int  # cap on generated tokens, reasoning included
+    temperature: float = 0.3
+    strip_reasoning: bool = True  # drop <think> blocks before showing/caching
+    max_reasoning_chars: Optional[int] = None  # keep a truncated trace instead
+
+
+PROFILES = {
+    "qa": Profile("qa", num_predict=384),
+    "feedback": Profile("feedback", num_predict=1536),
+    "exercise": Profile("exercise", num_predict=1024, temperature=0.7),
+    # Offline batch (enrich_vocab.py): a small JSON object per vocab entry
+    "enrichment": Profile("enrichment", num_predict=768, temperature=0.4),
+    # Borderline Lesen answers (reading_grader.py): a verdict and one sentence
+    "grading": Profile("grading", num_predict=256, temperature=0.0),
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used before Ollama has counted the prompt."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def options(profile: Profile, prompt: str, context_tokens: int = 0) -> dict:
+    """Ollama options for `prompt` under `profile`.
+
+    `context_tokens` counts what is sent besides the prompt (a reused Ollama
+    `context` or the system prompt); Ollama cuts anything beyond `num_ctx`
+    from the front, which would drop the instructions.
+    """
+    needed = context_tokens + estimate_tokens(prompt) + profile.num_predict
+    num_ctx = next((size for size in CONTEXT_SIZES if size >= needed), CONTEXT_SIZES[-1])
+    return {
+        "temperature": profile.temperature,
+        "num_predict": profile.num_predict,
+        "num_ctx": num_ctx,
+    }
+
+
+def clean(profile: Profile, text: str) -> str:
+    """Remove (or truncate) the reasoning trace from a model answer."""
+    if not profile.strip_reasoning or "<think>" not in text:
+        return text.strip()
+    if profile.max_reasoning_chars:
+        def _truncate(match):
+            trace = match.group(0)[len("<think>"):].replace("</think>", "").strip()
+            if len(trace) > profile.max_reasoning_chars:
+                trace = trace[:profile.max_reasoning_chars] + "…"
+            return f"<think>{trace}</think>\n"
+        return _THINK_RE.sub(_truncate, text).strip()
+    return _THINK_RE.sub("", text).strip()
+
+
+def tokens_saved(completion_tokens: int, shown: str) -> int:
+    """Generated tokens that were stripped as reasoning instead of shown or cached."""
+    return max(0, completion_tokens - estimate_tokens(shown))
+
+
+class ReasoningFilter:
+    """Drop `<think>...</think>` from a stream of text chunks.
+
+    Text that might be the start of a tag is held back until the next chunk
+    shows whether it is one.
+    """
+    OPEN, CLOSE = "<think>", "</think>"
+
+    def __init__(self):
+        self.buffer = ""
+        self.inside = False
+        self.started = False
+
+    @staticmethod
+    def _partial_tag(text: str, tag: str) -> int:
+        for size in range(min(len(tag) - 1, len(text)), 0, -1):
+            if text.endswith(tag[:size]):
+                return size
+        return 0
+
+    def _emit(self, text: str) -> str:
+        if not self.started:
+            text = text.lstrip()
+            self.started = bool(text)
+        return text
+
+    def feed(self, chunk: str) -> str:
+        self.buffer += chunk
+        out = []
+        while True:
+            if self.inside:
+                end = self.buffer.find(self.CLOSE)
+                if end < 0:
+                    keep = self._partial_tag(self.buffer, self.CLOSE)
+                    self.buffer = self.buffer[len(self.buffer) - keep:]
+                    break
+                self.buffer = self.buffer[end + len(self.CLOSE):]
+                self.inside = False
+            else:
+                begin = self.buffer.find(self.OPEN)
+                if begin < 0:
+                    keep = self._partial_tag(self.buffer, self.OPEN)
+                    out.append(self._emit(self.buffer[:len(self.buffer) - keep]))
+                    self.buffer = self.buffer[len(self.buffer) - keep:]
+                    break
+                out.append(self._emit(self.buffer[:begin]))
+                self.buffer = self.buffer[begin + len(self.OPEN):]
+                self.inside = True
+        return "".join(out)
+
+    def flush(self) -> str:
+        text, self.buffer = ("" if self.inside else self.buffer), ""
+        return self._emit(text)
@@ -0,0 +1,168 @@
+"""Instrumented access to the local Ollama models shared by the apps."""
+import json
+import threading
+import time
+from typing import Optional
+
+import ollama
+
+import generation_profiles
+import llm_metrics
+from conversations import Conversation
+
+
+class Cancelled(Exception):
+    """A streamed generation was stopped through its `cancel` event."""
+
+
+def _prepare(model, prompt, labels, profile, conversation, options, kwargs):
+    """Apply the conversation and profile options; return the prompt to send."""
+    if conversation is not None:
+        context = conversation.context_for(model)
+        if context:
+            kwargs["context"] = context
+            kwargs.pop("system", None)  # already part of the context
+        elif conversation.turns:
+            # No context for this model (new route, or dropped): replay the text
+            prompt = conversation.history() + "\n" + prompt
+    if profile is not None:
+        context_tokens = len(kwargs.get("context") or ())
+        if kwargs.get("system"):
+            context_tokens += generation_profiles.estimate_tokens(kwargs["system"])
+        options = {**generation_profiles.options(profile, prompt, context_tokens), **(options or {})}
+        labels["profile"] = profile.name
+    return prompt, options
+
+
+def _finish(model, prompt, response, raw, wall_seconds, labels, profile, conversation):
+    """Clean the answer text, update the conversation and record the call."""
+    shown = raw.strip()
+    if profile is not None:
+        shown = generation_profiles.clean(profile, raw)
+        saved = 0
+        if shown != raw.strip():
+            saved = generation_profiles.tokens_saved(response.get("eval_count") or 0, shown)
+        labels["tokens_saved"] = saved
+        labels["truncated"] = response.get("done_reason") == "length"
+        llm_metrics.increment("llm_tokens_saved", saved, profile=profile.name)
+        if labels["truncated"]:
+            llm_metrics.increment("llm_truncated", profile=profile.name)
+    response["response"] = shown
+    if conversation is not None:
+        conversation.update(model, prompt, response)
+    llm_metrics.record_call(response, model=model, wall_seconds=wall_seconds, **labels)
+    return response
+
+
+def _repeated(model, prompt, labels, conversation):
+    if conversation is None or conversation.last_prompt != prompt or conversation.last_answer is None:
+        return None
+    llm_metrics.record_call(None, model=model, wall_seconds=0.0, cache_tier="session", **labels)
+    return {"response": conversation.last_answer, "model": model}
+
+
+def cached(model: str, prompt: str, answer: str, *, template: str, template_version: str,
+           cache_tier: str, route: str = "default", downgraded: bool = False,
+           conversation: Optional[Conversation] = None, **kwargs):
+    """A response answered from a cache: record it and continue the conversation."""
+    llm_metrics.record_call(None, model=model, wall_seconds=0.0, cache_tier=cache_tier,
+                            template=template, template_version=template_version,
+                            route=route, downgraded=downgraded)
+    response = {"response": answer, "model": model}
+    if conversation is not None:
+        conversation.update(model, prompt, response)
+    return response
+
+
+def generate(model: str, prompt: str, *, template: str, template_version: str,
+             route: str = "default", downgraded: bool = False,
+             profile: Optional[generation_profiles.Profile] = None,
+             conversation: Optional[Conversation] = None, options=None, **kwargs):
+    """Call `ollama.generate` and record latency, token and load metrics.
+
+    With a generation `profile`, its options are used (`options` overrides
+    single keys) and the reasoning trace is removed from `response["response"]`.
+    With a `conversation`, the previous answer's context is sent instead of
+    the `system` prompt, and a repeated prompt is answered from the session.
+    """
+    labels = {"template": template, "template_version": template_version,
+              "route": route, "downgraded": downgraded}
+    repeated = _repeated(model, prompt, labels, conversation)
+    if repeated is not None:
+        return repeated
+    sent, options = _prepare(model, prompt, labels, profile, conversation, options, kwargs)
+    start = time.perf_counter()
+    try:
+        response = ollama.generate(model=model, prompt=sent, options=options, **kwargs)
+    except Exception as e:
+        llm_metrics.record_call(None, model=model, wall_seconds=time.perf_counter() - start,
+                                error=e, **labels)
+        raise
+    return _finish(model, prompt, response, response["response"], time.perf_counter() - start,
+                   labels, profile, conversation)
+
+
+def stream(model: str, prompt: str, *, template: str, template_version: str,
+           route: str = "default", downgraded: bool = False,
+           profile: Optional[generation_profiles.Profile] = None,
+           conversation: Optional[Conversation] = None, options=None,
+           cancel: Optional[threading.Event] = None, **kwargs):
+    """Like `generate`, but yield the answer text as it is produced.
+
+    Reasoning blocks are dropped from the stream (a profile's
+    `max_reasoning_chars` only applies to non-streamed answers). Metrics are
+    recorded from Ollama's final chunk, plus the time to the first token.
+    `cancel` is checked on every chunk Ollama sends, reasoning included;
+    once it is set the generation is stopped and `Cancelled` is raised.
+    """
+    labels = {"template": template, "template_version": template_version,
+              "route": route, "downgraded": downgraded}
+    repeated = _repeated(model, prompt, labels, conversation)
+    if repeated is not None:
+        yield repeated["response"]
+        return
+    sent, options = _prepare(model, prompt, labels, profile, conversation, options, kwargs)
+    reasoning = generation_profiles.ReasoningFilter()
+    pieces, final = [], {}
+    start = time.perf_counter()
+    try:
+        for chunk in ollama.generate(model=model, prompt=sent, options=options,
+                                     stream=True, **kwargs):
+            if cancel is not None and cancel.is_set():
+                break
+            pieces.append(chunk["response"])
+            delta = reasoning.feed(chunk["response"])
+            if delta:
+                labels.setdefault("ttft_seconds", round(time.perf_counter() - start, 4))
+                yield delta
+            if chunk.get("done"):
+                final = chunk
+    except Exception as e:
+        llm_metrics.record_call(None, model=model, wall_seconds=time.perf_counter() - start,
+                                error=e, **labels)
+        raise
+    if cancel is not None and cancel.is_set() and not final:
+        llm_metrics.increment("llm_streams_cancelled", model=model, route=route)
+        raise Cancelled(f"{model} stream cancelled after {len(pieces)} chunks")
+    tail = reasoning.flush()
+    if tail:
+        yield tail
+    _finish(model, prompt, dict(final), "".join(pieces), time.perf_counter() - start,
+            labels, profile, conversation)
+
+
+def embed(model: str, texts, *, route: str = "embedding"):
+    """Embed `texts` in one `ollama.embed` call; returns one vector per text."""
+    texts = list(texts)
+    start = time.perf_counter()
+    try:
+        response = ollama.embed(model=model, input=texts)
+    except Exception as e:
+        llm_metrics.increment("llm_embed_errors", model=model, route=route)
+        llm_metrics.logger.warning(json.dumps({"event": "llm_embed_failed", "model": model,
+                                               "route": route, "error": repr(e)}))
+        raise
+    llm_metrics.increment("llm_embed_requests", model=model, route=route)
+    llm_metrics.increment("llm_embed_inputs", len(texts), model=model, route=route)
+    llm_metrics.increment("llm_embed_seconds", time.perf_counter() - start, model=model, route=route)
+    return response["embeddings"]
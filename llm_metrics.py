@@ -0,0 +1,299 @@
+"""Metrics for LLM calls: structured logs plus a Prometheus text endpoint."""
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+logger = logging.getLogger("frenzguru.llm")
+
+# Histogram buckets (seconds) for wall-clock latency
+LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120, float("inf"))
+# Number of recent calls per (model, template) used for p50/p95
+WINDOW_SIZE = 500
+# A load_duration above this is counted as a (cold) model load
+LOAD_EVENT_SECONDS = 0.5
+
+_lock = threading.Lock()
+_windows = defaultdict(lambda: deque(maxlen=WINDOW_SIZE))
+_route_windows = defaultdict(lambda: deque(maxlen=WINDOW_SIZE))
+_counters = defaultdict(float)
+_gauges = {}
+_histograms = defaultdict(lambda: [0] * len(LATENCY_BUCKETS))
+_histogram_sums = defaultdict(float)
+_server = None
+
+
+def _configure_logging():
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(os.environ.get("FRENZGURU_LOG_LEVEL", "INFO"))
+    logger.propagate = False
+
+
+_configure_logging()
+
+
+def _seconds(nanoseconds) -> float:
+    return (nanoseconds or 0) / 1e9
+
+
+def _field(response, name):
+    if response is None:
+        return None
+    try:
+        return response.get(name)
+    except AttributeError:
+        return getattr(response, name, None)
+
+
+def record_call(response, *, model: str, wall_seconds: float, template: str,
+                template_version: str, cache_tier: str = "none", route: str = "default",
+                downgraded: bool = False, error: Optional[BaseException] = None,
+                **labels) -> dict:
+    """Record one LLM call and return the structured event that was logged.
+
+    `response` is the Ollama generate response (or None for errors and cache
+    hits). Durations reported by Ollama are in nanoseconds.
+    """
+    total = _seconds(_field(response, "total_duration"))
+    load = _seconds(_field(response, "load_duration"))
+    eval_seconds = _seconds(_field(response, "eval_duration"))
+    eval_count = _field(response, "eval_count") or 0
+    prompt_count = _field(response, "prompt_eval_count") or 0
+    # Anything Ollama didn't spend on the request was spent waiting for it
+    queue = max(0.0, wall_seconds - total) if response is not None and total else 0.0
+
+    event = {
+        "event": "llm_call",
+        "ts": time.time(),
+        "model": model,
+        "template": template,
+        "template_version": template_version,
+        "cache_tier": cache_tier,
+        "route": route,
+        "downgraded": downgraded,
+        "status": "error" if error else "ok",
+        "wall_seconds": round(wall_seconds, 4),
+        "total_seconds": round(total, 4),
+        "load_seconds": round(load, 4),
+        "queue_seconds": round(queue, 4),
+        "prompt_tokens": prompt_count,
+        "completion_tokens": eval_count,
+        "tokens_per_second": round(eval_count / eval_seconds, 2) if eval_seconds else 0.0,
+        "model_load": load >= LOAD_EVENT_SECONDS,
+    }
+    event.update(labels)
+    if error:
+        event["error"] = repr(error)
+
+    key = (model, template)
+    with _lock:
+        _counters[("requests", model, template, template_version, cache_tier, event["status"])] += 1
+        if downgraded:
+            _counters[("route_downgrades", route, model)] += 1
+        if response is not None:
+            _counters[("prompt_tokens", model, template, template_version)] += prompt_count
+            _counters[("completion_tokens", model, template, template_version)] += eval_count
+            if event["model_load"]:
+                _counters[("model_loads", model)] += 1
+            buckets = _histograms[key]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if wall_seconds <= bound:
+                    buckets[i] += 1
+            _histogram_sums[key] += wall_seconds
+            _windows[key].append(event)
+            _route_windows[(route, model)].append(event)
+        elif error is not None:
+            # Failed calls (timeouts, a crashed model) count against the route's SLO
+            _route_windows[(route, model)].append(event)
+
+    logger.info(json.dumps(event, ensure_ascii=False))
+    return event
+
+
+def increment(name: str, value: float = 1, **labels):
+    """Add `value` to the counter `frenzguru_<name>_total{labels}`."""
+    with _lock:
+        _counters[("extra", name, tuple(sorted(labels.items())))] += value
+
+
+def set_gauge(name: str, value: float, **labels):
+    """Set the gauge `frenzguru_<name>{labels}`."""
+    with _lock:
+        _gauges[(name, tuple(sorted(labels.items())))] = value
+
+
+def quantile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def snapshot() -> dict:
+    """Rolling p50/p95 latency, queue time and tokens/sec per (model, template)."""
+    with _lock:
+        windows = {key: list(events) for key, events in _windows.items()}
+    stats = {}
+    for key, events in windows.items():
+        stats[key] = {"count": len(events)}
+        for field in ("wall_seconds", "queue_seconds", "tokens_per_second"):
+            values = [e[field] for e in events]
+            stats[key][field] = {"p50": quantile(values, 0.5), "p95": quantile(values, 0.95)}
+    return stats
+
+
+def recent(route: str, model: str, max_age: float) -> list:
+    """Calls on `route` served by `model` in the last `max_age` seconds (failed ones too)."""
+    cutoff = time.time() - max_age
+    with _lock:
+        events = list(_route_windows.get((route, model), ()))
+    return [e for e in events if e["ts"] >= cutoff]
+
+
+def route_snapshot() -> dict:
+    """Rolling p50/p95 latency and queue time per (route, model)."""
+    with _lock:
+        windows = {key: list(events) for key, events in _route_windows.items()}
+    stats = {}
+    for key, events in windows.items():
+        ok = [e for e in events if e["status"] == "ok"]
+        stats[key] = {"count": len(events), "errors": len(events) - len(ok)}
+        for field in ("wall_seconds", "queue_seconds"):
+            values = [e[field] for e in ok]
+            stats[key][field] = {"p50": quantile(values, 0.5), "p95": quantile(values, 0.95)}
+    return stats
+
+
+def _labels(**labels) -> str:
+    parts = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def render_prometheus() -> str:
+    """Render all metrics in the Prometheus text exposition format."""
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: list(buckets) for key, buckets in _histograms.items()}
+        sums = dict(_histogram_sums)
+        gauges = sorted(_gauges.items())
+    lines = [
+        "# HELP frenzguru_llm_requests_total LLM calls by outcome.",
+        "# TYPE frenzguru_llm_requests_total counter",
+    ]
+    for key, value in sorted(counters.items()):
+        if key[0] == "requests":
+            _, model, template, version, tier, status = key
+            lines.append("frenzguru_llm_requests_total" + _labels(
+                model=model, template=template, template_version=version,
+                cache_tier=tier, status=status) + f" {value:g}")
+    for kind in ("prompt_tokens", "completion_tokens"):
+        lines.append(f"# TYPE frenzguru_llm_{kind}_total counter")
+        for key, value in sorted(counters.items()):
+            if key[0] == kind:
+                lines.append(f"frenzguru_llm_{kind}_total" + _labels(
+                    model=key[1], template=key[2], template_version=key[3]) + f" {value:g}")
+    lines.append("# HELP frenzguru_llm_model_loads_total Calls that had to load the model.")
+    lines.append("# TYPE frenzguru_llm_model_loads_total counter")
+    for key, value in sorted(counters.items()):
+        if key[0] == "model_loads":
+            lines.append("frenzguru_llm_model_loads_total" + _labels(model=key[1]) + f" {value:g}")
+
+    lines.append("# HELP frenzguru_llm_route_downgrades_total Calls sent to a route's fallback model.")
+    lines.append("# TYPE frenzguru_llm_route_downgrades_total counter")
+    for key, value in sorted(counters.items()):
+        if key[0] == "route_downgrades":
+            lines.append("frenzguru_llm_route_downgrades_total"
+                         + _labels(route=key[1], model=key[2]) + f" {value:g}")
+
+    extra = sorted((key, value) for key, value in counters.items() if key[0] == "extra")
+    for name in sorted({key[1] for key, _ in extra}):
+        lines.append(f"# TYPE frenzguru_{name}_total counter")
+        for (_, metric, labels), value in extra:
+            if metric == name:
+                lines.append(f"frenzguru_{name}_total" + _labels(**dict(labels)) + f" {value:g}")
+
+    for name in sorted({key[0] for key, _ in gauges}):
+        lines.append(f"# TYPE frenzguru_{name} gauge")
+        for (metric, labels), value in gauges:
+            if metric == name:
+                lines.append(f"frenzguru_{name}" + _labels(**dict(labels)) + f" {value:g}")
+
+    lines.append("# TYPE frenzguru_llm_request_seconds histogram")
+    for (model, template), buckets in sorted(histograms.items()):
+        for bound, count in zip(LATENCY_BUCKETS, buckets):
+            le = "+Inf" if bound == float("inf") else f"{bound:g}"
+            lines.append("frenzguru_llm_request_seconds_bucket"
+                         + _labels(model=model, template=template, le=le) + f" {count}")
+        lines.append("frenzguru_llm_request_seconds_sum"
+                     + _labels(model=model, template=template) + f" {sums[(model, template)]:.4f}")
+        lines.append("frenzguru_llm_request_seconds_count"
+                     + _labels(model=model, template=template) + f" {buckets[-1]}")
+
+    for field, metric in (("wall_seconds", "latency_seconds"),
+                          ("queue_seconds", "queue_seconds"),
+                          ("tokens_per_second", "tokens_per_second")):
+        lines.append(f"# TYPE frenzguru_llm_{metric} gauge")
+        for (model, template), stats in sorted(snapshot().items()):
+            for q in ("p50", "p95"):
+                lines.append(f"frenzguru_llm_{metric}" + _labels(
+                    model=model, template=template, quantile=q) + f" {stats[field][q]:g}")
+    for field, metric in (("wall_seconds", "route_latency_seconds"),
+                          ("queue_seconds", "route_queue_seconds")):
+        lines.append(f"# TYPE frenzguru_llm_{metric} gauge")
+        for (route, model), stats in sorted(route_snapshot().items()):
+            for q in ("p50", "p95"):
+                lines.append(f"frenzguru_llm_{metric}" + _labels(
+                    route=route, model=model, quantile=q) + f" {stats[field][q]:g}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: Optional[int] = None) -> Optional[int]:
+    """Serve /metrics on `port` (or $FRENZGURU_METRICS_PORT) once per process.
+
+    Streamlit re-executes the app script on every rerun but keeps imported
+    modules, so the server started on the first rerun is reused afterwards.
+    Returns the bound port, or None when metrics are disabled.
+    """
+    global _server
+    with _lock:
+        if _server is not None:
+            return _server.server_address[1]
+        if port is None:
+            port = os.environ.get("FRENZGURU_METRICS_PORT")
+            if not port:
+                return None
+        try:
+            _server = ThreadingHTTPServer(("127.0.0.1", int(port)), _MetricsHandler)
+        except OSError as e:
+            logger.warning(json.dumps({"event": "metrics_server_failed", "error": repr(e)}))
+            return None
+    threading.Thread(target=_server.serve_forever, name="frenzguru-metrics", daemon=True).start()
+    return _server.server_address[1]
@@ -0,0 +1,94 @@
+"""Load test for api.py: requests/sec and latency at N concurrent clients.
+
+    python api.py &
+    python loadtest.py --clients 200 --requests 20000 --scenario content
+    python loadtest.py --clients 100 --requests 500 --scenario ask
+
+The `content` scenario mixes vocab lookups and exercise fetches; `ask` and
+`feedback` go through the LLM and mostly measure the Ollama backend.
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import time
+
+import aiohttp
+
+import content
+
+QUESTIONS = [
+    "Wie viele Punkte brauche ich zum Bestehen?",
+    "Was ist der Unterschied zwischen weil und denn?",
+    "Wie kann ich im Hörverstehen besser werden?",
+    "Welche Präpositionen brauchen den Genitiv?",
+]
+
+
+def _content_request():
+    if random.random() < 0.5:
+        category = random.choice(list(content.vocab_data))
+        word = random.choice(list(content.vocab_data[category]))
+        return "GET", "/v1/vocab", {"params": {"q": word}}
+    return "GET", f"/v1/exercises/{random.choice(list(content.exercises))}", {}
+
+
+def _ask_request():
+    return "POST", "/v1/ask", {"json": {"question": random.choice(QUESTIONS)}}
+
+
+def _feedback_request():
+    example = random.choice(list(content.writing_templates.values()))["example"]
+    return "POST", "/v1/feedback", {"json": {"text": example}}
+
+
+SCENARIOS = {"content": _content_request, "ask": _ask_request, "feedback": _feedback_request}
+
+
+async def _client(session, base_url, make_request, counter, total, latencies, errors):
+    while next(counter) < total:
+        method, path, kwargs = make_request()
+        start = time.perf_counter()
+        try:
+            async with session.request(method, base_url + path, **kwargs) as response:
+                await response.read()
+                if response.status >= 400:
+                    errors.append(response.status)
+                    continue
+        except aiohttp.ClientError as e:
+            errors.append(repr(e))
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+async def run(base_url, clients, total, scenario):
+    latencies, errors = [], []
+    counter = itertools.count()
+    connector = aiohttp.TCPConnector(limit=clients)
+    timeout = aiohttp.ClientTimeout(total=None)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            _client(session, base_url, SCENARIOS[scenario], counter, total, latencies, errors)
+            for _ in range(clients)
+        ))
+        elapsed = time.perf_counter() - start
+    ordered = sorted(latencies)
+    print(f"scenario={scenario} clients={clients} requests={total} errors={len(errors)}")
+    print(f"elapsed {elapsed:.2f}s  throughput {len(latencies) / elapsed:.1f} req/s")
+    print("latency ms  " + "  ".join(
+        f"p{int(q * 100)}={_percentile(ordered, q) * 1000:.1f}" for q in (0.5, 0.95, 0.99)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8600")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="content")
+    args = parser.parse_args()
+    asyncio.run(run(args.url.rstrip("/"), args.clients, args.requests, args.scenario))
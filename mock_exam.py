@@ -0,0 +1,297 @@
+"""Timed mock exam: Lesen, Hören, Schreiben and Sprechen with per-part countdowns.
+
+The countdown runs in the browser (a small script in an `st.iframe`), so
+the server is only contacted when a part is submitted, either by the student
+or by the script when the time is up. The exam state (deadlines and
+submitted answers) is checkpointed to ``$FRENZGURU_EXAM_DIR`` under an id
+kept in the URL, and the script saves drafts of the current part to the
+browser's localStorage, so a reconnect or reload resumes where it stopped.
+"""
+import json
+import os
+import re
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import streamlit as st
+
+import analytics
+import assets
+import content
+import duplicates
+import llm_metrics
+import reading_grader
+from content import exercises
+
+EXAM_DIR = Path(os.environ.get("FRENZGURU_EXAM_DIR", ".exam_sessions"))
+EXAM_ID_RE = re.compile(r"[0-9a-f]{12}")  # uuid4().hex[:12], see `start`
+PARTS = ["Lesen", "Hören", "Schreiben", "Sprechen"]
+TIME_FACTORS = {"Original (100%)": 1.0, "Kurz (50%)": 0.5, "Schnelltest (25%)": 0.25}
+# Seconds after a deadline before a hand-in counts as late (page reload, slow network)
+GRACE_SECONDS = 30
+
+_TIMER_HTML = """
+<div id="countdown" style="font: 600 1.8rem sans-serif; color: #1a73e8; text-align: center;">--:--</div>
+<script>
+const end = Date.now() + __REMAINING_MS__;
+const submitLabel = __SUBMIT_LABEL__;
+const draftKey = __DRAFT_KEY__;
+const doc = window.parent.document;
+const store = window.parent.localStorage;
+const el = document.getElementById("countdown");
+
+function fields() {
+  return Array.from(doc.querySelectorAll("textarea, input[type='text']"))
+    .filter(f => f.getAttribute("aria-label"));
+}
+function saveDraft() {
+  // Only non-empty fields: a page that has not been restored yet must not wipe the draft
+  const draft = JSON.parse(store.getItem(draftKey) || "{}");
+  fields().forEach(f => { if (f.value) draft[f.getAttribute("aria-label")] = f.value; });
+  store.setItem(draftKey, JSON.stringify(draft));
+}
+function restoreDraft() {
+  const draft = JSON.parse(store.getItem(draftKey) || "{}");
+  fields().forEach(f => {
+    const value = draft[f.getAttribute("aria-label")];
+    if (value && !f.value) {
+      // Go through the native setter so React notices the change
+      const proto = Object.getPrototypeOf(f);
+      Object.getOwnPropertyDescriptor(proto, "value").set.call(f, value);
+      f.dispatchEvent(new Event("input", { bubbles: true }));
+    }
+  });
+}
+function submit() {
+  saveDraft();
+  const button = Array.from(doc.querySelectorAll("button"))
+    .find(b => b.innerText.trim() === submitLabel);
+  if (button) button.click();
+}
+function tick() {
+  const left = Math.max(0, end - Date.now());
+  const minutes = Math.floor(left / 60000);
+  const seconds = Math.floor(left / 1000) % 60;
+  el.textContent = `${minutes}:${String(seconds).padStart(2, "0")}`;
+  if (left <= 5 * 60000) el.style.color = "#d93025";
+  if (left === 0) {
+    clearInterval(timer);
+    clearInterval(autosave);
+    setTimeout(submit, 300);
+  }
+}
+let autosave, timer;
+// Restore first: after a reconnect past the deadline, tick() hands in at once
+setTimeout(() => {
+  restoreDraft();
+  autosave = setInterval(saveDraft, 5000);
+  timer = setInterval(tick, 250);
+  tick();
+}, 400);
+</script>
+"""
+
+
+# --- Checkpoints --- #
+def _path(exam_id: str) -> Path:
+    return EXAM_DIR / f"{exam_id}.json"
+
+
+def load(exam_id: str):
+    """The saved exam, or None; ids from the URL other than our own format are rejected."""
+    if not EXAM_ID_RE.fullmatch(exam_id):
+        return None
+    try:
+        return json.loads(_path(exam_id).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def save(state: dict):
+    EXAM_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=EXAM_DIR, delete=False, encoding="utf-8") as tmp:
+        json.dump(state, tmp, ensure_ascii=False, indent=2)
+    os.replace(tmp.name, _path(state["id"]))
+
+
+def durations(exam_data: dict, factor: float = 1.0) -> dict:
+    """Minutes per part, taken from the `Dauer` of each part in `exam_data`."""
+    minutes = {}
+    for title, part_data in exam_data.items():
+        for part in PARTS:
+            if part in title:
+                minutes[part] = int(part_data["Dauer"].split()[0]) * factor
+    return minutes
+
+
+def start(exam_data: dict, factor: float, class_id: str = "") -> dict:
+    state = {
+        "id": uuid.uuid4().hex[:12],
+        "class": class_id,
+        "created": time.time(),
+        "minutes": durations(exam_data, factor),
+        "current": 0,
+        "parts": {},
+    }
+    _open_part(state)
+    return state
+
+
+def _open_part(state: dict):
+    part = PARTS[state["current"]]
+    now = time.time()
+    state["parts"][part] = {
+        "started": now,
+        "deadline": now + state["minutes"][part] * 60,
+        "answers": {},
+    }
+    save(state)
+
+
+def _grade(part: str, answers: dict):
+    """(score, criteria) for analytics; only Lesen has an automatic grader."""
+    if part != "Lesen":
+        return None, None
+    by_exercise = {}
+    for i, text in enumerate(answers.values()):
+        if i in content.reading_references:
+            by_exercise.setdefault(i, []).append(text)
+    try:
+        grades = [grade for i, texts in by_exercise.items()
+                  for grade in reading_grader.grade_batch(i, texts, judge=False)]
+    except Exception as e:  # grading must never block handing in the part
+        llm_metrics.logger.warning(json.dumps({"event": "exam_grading_failed", "error": repr(e)}))
+        return None, None
+    if not grades:
+        return None, None
+    decided = [g for g in grades if g.verdict != "unsicher"]
+    criteria = {"Richtig": sum(g.verdict == "richtig" for g in decided) / len(decided)} if decided else None
+    return sum(g.score for g in grades) / len(grades), criteria
+
+
+def submit(state: dict, answers: dict):
+    """Store the answers of the current part and open the next one."""
+    part = PARTS[state["current"]]
+    record = state["parts"][part]
+    now = time.time()
+    late_seconds = round(max(0.0, now - record["deadline"]), 1)
+    record.update(answers=answers, submitted=now, late_seconds=late_seconds,
+                  late=late_seconds > GRACE_SECONDS)
+    score, criteria = _grade(part, answers)
+    analytics.record(state.get("class", ""), state["id"], part, seconds=now - record["started"],
+                     score=score, criteria=criteria)
+    if part == "Schreiben":
+        for label, text in answers.items():
+            duplicates.add(f"{state['id']}:{label}", text, class_id=state.get("class", ""),
+                           student=state["id"], task=label)
+    state["current"] += 1
+    if state["current"] < len(PARTS):
+        _open_part(state)
+    else:
+        state["finished"] = now
+        save(state)
+
+
+# --- Rendering --- #
+def _fields(part: str):
+    """Yield (label, widget, kwargs) for every answer field of `part`."""
+    for i, exercise in enumerate(exercises[part], 1):
+        if part == "Lesen":
+            st.markdown(f"**Aufgabe {i}: {exercise['question']}**")
+            st.markdown(f"*{exercise['text']}*")
+            yield f"Lesen {i} – Antwort", st.text_area, {"height": 120}
+        elif part == "Hören":
+            st.markdown(f"**Aufgabe {i}: {exercise['task']}**")
+            if i == 1:
+                st.audio(assets.resolve("goethe_b1_hoeren"), format="audio/mpeg")
+            st.markdown(exercise.get("questions") or exercise.get("options"))
+            yield f"Hören {i} – Antwort", st.text_input, {}
+        elif part == "Schreiben":
+            st.markdown(f"**Aufgabe {i}: {exercise['task']}**")
+            st.markdown(f"*Hinweise:* {exercise['hints']}")
+            yield f"Schreiben {i} – Text", st.text_area, {"height": 220}
+        else:
+            st.markdown(f"**Aufgabe {i}: {exercise['task']}**")
+            st.markdown(exercise.get("prompts") or exercise.get("topics"))
+            yield f"Sprechen {i} – Stichpunkte", st.text_area, {"height": 120}
+
+
+def _render_part(state: dict):
+    part = PARTS[state["current"]]
+    record = state["parts"][part]
+    submit_label = f"{part} abgeben"
+
+    st.markdown(f"### Teil {state['current'] + 1} von {len(PARTS)}: {part}")
+    st.progress(state["current"] / len(PARTS))
+    remaining_ms = max(0, int((record["deadline"] - time.time()) * 1000))
+    st.iframe(
+        _TIMER_HTML
+        .replace("__REMAINING_MS__", str(remaining_ms))
+        .replace("__SUBMIT_LABEL__", json.dumps(submit_label))
+        .replace("__DRAFT_KEY__", json.dumps(f"frenzguru-exam-{state['id']}-{part}")),
+        height=60,
+    )
+
+    with st.form(f"exam_{state['id']}_{part}"):
+        answers = {}
+        for label, widget, kwargs in _fields(part):
+            answers[label] = widget(label, key=f"exam_{state['id']}_{label}", **kwargs)
+        if st.form_submit_button(submit_label):
+            submit(state, answers)
+            st.rerun()
+
+
+def _render_summary(state: dict):
+    st.success("✅ Prüfungssimulation abgeschlossen!")
+    rows = []
+    for part in PARTS:
+        record = state["parts"][part]
+        used = (record["submitted"] - record["started"]) / 60
+        rows.append({
+            "Teil": part,
+            "Zeit (min)": f"{used:.1f} / {state['minutes'][part]:g}",
+            "Beantwortet": sum(1 for answer in record["answers"].values() if answer.strip()),
+            "Verspätet (s)": f"{record['late_seconds']:g}" + (" ⚠️" if record.get("late") else ""),
+        })
+    st.table(rows)
+    late = [part for part in PARTS if state["parts"][part].get("late")]
+    if late:
+        st.warning(f"Nach Ablauf der Zeit abgegeben (mehr als {GRACE_SECONDS} s zu spät): "
+                   + ", ".join(late) + ". In der echten Prüfung zählen diese Antworten nicht.")
+    for part in PARTS:
+        with st.expander(f"Antworten: {part}"):
+            for label, answer in state["parts"][part]["answers"].items():
+                st.markdown(f"**{label}**")
+                st.text(answer or "—")
+
+
+def render(exam_data: dict):
+    """Render the mock exam page of `apps.py`."""
+    st.header("⏱️ Prüfungssimulation")
+    exam_id = st.query_params.get("exam")
+    state = load(exam_id) if exam_id else None
+
+    if state is None:
+        st.markdown(
+            "Alle vier Teile nacheinander mit echter Zeitbegrenzung. Der Countdown läuft "
+            "im Browser; wenn die Zeit abläuft, wird der Teil automatisch abgegeben. "
+            "Speichere den Link, um nach einem Verbindungsabbruch weiterzumachen."
+        )
+        factor = st.selectbox("Zeit:", list(TIME_FACTORS))
+        class_id = st.text_input("Klasse (optional):", value=st.query_params.get("klasse", ""),
+                                 help="Für die Auswertung der Lehrkraft")
+        if st.button("Simulation starten"):
+            state = start(exam_data, TIME_FACTORS[factor], class_id.strip())
+            st.query_params["exam"] = state["id"]
+            st.rerun()
+        return
+
+    if "finished" in state:
+        _render_summary(state)
+        if st.button("Neue Simulation"):
+            del st.query_params["exam"]
+            st.rerun()
+        return
+    _render_part(state)
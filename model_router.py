@@ -0,0 +1,171 @@
+"""Route LLM requests to a model by task class, with latency-SLO downgrades.
+
+Every request is classified as short Q&A, writing feedback or exercise
+generation and sent to the model configured for that class. When the
+primary model of a route is missing its latency or queue-time SLO (judged on
+the recent calls recorded by `llm_metrics`), or already has too many
+requests in flight, the route falls back to its smaller model until the
+primary recovers. Answers prefetched into `response_cache` are returned
+without a model call.
+"""
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import generation_profiles
+import llm
+import llm_metrics
+import response_cache
+
+QA = "qa"
+FEEDBACK = "feedback"
+EXERCISE = "exercise"
+
+# Recent calls considered when checking a route's SLO
+SLO_WINDOW_SECONDS = 300
+SLO_MIN_SAMPLES = 3
+
+
+@dataclass(frozen=True)
+class Route:
+    model: str
+    fallback: str
+    slo_seconds: float  # p95 wall-clock latency target
+    max_queue_seconds: float  # p95 queue time before downgrading
+    max_in_flight: int  # concurrent requests before downgrading
+
+
+def _route(task, model, fallback, slo_seconds, max_queue_seconds, max_in_flight):
+    prefix = f"FRENZGURU_MODEL_{task.upper()}"
+    return Route(
+        model=os.environ.get(prefix, model),
+        fallback=os.environ.get(f"{prefix}_FALLBACK", fallback),
+        slo_seconds=float(os.environ.get(f"{prefix}_SLO", slo_seconds)),
+        max_queue_seconds=max_queue_seconds,
+        max_in_flight=max_in_flight,
+    )
+
+
+ROUTES = {
+    # One-line questions don't need a reasoning model
+    QA: _route(QA, "llama3.2:3b", "llama3.2:1b", 8, 2, 4),
+    FEEDBACK: _route(FEEDBACK, "deepseek-r1:8b", "llama3.2:3b", 45, 10, 2),
+    EXERCISE: _route(EXERCISE, "deepseek-r1:8b", "llama3.2:3b", 30, 5, 2),
+}
+
+_FEEDBACK_MARKERS = ("feedback", "korrigier", "correct my", "check my", "verbesser")
+_EXERCISE_MARKERS = ("erstelle", "neue übung", "neue aufgabe", "gib mir eine übung",
+                     "generate", "create an exercise", "new exercise")
+
+_lock = threading.Lock()
+_in_flight = defaultdict(int)
+_last_dispatch = 0.0
+# Set while an interactive request runs, so background generations can stop
+busy = threading.Event()
+
+
+def classify(text: str) -> str:
+    """Guess the task class of a free-form request."""
+    lowered = text.lower()
+    words = len(lowered.split())
+    if words > 60 or any(marker in lowered for marker in _FEEDBACK_MARKERS):
+        return FEEDBACK
+    if any(marker in lowered for marker in _EXERCISE_MARKERS):
+        return EXERCISE
+    return QA
+
+
+def _missing_slo(task: str, route: Route) -> bool:
+    events = llm_metrics.recent(task, route.model, SLO_WINDOW_SECONDS)
+    if len(events) < SLO_MIN_SAMPLES:
+        return False
+    # A failed call counts as an infinitely slow one
+    stats = {
+        field: llm_metrics.quantile([e[field] if e["status"] == "ok" else float("inf") for e in events], 0.95)
+        for field in ("wall_seconds", "queue_seconds")
+    }
+    return stats["wall_seconds"] > route.slo_seconds or stats["queue_seconds"] > route.max_queue_seconds
+
+
+def choose(task: str):
+    """Return `(model, downgraded)` for a request of class `task`."""
+    route = ROUTES[task]
+    with _lock:
+        busy = _in_flight[route.model] >= route.max_in_flight
+    if busy or _missing_slo(task, route):
+        return route.fallback, True
+    return route.model, False
+
+
+# Like `busy`, these only see requests dispatched by this process: prefetching
+# in the API service does not notice an app that calls Ollama itself.
+def in_flight() -> int:
+    """Interactive requests currently running on any model."""
+    with _lock:
+        return sum(_in_flight.values())
+
+
+def idle_seconds() -> float:
+    """Seconds since the last interactive request finished (0 while one runs)."""
+    with _lock:
+        if any(_in_flight.values()):
+            return 0.0
+        return time.monotonic() - _last_dispatch
+
+
+@contextmanager
+def _dispatch(task: str, kwargs: dict):
+    global _last_dispatch
+    model, downgraded = choose(task)
+    kwargs.setdefault("profile", generation_profiles.PROFILES[task])
+    kwargs.update(route=task, downgraded=downgraded)
+    with _lock:
+        _in_flight[model] += 1
+        busy.set()
+    try:
+        yield model
+    finally:
+        with _lock:
+            _in_flight[model] -= 1
+            _last_dispatch = time.monotonic()
+            if not any(_in_flight.values()):
+                busy.clear()
+
+
+def _prefetched(task: str, prompt: str, kwargs: dict):
+    conversation = kwargs.get("conversation")
+    if "template" not in kwargs:
+        return None
+    # Prefetched answers were generated without any conversation: fine for its
+    # first question, but a follow-up needs the model's context (and a repeated
+    # prompt is answered from the conversation)
+    if conversation is not None and conversation.turns:
+        llm_metrics.increment("response_cache_bypassed", template=kwargs["template"])
+        return None
+    entry = response_cache.CACHE.get(kwargs["template"], kwargs["template_version"], prompt)
+    if entry is None:
+        return None
+    return llm.cached(entry.model, prompt, entry.answer, cache_tier="prefetch", route=task,
+                      **{k: v for k, v in kwargs.items() if k != "route"})
+
+
+def generate(task: str, prompt: str, **kwargs):
+    """Run `llm.generate` on the model and generation profile chosen for `task`."""
+    cached = _prefetched(task, prompt, kwargs)
+    if cached is not None:
+        return cached
+    with _dispatch(task, kwargs) as model:
+        return llm.generate(model, prompt, **kwargs)
+
+
+def stream(task: str, prompt: str, **kwargs):
+    """Run `llm.stream` on the model and generation profile chosen for `task`."""
+    cached = _prefetched(task, prompt, kwargs)
+    if cached is not None:
+        yield cached["response"]
+        return
+    with _dispatch(task, kwargs) as model:
+        yield from llm.stream(model, prompt, **kwargs)
@@ -0,0 +1,364 @@
+"""Speculative prefetch of likely AI answers for the open Schreiben/Sprechen exercise.
+
+When a student opens a Schreiben or Sprechen exercise in the Übungen tab,
+the top predicted follow-up questions for that exercise are queued here. A
+single background thread answers them with the route's primary model, but
+only after no interactive request has run for IDLE_SECONDS, only while
+prefetching has used less than BUDGET_SHARE of the wall-clock time in the
+last BUDGET_WINDOW_SECONDS, and it aborts the generation (at the next
+token Ollama sends, reasoning included) as soon as an interactive request
+starts. Finished answers go into `response_cache`, where `model_router`
+finds them when the student asks. Prefetched answers only serve a
+session's first question, so sessions that already have a conversation
+are not prefetched for. Idle time is judged on the requests of this
+process only; run prefetching where the interactive requests are served.
+
+    python prefetch.py simulate --students 4 --seconds 30
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
+from typing import Optional
+
+import streamlit as st
+
+import api_client
+import conversations
+import generation_profiles
+import llm
+import llm_metrics
+import model_router
+import prompts
+import response_cache
+
+ENABLED = os.environ.get("FRENZGURU_PREFETCH", "1") == "1"
+TOP = int(os.environ.get("FRENZGURU_PREFETCH_TOP", "2"))  # questions prefetched per exercise
+BUDGET_SHARE = float(os.environ.get("FRENZGURU_PREFETCH_BUDGET", "0.25"))
+BUDGET_WINDOW_SECONDS = 600
+IDLE_SECONDS = float(os.environ.get("FRENZGURU_PREFETCH_IDLE", "2"))
+MAX_QUEUE = 32
+ERROR_BACKOFF_SECONDS = 30
+TEMPLATE = prompts.get("experte_qa")  # what the apps' "Frag den B1-Experten" box uses
+
+# (button label, question sent) per part; {task} and {details} come from the exercise
+FOLLOW_UPS = {
+    "Schreiben": [
+        ("Wie beginne und beende ich den Text?",
+         "Wie beginne und beende ich den Text bei dieser Aufgabe? {task}"),
+        ("Welche Redemittel passen?",
+         "Welche Redemittel passen zu dieser Schreibaufgabe? {task} {details}"),
+        ("Zeig mir einen Mustertext",
+         "Schreibe einen kurzen B1-Mustertext zu dieser Aufgabe: {task} {details}"),
+    ],
+    "Sprechen": [
+        ("Welche Redemittel helfen mir?",
+         "Welche Redemittel helfen mir bei dieser Sprechaufgabe? {task} {details}"),
+        ("Gib mir eine Beispielantwort",
+         "Gib mir eine kurze B1-Beispielantwort zu dieser Sprechaufgabe: {task} {details}"),
+        ("Welche Fehler sollte ich vermeiden?",
+         "Welche typischen Fehler sollte ich bei dieser Sprechaufgabe vermeiden? {task}"),
+    ],
+}
+
+
+@dataclass(frozen=True)
+class Question:
+    part: str
+    label: str
+    text: str
+
+
+_choices = Counter()  # (part, label) -> times a student picked the question
+_choices_lock = threading.Lock()
+
+
+def predict(part: str, exercise: dict, limit: int = len(FOLLOW_UPS["Schreiben"])) -> list:
+    """Likely follow-up questions for `exercise`, most often picked first."""
+    details = " ".join(" ".join(str(exercise[field]).split())
+                       for field in ("hints", "prompts", "topics") if field in exercise)
+    questions = [Question(part, label, text.format(task=exercise["task"], details=details).strip())
+                 for label, text in FOLLOW_UPS.get(part, [])]
+    with _choices_lock:
+        questions.sort(key=lambda q: -_choices[(q.part, q.label)])
+    return questions[:limit]
+
+
+def record_choice(question: Question):
+    with _choices_lock:
+        _choices[(question.part, question.label)] += 1
+
+
+@dataclass(frozen=True)
+class _Job:
+    question: str
+    task: str
+    prompt: str
+
+
+class Prefetcher:
+    def __init__(self, cache: response_cache.ResponseCache = response_cache.CACHE, *,
+                 top: int = TOP, budget_share: float = BUDGET_SHARE,
+                 window_seconds: float = BUDGET_WINDOW_SECONDS, idle_seconds: float = IDLE_SECONDS):
+        self.cache = cache
+        self.top = top
+        self.budget_share = budget_share
+        self.window_seconds = window_seconds
+        self.idle_seconds = idle_seconds
+        self._jobs = OrderedDict()  # prompt -> job, oldest first
+        self._running = None  # the job being generated
+        self._busy = deque()  # (finished at, seconds spent) of recent prefetches
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        self.stats = {"queued": 0, "completed": 0, "preempted": 0, "errors": 0, "dropped": 0}
+
+    def submit(self, part: str, exercise: dict) -> list:
+        """Queue the top questions for `exercise`; returns all predicted questions."""
+        questions = predict(part, exercise)
+        with self._cond:
+            for question in questions[:self.top]:
+                prompt = TEMPLATE.render(question.text)
+                if (prompt in self._jobs or (self._running and self._running.prompt == prompt)
+                        or self.cache.contains(TEMPLATE.name, TEMPLATE.version, prompt)):
+                    continue
+                self._jobs[prompt] = _Job(question.text, model_router.classify(question.text), prompt)
+                self.stats["queued"] += 1
+                while len(self._jobs) > MAX_QUEUE:
+                    self._jobs.popitem(last=False)
+                    self.stats["dropped"] += 1
+            if self._thread is None and self._jobs:
+                self._thread = threading.Thread(target=self._loop, name="frenzguru-prefetch", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return questions
+
+    def budget_used(self) -> float:
+        """Share of the budget window spent prefetching."""
+        cutoff = time.monotonic() - self.window_seconds
+        with self._cond:
+            while self._busy and self._busy[0][0] < cutoff:
+                self._busy.popleft()
+            return sum(seconds for _, seconds in self._busy) / self.window_seconds
+
+    def _ready(self) -> bool:
+        return (model_router.idle_seconds() >= self.idle_seconds
+                and self.budget_used() < self.budget_share)
+
+    def _next_job(self):
+        """Wait for a job and for idle capacity within the budget; newest exercise first."""
+        with self._cond:
+            while not self._stopped:
+                if self._jobs and self._ready():
+                    self._running = self._jobs.popitem(last=True)[1]
+                    return self._running
+                self._cond.wait(timeout=0.1 if self._jobs else None)
+        return None
+
+    def _run(self, job: _Job) -> bool:
+        """Generate one answer; False if an interactive request preempted it."""
+        model = model_router.ROUTES[job.task].model
+        pieces = []
+        stream = llm.stream(model, job.prompt, template=TEMPLATE.name, template_version=TEMPLATE.version,
+                            route="prefetch", profile=generation_profiles.PROFILES[job.task],
+                            system=TEMPLATE.system, cancel=model_router.busy)
+        try:
+            for delta in stream:
+                pieces.append(delta)
+        except llm.Cancelled:
+            return False
+        finally:
+            stream.close()  # closes the HTTP stream, so Ollama stops generating
+        if pieces:
+            self.cache.put(TEMPLATE.name, TEMPLATE.version, job.prompt, "".join(pieces).strip(), model)
+        return True
+
+    def _loop(self):
+        while (job := self._next_job()) is not None:
+            start = time.monotonic()
+            try:
+                outcome = "completed" if self._run(job) else "preempted"
+            except Exception as e:
+                outcome = "errors"
+                llm_metrics.logger.warning(json.dumps({"event": "prefetch_failed", "error": repr(e)}))
+            with self._cond:
+                self._running = None
+                self._busy.append((time.monotonic(), time.monotonic() - start))
+                self.stats[outcome] += 1
+                if outcome == "preempted" and job.prompt not in self._jobs:
+                    self._jobs[job.prompt] = job  # retried at the next idle moment
+            llm_metrics.increment("prefetch_jobs", outcome=outcome)
+            cache = self.cache.report()
+            llm_metrics.set_gauge("prefetch_hit_rate", cache["hit_rate"])
+            llm_metrics.logger.info(json.dumps({"event": "prefetch_job", "outcome": outcome,
+                                                "hit_rate": cache["hit_rate"],
+                                                "used_share": cache["used_share"]}))
+            if outcome == "errors":
+                with self._cond:
+                    self._cond.wait_for(lambda: self._stopped, timeout=ERROR_BACKOFF_SECONDS)
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def report(self) -> dict:
+        used = self.budget_used()
+        with self._cond:
+            report = {**self.stats, "pending": len(self._jobs)}
+        report.update(budget_used=round(used, 3), budget_share=self.budget_share,
+                      cache=self.cache.report())
+        llm_metrics.set_gauge("prefetch_budget_used", report["budget_used"])
+        llm_metrics.set_gauge("prefetch_hit_rate", report["cache"]["hit_rate"])
+        return report
+
+
+PREFETCHER = Prefetcher()
+
+
+def submit(part: str, exercise: dict, session_id: Optional[str] = None) -> list:
+    """Predicted questions for the exercise, prefetching the top ones when enabled.
+
+    Nothing is prefetched for a session that already has a conversation:
+    `model_router` answers its questions with the model, not the cache.
+    """
+    if part not in FOLLOW_UPS:
+        return []
+    if not ENABLED:
+        return predict(part, exercise)
+    if session_id and conversations.STORE.started(session_id):
+        llm_metrics.increment("prefetch_skipped", reason="conversation")
+        return predict(part, exercise)
+    return PREFETCHER.submit(part, exercise)
+
+
+def _ask(question: Question, question_key: str):
+    record_choice(question)
+    st.session_state[question_key] = question.text
+
+
+def render(part: str, index: int, exercise: dict, question_key: str):
+    """Buttons with the predicted questions, which fill the `question_key` text input."""
+    if part not in FOLLOW_UPS:
+        return
+    questions = None
+    if api_client.API_URL:
+        try:
+            questions = [Question(**q) for q in api_client.prefetch(
+                part, index, session=st.session_state.get("api_session"))]
+        except Exception:
+            pass  # the buttons still work; the answer is just not prefetched
+    if questions is None:
+        questions = submit(part, exercise, st.session_state.get("conversation_id"))
+    st.markdown("**💡 Häufige Fragen zu dieser Übung:**")
+    for i, (question, col) in enumerate(zip(questions, st.columns(len(questions)))):
+        col.button(question.label, key=f"prefetch_{part}_{i}", on_click=_ask, args=(question, question_key))
+
+
+# --- Simulation --- #
+class _FakeOllama:
+    """One GPU slot: a request holds it until its last token or until it is aborted."""
+
+    def __init__(self, seconds: float, chunks: int = 20):
+        self.seconds, self.chunks = seconds, chunks
+        self.slot = threading.Lock()
+
+    def _response(self, wall):
+        return {"response": "Antwort " * self.chunks, "done": True, "eval_count": self.chunks,
+                "total_duration": int(wall * 1e9), "eval_duration": int(wall * 1e9)}
+
+    def generate(self, model, prompt, options=None, stream=False, **kwargs):
+        if stream:
+            return self._stream()
+        start = time.perf_counter()
+        with self.slot:
+            time.sleep(self.seconds)
+        return self._response(time.perf_counter() - start)
+
+    def _stream(self):
+        start = time.perf_counter()
+        with self.slot:
+            for i in range(self.chunks):
+                time.sleep(self.seconds / self.chunks)
+                chunk = {"response": "Antwort "}
+                yield self._response(time.perf_counter() - start) if i == self.chunks - 1 else chunk
+
+
+def _student(seconds: float, think: tuple, pick_predicted: float, latencies: list, rng: random.Random):
+    from content import exercises
+
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        part = rng.choice(list(FOLLOW_UPS))
+        exercise = rng.choice(exercises[part])
+        questions = submit(part, exercise)
+        time.sleep(rng.uniform(*think))
+        if rng.random() < pick_predicted:
+            # Earlier questions are picked more often
+            question = questions[min(int(rng.expovariate(1.2)), len(questions) - 1)]
+            record_choice(question)
+            text = question.text
+        else:
+            text = f"Frage {rng.randrange(10 ** 6)} zu {exercise['task']}"
+        start = time.perf_counter()
+        model_router.generate(model_router.classify(text), TEMPLATE.render(text), template=TEMPLATE.name,
+                              template_version=TEMPLATE.version, system=TEMPLATE.system)
+        latencies.append(time.perf_counter() - start)
+        time.sleep(rng.uniform(*think))
+
+
+def simulate(students: int, seconds: float, service_seconds: float = 0.4) -> list:
+    """Students with a fake single-slot Ollama, without and with prefetching."""
+    global ENABLED, PREFETCHER
+
+    fake = _FakeOllama(service_seconds)
+    original = llm.ollama.generate
+    llm.ollama.generate = fake.generate
+    results = []
+    try:
+        for enabled in (False, True):
+            ENABLED = enabled
+            response_cache.CACHE = response_cache.ResponseCache()
+            PREFETCHER = Prefetcher(response_cache.CACHE, idle_seconds=service_seconds / 2)
+            _choices.clear()
+            latencies = []
+            threads = [threading.Thread(target=_student,
+                                        args=(seconds, (1.0, 3.0), 0.6, latencies, random.Random(i)))
+                       for i in range(students)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            report = PREFETCHER.report()
+            PREFETCHER.stop()
+            results.append({
+                "prefetch": enabled,
+                "questions": len(latencies),
+                "latency_p50": round(llm_metrics.quantile(latencies, 0.5), 3),
+                "latency_p95": round(llm_metrics.quantile(latencies, 0.95), 3),
+                "latency_mean": round(sum(latencies) / len(latencies), 3),
+                "hit_rate": report["cache"]["hit_rate"],
+                "prefetched": report["completed"],
+                "preempted": report["preempted"],
+                "used_share": report["cache"]["used_share"],
+                "budget_used": report["budget_used"],
+            })
+    finally:
+        llm.ollama.generate = original
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Speculative answer prefetching.")
+    parser.add_argument("command", choices=["simulate"])
+    parser.add_argument("--students", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--service", type=float, default=0.4, help="seconds per simulated LLM answer")
+    args = parser.parse_args()
+    print(json.dumps(simulate(args.students, args.seconds, args.service), indent=2))
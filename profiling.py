@@ -0,0 +1,130 @@
+"""Opt-in per-rerun profiling for the Streamlit apps.
+
+Enable with ``FRENZGURU_PROFILE=1``. Each rerun is then timed per section,
+the Streamlit elements it emits are counted, and reruns slower than
+``FRENZGURU_PROFILE_SLOW`` seconds get a cProfile summary attached. Results
+go to a rotating JSON-lines file and to an in-app debug panel. When
+disabled, `rerun` and `section` return a shared no-op context manager.
+"""
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from logging.handlers import RotatingFileHandler
+
+import streamlit as st
+
+ENABLED = os.environ.get("FRENZGURU_PROFILE") == "1"
+SLOW_RERUN_SECONDS = float(os.environ.get("FRENZGURU_PROFILE_SLOW", "1.0"))
+LOG_PATH = os.environ.get("FRENZGURU_PROFILE_LOG", "profile.log")
+CPU_PROFILE_LINES = 25
+
+_NULL = nullcontext()
+_state = threading.local()  # each rerun executes on its own script thread
+_history = deque(maxlen=100)
+_log = logging.getLogger("frenzguru.profile")
+
+
+def _install():
+    if not ENABLED or _log.handlers:
+        return
+    handler = RotatingFileHandler(LOG_PATH, maxBytes=5 * 1024 * 1024, backupCount=3,
+                                  encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _log.addHandler(handler)
+    _log.setLevel(logging.INFO)
+    _log.propagate = False
+
+    # Count every delta sent to the browser, attributed to the open section
+    from streamlit.delta_generator import DeltaGenerator
+    original = DeltaGenerator._enqueue
+
+    def _enqueue(self, *args, **kwargs):
+        profile = getattr(_state, "profile", None)
+        if profile is not None:
+            profile["elements"] += 1
+            if _state.stack:
+                profile["sections"][_state.stack[-1]]["elements"] += 1
+        return original(self, *args, **kwargs)
+
+    DeltaGenerator._enqueue = _enqueue
+
+
+_install()
+
+
+def _cpu_summary(profiler) -> str:
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(CPU_PROFILE_LINES)
+    return out.getvalue()
+
+
+@contextmanager
+def _rerun(app):
+    profile = {"app": app, "ts": time.time(), "elements": 0, "sections": {}}
+    _state.profile, _state.stack = profile, []
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # another session's rerun already holds the profiler
+        profiler = None
+    start = time.perf_counter()
+    try:
+        yield profile
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        profile["seconds"] = round(time.perf_counter() - start, 4)
+        if profiler is not None and profile["seconds"] >= SLOW_RERUN_SECONDS:
+            profile["cpu_profile"] = _cpu_summary(profiler)
+        _state.profile = None
+        _history.append(profile)
+        _log.info(json.dumps(profile, ensure_ascii=False))
+        st.session_state["_frenzguru_last_profile"] = profile
+
+
+def rerun(app: str):
+    """Wrap one execution of an app's main(); a no-op unless profiling is on."""
+    return _rerun(app) if ENABLED else _NULL
+
+
+@contextmanager
+def _section(name):
+    profile = getattr(_state, "profile", None)
+    if profile is None:
+        yield
+        return
+    stats = profile["sections"].setdefault(name, {"seconds": 0.0, "elements": 0})
+    _state.stack.append(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats["seconds"] = round(stats["seconds"] + time.perf_counter() - start, 4)
+        _state.stack.pop()
+
+
+def section(name: str):
+    """Time a block of the script (a tab, the AI box, a table...)."""
+    return _section(name) if ENABLED else _NULL
+
+
+def render_debug_panel():
+    """Show the previous rerun's profile of this session in the sidebar."""
+    if not ENABLED:
+        return
+    last = st.session_state.get("_frenzguru_last_profile")
+    with st.sidebar.expander("⏱️ Profiling (letzter Rerun)"):
+        if not last:
+            st.caption("Noch keine Messung.")
+            return
+        st.markdown(f"**{last['seconds']:.3f} s**, {last['elements']} Elemente")
+        st.json(last["sections"])
+        if "cpu_profile" in last:
+            st.code(last["cpu_profile"], language=None)
@@ -0,0 +1,84 @@
+"""Versioned prompt templates shared by the apps.
+
+A template is split into a stable `system` instruction block and a short
+per-request `prompt`. The system block is byte-identical across calls so
+Ollama can reuse its cached prefix, and within a conversation (see
+`conversations.py`) follow-up questions send only the new question together
+with the `context` returned by the previous answer instead of the whole
+instruction block again.
+"""
+import textwrap
+from dataclasses import dataclass
+
+
+def compact(text: str) -> str:
+    """Dedent, strip trailing spaces and drop blank lines."""
+    lines = (line.rstrip() for line in textwrap.dedent(text).strip().splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    name: str
+    version: str
+    system: str
+    prompt: str  # per-request part, with a single {input} slot
+
+    def render(self, user_input: str) -> str:
+        return self.prompt.format(input=user_input.strip())
+
+
+TEMPLATES = {}
+
+
+def register(name: str, version: str, system: str, prompt: str) -> PromptTemplate:
+    template = PromptTemplate(name, version, compact(system), compact(prompt))
+    TEMPLATES[name] = template
+    return template
+
+
+def get(name: str) -> PromptTemplate:
+    return TEMPLATES[name]
+
+
+# --- Templates --- #
+register("expert_qa", "2", system="""
+    You are a German B1 exam (Goethe-Zertifikat B1) expert.
+    Give a **short, clear, and precise** answer to help the student prepare.
+    Answer in **English or German** (based on the question language).
+    Focus on: exam strategies, key vocabulary, grammar rules, time management, common mistakes.
+""", prompt="Question: {input}")
+
+register("writing_feedback", "1", system="""
+    You are a German B1 exam (Goethe-Zertifikat B1) examiner.
+    Give brief feedback on the student's B1 German writing task:
+    structure, register (formal/informal), grammar and vocabulary, and the most important corrections.
+""", prompt="Text:\n{input}")
+
+register("experte_qa", "2", system="""
+    Du bist ein B1-Prüfungsexperte. Beantworte die Frage kurz und präzise:
+    - Maximal 3 Sätze
+    - Fokus auf Prüfungsstrategien
+    - Wichtige Grammatikpunkte
+    - Typische Fehler vermeiden
+""", prompt="Frage: {input}")
+
+register("schreiben_feedback", "1", system="""
+    Du bist ein B1-Prüfer. Gib kurzes Feedback zu diesem B1-Text:
+    Aufbau, Register (formell/informell), Grammatik, Wortschatz und die wichtigsten Korrekturen.
+""", prompt="Text:\n{input}")
+
+register("vocab_enrichment", "1", system="""
+    Du erstellst Lernmaterial für die Prüfung Goethe-Zertifikat B1.
+    Antworte nur mit einem JSON-Objekt mit diesen Feldern:
+    "examples": zwei kurze, natürliche B1-Beispielsätze mit dem Eintrag,
+    "gender": "der", "die" oder "das" bei Nomen, sonst null,
+    "case": der Kasus, den der Eintrag verlangt (z. B. "Genitiv", "um + Akkusativ"), sonst null,
+    "distractors": drei falsche, aber plausible deutsche Wörter derselben Wortart für eine Lückenübung.
+""", prompt="{input}")
+
+register("lesen_bewertung", "1", system="""
+    Du bist ein B1-Prüfer und bewertest Antworten zu Leseaufgaben.
+    Vergleiche die Antwort mit den Musterantworten: Zählt nur der Inhalt, nicht Stil oder Rechtschreibung.
+    Antworte nur mit einem JSON-Objekt: {"richtig": true oder false, "begruendung": ein kurzer Satz auf Deutsch}.
+""", prompt="{input}")
@@ -0,0 +1,300 @@
+"""Automatic grading of Lesen answers against precomputed reference embeddings.
+
+The reference answers in `content.reading_references` are embedded once,
+offline (`build`), with the Ollama embedding model and stored as one
+L2-normalized matrix in ``reading_references.npz`` (with a hash of the
+references and the model, so stale files are detected). A student answer
+is embedded and scored by its best cosine similarity to the exercise's
+references plus the share of keyword groups it covers; without a current
+file, by the keyword share alone. Only answers between FAIL_SCORE and
+PASS_SCORE go to the LLM for a verdict. `grade_batch` grades a whole class
+in one embedding call and one matrix product.
+
+    python reading_grader.py build
+    python reading_grader.py grade --exercise 0 antworten.csv   # columns: student, answer
+    python reading_grader.py benchmark --answers 1000
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+import analytics
+import api_client
+import cloze
+import content
+import generation_profiles
+import llm
+import llm_metrics
+import model_router
+import prompts
+
+EMBED_MODEL = os.environ.get("FRENZGURU_MODEL_EMBEDDING", "nomic-embed-text")
+REFERENCES_PATH = Path(__file__).resolve().parent / "reading_references.npz"
+EMBED_BATCH = 128  # answers per embedding request
+# Cosine similarity is mapped to 0..1 between these two values
+SIMILARITY_FLOOR = 0.55
+SIMILARITY_CEILING = 0.85
+SIMILARITY_WEIGHT = 0.5  # the rest of the score is keyword coverage
+PASS_SCORE = 0.65
+FAIL_SCORE = 0.4
+TEMPLATE = prompts.get("lesen_bewertung")
+
+
+@dataclass(frozen=True)
+class References:
+    matrix: np.ndarray  # one normalized row per reference answer
+    exercise: np.ndarray  # exercise index of each row
+    version: str
+
+
+@dataclass(frozen=True)
+class Grade:
+    score: float
+    similarity: float
+    coverage: float
+    missing: tuple  # first word of each keyword group the answer doesn't cover
+    verdict: str  # "richtig", "falsch" or "unsicher"
+    source: str  # "embedding", "keywords" (no references or embeddings) or "llm"
+    reason: str = ""
+
+
+def references_version(model: str = EMBED_MODEL) -> str:
+    data = [model, {str(i): ref["answers"] for i, ref in content.reading_references.items()}]
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _embed(texts) -> np.ndarray:
+    """Normalized float32 embeddings of `texts`, EMBED_BATCH per request."""
+    texts = list(texts)
+    vectors = []
+    for i in range(0, len(texts), EMBED_BATCH):
+        vectors.extend(llm.embed(EMBED_MODEL, texts[i:i + EMBED_BATCH], route="reading"))
+    matrix = np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def build(path: Path = REFERENCES_PATH) -> References:
+    """Embed every reference answer and store the matrix."""
+    rows = [(index, answer) for index, ref in content.reading_references.items() for answer in ref["answers"]]
+    refs = References(_embed(answer for _, answer in rows),
+                      np.array([index for index, _ in rows], dtype=np.int32), references_version())
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".npz", delete=False) as tmp:
+        np.savez(tmp, matrix=refs.matrix, exercise=refs.exercise, version=refs.version)
+    os.replace(tmp.name, path)
+    return refs
+
+
+_references = None
+_warned = False
+_lock = threading.Lock()
+
+
+def references():
+    """The stored reference matrix, or None if it is missing or out of date.
+
+    Building it calls the embedding model for every reference answer, so it
+    is an offline step (`python reading_grader.py build`), never done here.
+    """
+    global _references, _warned
+    version = references_version()
+    with _lock:
+        if _references is None or _references.version != version:
+            _references = None
+            if REFERENCES_PATH.exists():
+                with np.load(REFERENCES_PATH) as data:
+                    refs = References(data["matrix"], data["exercise"], str(data["version"]))
+                if refs.version == version:
+                    _references = refs
+            if _references is None and not _warned:
+                _warned = True
+                llm_metrics.logger.warning(json.dumps({
+                    "event": "reading_references_unavailable", "path": str(REFERENCES_PATH),
+                    "hint": "run 'python reading_grader.py build'; grading uses keywords only"}))
+        return _references
+
+
+def _coverage(index: int, answers) -> np.ndarray:
+    """Boolean matrix (answer × keyword group): does the answer contain the group?"""
+    texts = np.array([cloze.normalize(answer) for answer in answers], dtype=str)
+    groups = content.reading_references[index]["keywords"]
+    covered = np.zeros((len(texts), len(groups)), dtype=bool)
+    for column, group in enumerate(groups):
+        for keyword in group:
+            covered[:, column] |= np.char.find(texts, cloze.normalize(keyword)) >= 0
+    return covered
+
+
+def _judge(index: int, answer: str, score: float):
+    """Ask the LLM for a verdict on a borderline answer; None if it can't tell."""
+    exercise = content.exercises["Lesen"][index]
+    references_text = "\n".join(f"- {a}" for a in content.reading_references[index]["answers"])
+    prompt = TEMPLATE.render(f"Aufgabe: {exercise['question']}\nText: {exercise['text'].strip()}\n"
+                             f"Musterantworten:\n{references_text}\nAntwort: {answer}")
+    try:
+        response = model_router.generate(model_router.QA, prompt, template=TEMPLATE.name,
+                                         template_version=TEMPLATE.version, system=TEMPLATE.system,
+                                         profile=generation_profiles.PROFILES["grading"], format="json")
+        data = json.loads(response["response"])
+        return bool(data["richtig"]), str(data.get("begruendung") or "")
+    except Exception as e:
+        llm_metrics.logger.warning(json.dumps({"event": "reading_judge_failed", "exercise": index,
+                                               "score": round(score, 3), "error": repr(e)}))
+        return None
+
+
+def grade_batch(index: int, answers, *, judge: bool = True) -> list:
+    """Grade every answer to Lesen exercise `index`; the LLM only sees borderline ones."""
+    if index not in content.reading_references:
+        raise KeyError(f"No reference answers for Lesen exercise {index}")
+    answers = [str(answer or "").strip() for answer in answers]
+    refs = references()
+    covered = _coverage(index, answers)
+    coverage = covered.mean(axis=1)
+    similarity = np.zeros(len(answers), dtype=np.float32)
+    scores, base_source = coverage, "keywords"  # references not built, or no embeddings
+    if refs is not None:
+        filled = [i for i, answer in enumerate(answers) if answer]
+        try:
+            if filled:
+                rows = refs.matrix[refs.exercise == index]
+                similarity[filled] = (_embed(answers[i] for i in filled) @ rows.T).max(axis=1)
+        except Exception as e:  # embedding model down: keyword coverage alone
+            llm_metrics.logger.warning(json.dumps({"event": "reading_embed_failed", "exercise": index,
+                                                   "answers": len(filled), "error": repr(e)}))
+            similarity[:] = 0
+        else:
+            scaled = np.clip((similarity - SIMILARITY_FLOOR) / (SIMILARITY_CEILING - SIMILARITY_FLOOR), 0, 1)
+            scores = SIMILARITY_WEIGHT * scaled + (1 - SIMILARITY_WEIGHT) * coverage
+            base_source = "embedding"
+    groups = content.reading_references[index]["keywords"]
+
+    grades = []
+    for i, answer in enumerate(answers):
+        score = float(scores[i])
+        verdict = "richtig" if score >= PASS_SCORE else "falsch" if score < FAIL_SCORE else "unsicher"
+        source, reason = base_source, ""
+        if verdict == "unsicher" and judge:
+            result = _judge(index, answer, score)
+            if result is not None:
+                verdict, source, reason = ("richtig" if result[0] else "falsch"), "llm", result[1]
+        llm_metrics.increment("reading_graded", verdict=verdict, source=source)
+        grades.append(Grade(round(score, 3), round(float(similarity[i]), 3), round(float(coverage[i]), 3),
+                            tuple(group[0] for group, hit in zip(groups, covered[i]) if not hit),
+                            verdict, source, reason))
+    return grades
+
+
+def grade(index: int, answer: str, *, judge: bool = True) -> Grade:
+    return grade_batch(index, [answer], judge=judge)[0]
+
+
+def _criteria(result: Grade) -> dict:
+    """The analytics criterion of a grade; an undecided verdict counts as ungraded."""
+    return {} if result.verdict == "unsicher" else {"Richtig": float(result.verdict == "richtig")}
+
+
+def render(index: int, answer: str):
+    """Button that grades `answer` to Lesen exercise `index` and shows the result."""
+    if index not in content.reading_references or not st.button("Antwort bewerten", key="reading_grade"):
+        return
+    if not answer.strip():
+        st.warning("Bitte schreibe zuerst eine Antwort.")
+        return
+    try:
+        with st.spinner("Antwort wird bewertet..."):
+            result = Grade(**api_client.grade_reading(index, answer)) if api_client.API_URL \
+                else grade(index, answer)
+    except Exception as e:
+        st.error(f"Bewertung nicht möglich: {e}")
+        return
+    class_id, student = analytics.learner()
+    analytics.record(class_id, student, "Lesen", score=result.score, criteria=_criteria(result))
+    show = {"richtig": st.success, "falsch": st.error}.get(result.verdict, st.warning)
+    text = {"richtig": "Richtig!", "falsch": "Noch nicht richtig."}.get(result.verdict, "Teilweise richtig.")
+    details = f"Übereinstimmung: {result.score:.0%}"
+    if result.missing:
+        details += f" · Es fehlt noch: {', '.join(result.missing)}"
+    show(f"{text} {result.reason}  \n{details}")
+
+
+# --- CLI --- #
+def _grade_file(index: int, path: str, judge: bool):
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    start = time.perf_counter()
+    grades = grade_batch(index, [row["answer"] for row in rows], judge=judge)
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["student", "verdict", "score", "similarity", "coverage", "source", "missing", "reason"])
+    for row, result in zip(rows, grades):
+        writer.writerow([row.get("student", ""), result.verdict, result.score, result.similarity,
+                         result.coverage, result.source, " ".join(result.missing), result.reason])
+    print(f"# {len(rows)} answers in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+def _synthetic_answers(index: int, count: int, seed: int = 0) -> list:
+    """Reference sentences, shuffled and partly dropped, as a stand-in for a class."""
+    rng = np.random.default_rng(seed)
+    sentences = [s.strip() for answer in content.reading_references[index]["answers"]
+                 for s in answer.split(". ") if s.strip()]
+    answers = []
+    for _ in range(count):
+        keep = rng.choice(len(sentences), size=rng.integers(1, len(sentences) + 1), replace=False)
+        answers.append(". ".join(sentences[i] for i in keep))
+    return answers
+
+
+def benchmark(count: int) -> dict:
+    if references() is None:
+        raise SystemExit(f"{REFERENCES_PATH} is missing or out of date: run 'python reading_grader.py build'")
+    report = {}
+    for index in content.reading_references:
+        answers = _synthetic_answers(index, count)
+        start = time.perf_counter()
+        vectors = _embed(answers)
+        embed_seconds = time.perf_counter() - start
+        refs = references()
+        start = time.perf_counter()
+        similarity = (vectors @ refs.matrix[refs.exercise == index].T).max(axis=1)
+        coverage = _coverage(index, answers).mean(axis=1)
+        score_seconds = time.perf_counter() - start
+        scores = SIMILARITY_WEIGHT * np.clip((similarity - SIMILARITY_FLOOR)
+                                             / (SIMILARITY_CEILING - SIMILARITY_FLOOR), 0, 1) \
+            + (1 - SIMILARITY_WEIGHT) * coverage
+        report[index] = {
+            "answers": count,
+            "embed_seconds": round(embed_seconds, 3),
+            "score_ms": round(score_seconds * 1000, 2),
+            "borderline_share": round(float(((scores >= FAIL_SCORE) & (scores < PASS_SCORE)).mean()), 3),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lesen answer grading.")
+    parser.add_argument("command", choices=["build", "grade", "benchmark"])
+    parser.add_argument("file", nargs="?", help="CSV with 'student' and 'answer' columns (grade)")
+    parser.add_argument("--exercise", type=int, default=0)
+    parser.add_argument("--no-llm", action="store_true", help="leave borderline answers 'unsicher'")
+    parser.add_argument("--answers", type=int, default=1000)
+    args = parser.parse_args()
+    if args.command == "build":
+        refs = build()
+        print(f"{len(refs.matrix)} reference answers, {refs.matrix.shape[1]} dimensions -> {REFERENCES_PATH}")
+    elif args.command == "grade":
+        if not args.file:
+            parser.error("grade needs a CSV file")
+        _grade_file(args.exercise, args.file, judge=not args.no_llm)
+    else:
+        print(json.dumps(benchmark(args.answers), indent=2))
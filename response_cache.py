@@ -0,0 +1,94 @@
+"""Answers computed ahead of time, looked up before an interactive model call.
+
+`prefetch.py` fills the cache while the LLM is idle; `model_router.generate`
+and `model_router.stream` answer from it when the template and prompt match
+(whitespace and case aside). Entries expire after FRENZGURU_RESPONSE_CACHE_TTL
+seconds and the least recently used ones are dropped beyond
+FRENZGURU_RESPONSE_CACHE_ENTRIES.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import llm_metrics
+
+TTL_SECONDS = float(os.environ.get("FRENZGURU_RESPONSE_CACHE_TTL", str(6 * 3600)))
+MAX_ENTRIES = int(os.environ.get("FRENZGURU_RESPONSE_CACHE_ENTRIES", "512"))
+
+
+@dataclass
+class Entry:
+    answer: str
+    model: str
+    created: float
+    hits: int = 0
+
+
+def key(template: str, template_version: str, prompt: str) -> tuple:
+    return template, template_version, " ".join(prompt.split()).casefold()
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES, ttl_seconds: float = TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._templates = set()  # only lookups for these count towards the hit rate
+        self._lock = threading.Lock()
+        self.stats = {"lookups": 0, "hits": 0, "filled": 0, "used": 0, "unused_dropped": 0}
+
+    def _drop(self, cache_key):
+        entry = self._entries.pop(cache_key)
+        if not entry.hits:
+            self.stats["unused_dropped"] += 1
+
+    def get(self, template: str, template_version: str, prompt: str) -> Optional[Entry]:
+        """The entry for this request, counting the lookup as a hit or miss."""
+        if template not in self._templates:
+            return None
+        cache_key = key(template, template_version, prompt)
+        with self._lock:
+            self.stats["lookups"] += 1
+            entry = self._entries.get(cache_key)
+            if entry is not None and time.time() - entry.created > self.ttl_seconds:
+                self._drop(cache_key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                self.stats["hits"] += 1
+                self.stats["used"] += not entry.hits
+                entry.hits += 1
+        llm_metrics.increment("response_cache_lookups", result="hit" if entry else "miss", template=template)
+        return entry
+
+    def contains(self, template: str, template_version: str, prompt: str) -> bool:
+        """Whether a fresh entry exists, without counting a lookup."""
+        with self._lock:
+            entry = self._entries.get(key(template, template_version, prompt))
+            return entry is not None and time.time() - entry.created <= self.ttl_seconds
+
+    def put(self, template: str, template_version: str, prompt: str, answer: str, model: str):
+        cache_key = key(template, template_version, prompt)
+        with self._lock:
+            if cache_key in self._entries:
+                self._drop(cache_key)
+            self._entries[cache_key] = Entry(answer, model, time.time())
+            self._templates.add(template)
+            self.stats["filled"] += 1
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+            size = len(self._entries)
+        llm_metrics.set_gauge("response_cache_entries", size)
+
+    def report(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats, entries=len(self._entries))
+        stats["hit_rate"] = round(stats["hits"] / stats["lookups"], 3) if stats["lookups"] else 0.0
+        stats["used_share"] = round(stats["used"] / stats["filled"], 3) if stats["filled"] else 0.0
+        return stats
+
+
+CACHE = ResponseCache()
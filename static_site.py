@@ -0,0 +1,320 @@
+"""Static HTML export of the read-only study content.
+
+The strategies of `apps.py` and the Übersicht, Wortschatz, Schreiben and
+Prüfungsinfo tabs of `franzfreinds.py` and `freundmitfranz.py` don't change
+between visits, so they can be served by any static file server instead of
+a Streamlit script run and websocket session per view. The pages use the
+apps' own CSS (`styles.py`) and link to the Streamlit apps, which keep the
+interactive parts: exercises, the AI expert, the mock exam and the
+calculators.
+
+    python static_site.py export --out site
+    python static_site.py benchmark      # server CPU per page view, both paths
+"""
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+import urllib.request
+from html import escape
+from pathlib import Path
+
+import assets
+import styles
+from content import (exam_data, exam_info, franz_exam_info, franz_exam_parts, franz_study_plan,
+                     franz_vocab_data, franz_writing_tips, scoring, study_plan, verb_conjugation,
+                     vocab_data, writing_templates, writing_tips)
+
+APP_URLS = {
+    "strategien": os.environ.get("FRENZGURU_STRATEGIEN_URL", "http://localhost:8501"),
+    "blitz": os.environ.get("FRENZGURU_BLITZ_URL", "http://localhost:8502"),
+    "intensiv": os.environ.get("FRENZGURU_INTENSIV_URL", "http://localhost:8503"),
+}
+
+BASE_CSS = """
+body { font-family: "Source Sans Pro", system-ui, sans-serif; color: #31333f; margin: 0; line-height: 1.6; }
+main { max-width: 46rem; margin: 0 auto; padding: 2rem 1rem 4rem; }
+main.wide { max-width: 80rem; }
+nav.top { background: #1a73e8; padding: 0.6rem 1rem; }
+nav.top a { color: white; margin-right: 1.2rem; text-decoration: none; font-weight: 600; }
+nav.sections a { margin-right: 1rem; }
+.columns { display: grid; grid-template-columns: repeat(var(--n), minmax(0, 1fr)); gap: 1rem; }
+details { border: 1px solid #e6e6ea; border-radius: 0.5rem; padding: 0.5rem 1rem; margin: 0.5rem 0; }
+summary { cursor: pointer; font-weight: 600; }
+pre { background: #f0f2f6; padding: 1rem; border-radius: 0.5rem; white-space: pre-wrap; }
+table.plain { border-collapse: collapse; }
+table.plain th, table.plain td { border-bottom: 1px solid #e6e6ea; padding: 0.3rem 0.8rem; text-align: left; }
+.app-link { display: inline-block; margin: 1rem 0; padding: 0.6rem 1rem; border-radius: 0.5rem;
+            background: #1a73e8; color: white; text-decoration: none; font-weight: 600; }
+figure img { max-width: 100%; }
+figcaption { color: #808495; font-size: 0.9rem; }
+"""
+
+PAGES = [("index.html", "Start"), ("strategien.html", "B1 Prüfungsstrategien"),
+         ("blitz.html", "Blitzvorbereitung"), ("intensiv.html", "Intensivkurs")]
+
+
+# --- HTML helpers --- #
+def _md(text: str) -> str:
+    """Escape `text`, keeping the **bold** and *italic* of the content strings."""
+    text = escape(text)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+    return re.sub(r"\*(.+?)\*", r"<em>\1</em>", text)
+
+
+def _list(items, ordered=False) -> str:
+    tag = "ol" if ordered else "ul"
+    return f"<{tag}>" + "".join(f"<li>{_md(item)}</li>" for item in items) + f"</{tag}>"
+
+
+def _details(summary: str, body: str) -> str:
+    return f"<details><summary>{_md(summary)}</summary>{body}</details>"
+
+
+def _columns(cells) -> str:
+    cells = list(cells)
+    return f'<div class="columns" style="--n: {len(cells)}">' + "".join(
+        f"<div>{cell}</div>" for cell in cells) + "</div>"
+
+
+def _split(items, n=2):
+    """Distribute `items` over `n` columns the way the apps do (i % n)."""
+    return [items[i::n] for i in range(n)]
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def _app_link(app: str, label: str) -> str:
+    return f'<a class="app-link" href="{escape(APP_URLS[app])}">{escape(label)} →</a>'
+
+
+def _page(title: str, body: str, css: str = "", wide: bool = False) -> str:
+    nav = "".join(f'<a href="{href}">{escape(label)}</a>' for href, label in PAGES)
+    return (
+        '<!DOCTYPE html>\n<html lang="de">\n<head>\n<meta charset="utf-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        f"<title>{escape(title)}</title>\n<style>{BASE_CSS}{css}</style>\n</head>\n"
+        f'<body>\n<nav class="top">{nav}</nav>\n<main{" class=wide" if wide else ""}>\n'
+        f"{body}\n</main>\n</body>\n</html>\n"
+    )
+
+
+def _image(name: str, caption: str, out: Path) -> str:
+    """Copy a mirrored asset next to the pages, or link the original."""
+    source = assets.ASSETS[name]
+    path = assets.local_path(source)
+    if path is not None:
+        (out / "media").mkdir(exist_ok=True)
+        shutil.copyfile(path, out / "media" / f"{name}{path.suffix}")
+        source = f"media/{name}{path.suffix}"
+    return f'<figure><img src="{escape(source)}" alt="{escape(caption)}"><figcaption>{escape(caption)}</figcaption></figure>'
+
+
+# --- Pages --- #
+def strategien_page() -> str:
+    """All four parts of `apps.py`, instead of one selected part per run."""
+    body = ["<h1>B1 Prüfungsstrategien</h1>",
+            "<p><strong>Praktische Anleitung für jeden Prüfungsteil</strong><br>"
+            "<em>Konzentriert auf reine Prüfungsvorbereitung</em></p>",
+            '<nav class="sections">' + "".join(
+                f'<a href="#{_slug(part)}">{escape(part)}</a>' for part in exam_data) + "</nav>"]
+    for part, data in exam_data.items():
+        card = [f"<h3>{escape(part)}</h3><p>⏱️ <strong>Dauer:</strong> {escape(data['Dauer'])}</p>",
+                "<h4>Aufgaben:</h4>", _list(data["Aufgaben"])]
+        if "Lesen" in part:
+            card += ["<h4>Strategien:</h4>", _list(data["Strategien"]), "<h4>Beispiel:</h4>",
+                     f"<p><em>Text:</em> {_md(data['Beispiel']['Text'])}</p>",
+                     f"<p><em>Frage:</em> {_md(data['Beispiel']['Frage'])}</p>"]
+        elif "Schreiben" in part:
+            card += ["<h4>Textstruktur:</h4>"]
+            card += [_details(text_type, _list(items)) for text_type, items in data["Struktur"].items()]
+            card += ["<h4>Tipps:</h4>", _list(data["Tipps"])]
+        elif "Hören" in part:
+            card += ["<h4>Strategien:</h4>", _list(data["Strategien"]),
+                     f"<h4>Übungstipp:</h4><p>{_md(data['Übung'])}</p>"]
+        elif "Sprechen" in part:
+            phrases = [[f"<span class='highlight'>{_md(p)}</span>" for p in column]
+                       for column in _split(data["Redemittel"])]
+            card += ["<h4>Bewertungskriterien:</h4>", _list(data["Bewertung"]),
+                     "<h4>Nützliche Redemittel:</h4>",
+                     _columns("<ul>" + "".join(f"<li>{p}</li>" for p in column) + "</ul>"
+                              for column in phrases)]
+        body.append(f'<div class="exam-card" id="{_slug(part)}">' + "".join(card) + "</div>")
+    body += ["<hr><h3>⏱️ Zeitmanagement Rechner, 💡 Schnellübung und Prüfungssimulation</h3>",
+             _app_link("strategien", "Interaktiv in der App")]
+    return _page("B1 Prüfungsstrategien", "\n".join(body), styles.STRATEGIEN)
+
+
+def _study_plan_html(plan: dict) -> str:
+    return _columns(f"<h3><strong>{escape(day)}</strong></h3>{_list(items)}" for day, items in plan.items())
+
+
+def _template_html(name: str, heading: str) -> str:
+    template = writing_templates[name]
+    return (f"<h3>{escape(name)}</h3><p><strong>{heading}</strong></p>{_list(template['structure'])}"
+            f"<pre>{escape(template['example'].strip())}</pre>")
+
+
+def blitz_page(out: Path) -> str:
+    """The read-only tabs of `franzfreinds.py`."""
+    body = ["<h1>🇩🇪 B1 Prüfung Blitzvorbereitung</h1>",
+            "<h2>2-Tage-Intensivkurs für die Goethe B1 Prüfung</h2>",
+            '<nav class="sections"><a href="#uebersicht">Übersicht</a><a href="#wortschatz">Wortschatz</a>'
+            '<a href="#schreiben">Schreiben</a><a href="#pruefungsinfo">Prüfungsinfo</a></nav>',
+            '<h2 id="uebersicht">2-Tage-Lernplan</h2>', _study_plan_html(franz_study_plan),
+            "<h2>Prüfungsteile</h2>",
+            _columns(f'<div class="teil-card"><h3>Teil {i}: {escape(teil)}</h3>'
+                     f"<p>{escape(duration)} | {escape(desc)}</p></div>"
+                     for i, (teil, duration, desc) in enumerate(franz_exam_parts, 1)),
+            _app_link("blitz", "Übungen und B1-Experte (AI)"),
+            '<h2 id="wortschatz">Wichtiger Wortschatz für B1</h2>']
+    for title, items in franz_vocab_data.items():
+        columns = _split(list(items.items()))
+        body.append(_details(title, _columns(
+            "".join(f"<p><strong>{escape(word)}</strong> - {_md(meaning)}</p>" for word, meaning in column)
+            for column in columns)))
+    body += ["<h3>Präpositionen mit Fallen</h3>",
+             _image("praepositionen_tabelle", "Präpositionen mit Dativ, Akkusativ und Genitiv", out),
+             '<h2 id="schreiben">Schreiben Vorlagen</h2>']
+    body += [_template_html(name, "Structure:") for name in writing_templates]
+    body += ["<h3>Tipps für das Schreiben</h3>", _list(franz_writing_tips, ordered=True),
+             '<h2 id="pruefungsinfo">Prüfungsinformationen</h2>']
+    for title, info in franz_exam_info.items():
+        if "description" in info or "requirements" in info:
+            inner = f"<p>{_md(info.get('description', ''))}</p>" + _list(info.get("requirements", []))
+        else:
+            inner = "".join(f"<p><strong>{escape(part)}</strong>: {_md(text)}</p>" for part, text in info.items())
+        body.append(_details(title, inner))
+    return _page("B1 Prüfung Blitzvorbereitung", "\n".join(body), styles.BLITZ, wide=True)
+
+
+def intensiv_page() -> str:
+    """The read-only tabs of `freundmitfranz.py`."""
+    body = ["<h1>🇩🇪 B1 Prüfung Blitzvorbereitung</h1>",
+            "<h2>Intensivkurs für die Goethe B1 Prüfung</h2>",
+            '<nav class="sections"><a href="#uebersicht">Übersicht</a><a href="#wortschatz">Wortschatz</a>'
+            '<a href="#schreiben">Schreiben</a><a href="#pruefungsinfo">Prüfungsinfo</a></nav>',
+            '<h2 id="uebersicht">2-Tage-Lernplan</h2>', _study_plan_html(study_plan),
+            "<h2>Prüfungsteile</h2>",
+            _columns(f'<div class="teil-card"><h3>Teil {i}: {escape(teil)}</h3>'
+                     f"<p>{escape(exam_info['Exam Structure'][teil])}</p></div>"
+                     for i, teil in enumerate(["Lesen", "Schreiben", "Hören", "Sprechen"], 1)),
+            _app_link("intensiv", "Übungen und B1-Experte (AI)"),
+            '<h2 id="wortschatz">Wichtiger Wortschatz</h2>']
+    for category, items in vocab_data.items():
+        columns = _split(list(items.items()))
+        body.append(_details(f"📌 {category}", _columns(
+            "".join(f"<p><strong>{escape(word)}</strong><br>{_md(meaning)}</p>" for word, meaning in column)
+            for column in columns)))
+    body += ["<hr>", _details("📝 Verbkonjugation (Beispiele)", styles.table_html(verb_conjugation, "verb-table")),
+             _details("✍️ Weil/Denn Übung", _app_link("intensiv", "Übung in der App")),
+             '<h2 id="schreiben">Schreiben Vorlagen</h2>']
+    body += [_template_html(name, "Struktur:") for name in writing_templates]
+    body += ["<h3>Tipps für das Schreiben</h3>", _list(writing_tips, ordered=True),
+             '<h2 id="pruefungsinfo">Prüfungsinformationen</h2>',
+             _details("Bestandenkriterien",
+                      f"<p>{_md(exam_info['Passing Requirements']['description'])}</p>"
+                      + _list(exam_info["Passing Requirements"]["requirements"])),
+             _details("Prüfungsstruktur", "".join(
+                 f"<p><strong>{escape(part)}</strong>: {_md(text)}</p>"
+                 for part, text in exam_info["Exam Structure"].items())),
+             _details("Bewertungskriterien", styles.table_html(
+                 [list(scoring), *([str(v) for v in row] for row in zip(*scoring.values()))], "plain"))]
+    return _page("B1 Prüfung Intensivkurs", "\n".join(body), styles.INTENSIV, wide=True)
+
+
+def index_page() -> str:
+    links = "".join(f'<li><a href="{href}">{escape(label)}</a></li>' for href, label in PAGES[1:])
+    apps = "".join(f'<li><a href="{escape(url)}">{escape(name.capitalize())}</a></li>'
+                   for name, url in APP_URLS.items())
+    return _page("B1 Prüfung", f"<h1>🇩🇪 B1 Prüfung</h1><h2>Lerninhalte</h2><ul>{links}</ul>"
+                                f"<h2>Interaktiv (Übungen, AI, Prüfungssimulation)</h2><ul>{apps}</ul>")
+
+
+def export(out: Path) -> list:
+    """Write all pages to `out`; return the written paths."""
+    out.mkdir(parents=True, exist_ok=True)
+    pages = {
+        "index.html": index_page(),
+        "strategien.html": strategien_page(),
+        "blitz.html": blitz_page(out),
+        "intensiv.html": intensiv_page(),
+    }
+    written = []
+    for name, html in pages.items():
+        path = out / name
+        path.write_text(html, encoding="utf-8")
+        written.append(path)
+    return written
+
+
+# --- Benchmark --- #
+def _process_cpu_seconds(pid: int) -> float:
+    """utime + stime of `pid` from /proc (Linux)."""
+    fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def benchmark(views: int) -> dict:
+    """Server CPU per page view: a Streamlit script run vs. a static file."""
+    import tempfile
+
+    from streamlit.testing.v1 import AppTest
+
+    here = Path(__file__).resolve().parent
+    results = {}
+    for script, page in [("apps.py", "strategien.html"), ("franzfreinds.py", "blitz.html"),
+                         ("freundmitfranz.py", "intensiv.html")]:
+        AppTest.from_file(str(here / script), default_timeout=60).run()  # warm imports
+        start = time.process_time()
+        for _ in range(views):
+            AppTest.from_file(str(here / script), default_timeout=60).run()
+        streamlit_ms = (time.process_time() - start) / views * 1000
+        results[script] = {"streamlit_cpu_ms": round(streamlit_ms, 2), "page": page}
+
+    out = Path(tempfile.mkdtemp())
+    export(out)
+    server = subprocess.Popen([sys.executable, "-m", "http.server", "0", "--bind", "127.0.0.1",
+                               "-d", str(out)], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        port = int(re.search(r"port (\d+)", server.stdout.readline())[1])
+        for script, result in results.items():
+            url = f"http://127.0.0.1:{port}/{result['page']}"
+            urllib.request.urlopen(url).read()
+            before = _process_cpu_seconds(server.pid)
+            static_views = views * 20  # /proc has 10 ms resolution
+            for _ in range(static_views):
+                size = len(urllib.request.urlopen(url).read())
+            static_ms = (_process_cpu_seconds(server.pid) - before) / static_views * 1000
+            result.update(static_cpu_ms=round(static_ms, 3), static_bytes=size,
+                          ratio=round(result["streamlit_cpu_ms"] / max(static_ms, 1e-3)))
+    finally:
+        server.terminate()
+        shutil.rmtree(out)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export the read-only study content as static HTML.")
+    parser.add_argument("command", choices=["export", "benchmark"])
+    parser.add_argument("--out", type=Path, default=Path("site"))
+    parser.add_argument("--views", type=int, default=20, help="page views per path (benchmark)")
+    args = parser.parse_args(argv)
+    if args.command == "export":
+        for path in export(args.out):
+            print(path)
+        return 0
+    for script, result in benchmark(args.views).items():
+        print(f"{script:18} streamlit {result['streamlit_cpu_ms']:8.2f} ms CPU/view   "
+              f"{result['page']:16} static {result['static_cpu_ms']:6.3f} ms CPU/view "
+              f"({result['static_bytes']} bytes)   x{result['ratio']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Custom CSS of the apps, shared with the static export (`static_site.py`)."""
+from html import escape
+
+# apps.py
+STRATEGIEN = """
+.exam-card {
+    border-radius: 10px;
+    padding: 1.5rem;
+    margin: 1rem 0;
+    background-color: #f0f7ff;
+    box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+}
+.time-slot {
+    background-color: white;
+    padding: 0.5rem;
+    border-radius: 5px;
+    margin: 0.3rem 0;
+}
+.highlight {
+    background-color: #fff8e6;
+    padding: 0.2rem 0.5rem;
+    border-radius: 3px;
+}
+"""
+
+# franzfreinds.py
+BLITZ = """
+.teil-card {
+    border-radius: 10px;
+    padding: 1.5rem;
+    margin-bottom: 1rem;
+    background-color: white;
+    box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+    transition: transform 0.2s;
+}
+.teil-card:hover {
+    transform: translateY(-2px);
+}
+.vocab-card {
+    border-left: 4px solid #1a73e8;
+    padding: 1rem;
+    margin-bottom: 1rem;
+    background-color: #f8f9fa;
+}
+.time-slot {
+    background-color: #f0f7ff;
+    padding: 1rem;
+    border-radius: 8px;
+    margin-bottom: 1rem;
+}
+.progress-container {
+    margin: 1rem 0;
+}
+.stProgress > div > div > div > div {
+    background-color: #1a73e8;
+}
+"""
+
+# freundmitfranz.py
+INTENSIV = """
+.teil-card {
+    border-radius: 10px;
+    padding: 1.5rem;
+    margin-bottom: 1rem;
+    background-color: white;
+    box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+    transition: transform 0.2s;
+}
+.teil-card:hover {
+    transform: translateY(-2px);
+}
+.vocab-card {
+    border-left: 4px solid #1a73e8;
+    padding: 1rem;
+    margin-bottom: 1rem;
+    background-color: #f8f9fa;
+}
+.time-slot {
+    background-color: #f0f7ff;
+    padding: 1rem;
+    border-radius: 8px;
+    margin-bottom: 1rem;
+}
+.exercise-card {
+    background-color: #fff8e6;
+    padding: 1.5rem;
+    border-radius: 10px;
+    margin-bottom: 1.5rem;
+}
+.verb-table {
+    width: 100%;
+    border-collapse: collapse;
+    margin: 1rem 0;
+}
+.verb-table th, .verb-table td {
+    border: 1px solid #ddd;
+    padding: 8px;
+    text-align: left;
+}
+.verb-table tr:nth-child(even) {
+    background-color: #f2f2f2;
+}
+"""
+
+
+def table_html(rows, css_class: str) -> str:
+    """An HTML table with `rows[0]` as the header row."""
+    header, *body = rows
+    lines = ["<tr>" + "".join(f"<th>{escape(cell)}</th>" for cell in header) + "</tr>"]
+    lines += ["<tr>" + "".join(f"<td>{escape(cell)}</td>" for cell in row) + "</tr>" for row in body]
+    return f'<table class="{css_class}">' + "".join(lines) + "</table>"
@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The modules live at the top of the repository, next to the apps
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import llm_metrics  # noqa: E402
+import model_router  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    """Routing decisions depend on recent calls; start every test without any."""
+    llm_metrics._route_windows.clear()
+    llm_metrics._windows.clear()
+    model_router._in_flight.clear()
+    model_router.busy.clear()
+    yield
@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+import analytics
+
+ATTEMPTS = [
+    {"class": "B1a", "student": "s1", "part": "Lesen", "seconds": 600, "score": 0.8},
+    {"class": "B1a", "student": "s2", "part": "Lesen", "seconds": 1200, "score": 0.4},
+    {"class": "B1a", "student": "s1", "part": "Schreiben", "seconds": 1800,
+     "Erfüllung": 1.0, "Kohärenz": 0.5, "Wortschatz": 0.5, "Strukturen": 0.6},
+    {"class": "B1b", "student": "s3", "part": "Lesen", "seconds": 300, "score": 1.0},
+    {"class": "B1a", "student": "s2", "part": "Lesen", "seconds": 60, "category": "Präpositionen",
+     "score": 0.3},
+    {"class": "B1a", "student": "s1", "part": "Lesen", "seconds": 60, "category": "Präpositionen",
+     "score": 0.9},
+    {"class": "B1a", "student": "s1", "part": "Hören", "seconds": 900},  # not graded
+]
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / "analytics.db")
+    analytics.record_many(ATTEMPTS, path)
+    return path
+
+
+def test_part_summary_per_class(path):
+    parts = analytics.part_summary(analytics.load(path), "B1a")
+    assert list(parts.index) == ["Lesen", "Hören", "Schreiben"]
+    lesen = parts.loc["Lesen"]
+    assert (lesen["attempts"], lesen["graded"], lesen["passed"]) == (4, 4, 2)
+    assert lesen["mean_score"] == pytest.approx((0.8 + 0.4 + 0.3 + 0.9) / 4)
+    assert lesen["mean_minutes"] == pytest.approx((600 + 1200 + 60 + 60) / 4 / 60)
+    # Without an overall score, the mean of the criteria counts: 0.65 passes
+    assert parts.loc["Schreiben", "mean_score"] == pytest.approx(0.65)
+    assert parts.loc["Schreiben", "pass_rate"] == 1
+    assert parts.loc["Hören", "graded"] == 0 and pd.isna(parts.loc["Hören", "pass_rate"])
+
+
+def test_part_summary_all_classes(path):
+    parts = analytics.part_summary(analytics.load(path))
+    assert parts.loc["Lesen", "attempts"] == 5
+    assert parts.loc["Lesen", "passed"] == 3
+
+
+def test_category_summary(path):
+    categories = analytics.category_summary(analytics.load(path), "B1a")
+    assert list(categories.index) == ["Präpositionen"]
+    assert categories.loc["Präpositionen", "pass_rate"] == pytest.approx(0.5)
+    assert analytics.category_summary(analytics.load(path), "B1b").empty
+
+
+def test_score_distribution(path):
+    histogram = analytics.score_distribution(analytics.load(path), "Lesen", "B1a")
+    assert histogram[analytics.OVERALL].sum() == pytest.approx(1)
+    assert histogram.loc["80–90%", analytics.OVERALL] == pytest.approx(0.25)
+    schreiben = analytics.score_distribution(analytics.load(path), "Schreiben", "B1a")
+    assert schreiben.loc["90–100%", "Erfüllung"] == 1  # a full score lands in the top bin
+
+
+def test_time_distribution(path):
+    times = analytics.time_distribution(analytics.load(path), "B1a")
+    assert times["Lesen"].sum() == 4
+    assert times.loc["1–2 min", "Lesen"] == 2
+
+
+def test_incremental_updates_match_rebuild(path):
+    analytics.record("B1a", "s4", "Lesen", seconds=120, score=0.7, path=path)
+    incremental = analytics.load(path)
+    analytics.rebuild(path)
+    rebuilt = analytics.load(path)
+    for table, (keys, _) in analytics._AGGREGATES.items():
+        pd.testing.assert_frame_equal(incremental[table].sort_values(keys).reset_index(drop=True),
+                                      rebuilt[table].sort_values(keys).reset_index(drop=True),
+                                      check_dtype=False)
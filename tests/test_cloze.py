@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+import cloze
+
+DATA = {
+    "title": "Präpositionen",
+    "instruction": "Ergänzen Sie.",
+    "items": [
+        {"text": "___ des Regens bleiben wir zu Hause.", "answers": ["Wegen"],
+         "explanation": "wegen + Genitiv", "mistakes": {"weil": "„weil“ leitet einen Nebensatz ein."}},
+        {"text": "___ des Essens sprechen wir nicht.", "answers": ["Während"],
+         "explanation": "während + Genitiv"},
+        {"text": "Ich fahre ___ Bus.", "answers": ["mit dem", "mit'm"], "explanation": "mit + Dativ"},
+    ],
+}
+
+
+@pytest.fixture
+def exercise():
+    return cloze.ClozeSet("test", DATA)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("  Während. ", "waehrend"),
+    ("WAEHREND", "waehrend"),
+    ("Straße", "strasse"),
+    ("„mit   dem“", "mit dem"),
+    ("", ""),
+])
+def test_normalize(text, expected):
+    assert cloze.normalize(text) == expected
+
+
+def test_grade_accepts_spelling_variants(exercise):
+    results = exercise.grade(["wegen", "waehrend", "Mit dem!"])
+    assert [r.correct for r in results] == [True, True, True]
+    assert results[0].expected == "Wegen"
+
+
+def test_grade_explains_known_mistakes(exercise):
+    result = exercise.grade(["weil", "", ""])[0]
+    assert not result.correct
+    assert "Nebensatz" in result.hint
+    assert result.explanation == "wegen + Genitiv"
+
+
+def test_missing_umlaut_gets_a_hint(exercise):
+    result = exercise.grade(["", "Wahrend", ""])[1]
+    assert not result.correct and result.hint == cloze.UMLAUT_HINT
+    assert exercise.grade(["", "", ""])[1].hint == ""  # an empty answer is just wrong
+
+
+def test_grade_batch(exercise):
+    correct = exercise.grade_batch([
+        ["Wegen", "während", "mit dem"],
+        ["weil", "Wahrend", "mit den"],
+        ["wegen", "", "mit'm"],
+    ])
+    assert correct.dtype == bool
+    np.testing.assert_array_equal(correct, [[True, True, True], [False, False, False], [True, False, True]])
+
+
+def test_an_answer_to_another_item_is_wrong(exercise):
+    assert not exercise.grade_batch([["Während", "Wegen", "mit dem"]])[0, :2].any()
+
+
+@pytest.mark.parametrize("name", sorted(cloze.SETS))
+def test_batch_matches_single_grading(name):
+    exercise = cloze.SETS[name]
+    submissions = cloze._submissions(exercise, 50)
+    expected = [[r.correct for r in exercise.grade(answers)] for answers in submissions]
+    np.testing.assert_array_equal(exercise.grade_batch(submissions), expected)
@@ -0,0 +1,89 @@
+import pytest
+
+import content
+import duplicates
+
+ORIGINAL = ("Liebe Frau Müller, vielen Dank für Ihre Einladung zum Sommerfest am nächsten Samstag. "
+            "Leider kann ich nicht kommen, weil meine Schwester an diesem Tag heiratet und ich ihr "
+            "bei den Vorbereitungen helfen möchte. Ich hoffe, dass wir uns bald wiedersehen und "
+            "wünsche Ihnen ein schönes Fest mit vielen Gästen. Viele Grüße, Ihre Maria")
+# A few words changed: still a copy
+NEAR_COPY = ORIGINAL.replace("Samstag", "Sonntag").replace("Maria", "Olga").replace("schönes", "tolles")
+DIFFERENT = ("Hallo Peter, ich habe deine Nachricht bekommen und freue mich sehr über deine Idee. "
+             "Am Wochenende habe ich Zeit, wir können zusammen ins Kino gehen oder im Park grillen. "
+             "Was meinst du, sollen wir auch Jonas und Lea fragen? Schreib mir bitte bis Donnerstag, "
+             "dann kaufe ich alles ein. Bis bald, dein Tim")
+
+
+@pytest.fixture
+def store(tmp_path):
+    return duplicates.Store(str(tmp_path / "duplicates.db"))
+
+
+def test_near_copy_is_flagged(store):
+    assert store.add("a", ORIGINAL, class_id="B1a", student="s1") == []
+    matches = store.add("b", NEAR_COPY, class_id="B1a", student="s2")
+    assert [m.id for m in matches] == ["a"]
+    assert duplicates.THRESHOLD <= matches[0].similarity < 1
+
+
+def test_different_text_is_not_flagged(store):
+    store.add("a", ORIGINAL, student="s1")
+    assert store.add("b", DIFFERENT, student="s2") == []
+
+
+def test_similarity_estimate_is_close_to_jaccard():
+    sig_a, sig_b = duplicates.signature(ORIGINAL), duplicates.signature(NEAR_COPY)
+    a, b = set(duplicates.shingles(ORIGINAL)), set(duplicates.shingles(NEAR_COPY))
+    estimate = (sig_a == sig_b).mean()
+    assert estimate == pytest.approx(len(a & b) / len(a | b), abs=0.15)
+
+
+def test_drafts_of_the_same_student_are_not_copies(store):
+    store.add("a", ORIGINAL, student="s1")
+    assert store.add("b", NEAR_COPY, student="s1") == []
+
+
+def test_short_texts_are_not_checked(store):
+    short = "Vielen Dank für Ihre Einladung, leider kann ich nicht kommen."
+    assert duplicates.signature(short) is None
+    store.add("a", short, student="s1")
+    assert store.add("b", short, student="s2") == []
+
+
+def test_copied_template_is_flagged(store):
+    name, template = next((name, t) for name, t in content.writing_templates.items()
+                          if duplicates.signature(t["example"]) is not None)
+    matches = store.add("a", template["example"], student="s1")
+    assert [m.id for m in matches] == [duplicates.TEMPLATE_PREFIX + name]
+
+
+def test_the_same_submission_is_indexed_once(store):
+    store.add("a", ORIGINAL, student="s1")
+    assert store.add("a", ORIGINAL, student="s1") == []
+    assert len(store.index) == len(store.index._row)
+
+
+def test_submissions_of_other_processes_are_found(tmp_path):
+    path = str(tmp_path / "duplicates.db")
+    app, api = duplicates.Store(path), duplicates.Store(path)
+    app.add("a", ORIGINAL, class_id="B1a", student="s1")
+    assert [m.id for m in api.add("b", NEAR_COPY, class_id="B1a", student="s2")] == ["a"]
+
+
+def test_flags_per_class(store):
+    store.add("a", ORIGINAL, class_id="B1a", student="s1")
+    store.add("b", NEAR_COPY, class_id="B1a", student="s2")
+    store.add("c", DIFFERENT, class_id="B1b", student="s3")
+    flags = store.flags("B1a")
+    assert list(zip(flags["submission"], flags["match"], flags["match_student"])) == [("b", "a", "s1")]
+    assert store.flags("B1b").empty
+
+
+def test_a_failing_check_never_raises(monkeypatch):
+    class Broken:
+        def add(self, *args, **kwargs):
+            raise OSError("disk full")
+
+    monkeypatch.setattr(duplicates, "STORE", Broken())
+    assert duplicates.add("a", ORIGINAL, student="s1") == []
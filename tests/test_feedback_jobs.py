@@ -0,0 +1,139 @@
+import pytest
+
+import duplicates
+import feedback_jobs
+import llm_metrics
+
+TEXT = "Liebe Anna, vielen Dank für deine Einladung. Leider kann ich am Samstag nicht kommen."
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(duplicates, "STORE", duplicates.Store(str(tmp_path / "duplicates.db")))
+    db = feedback_jobs._connect(str(tmp_path / "jobs.db"))
+    yield db
+    db.close()
+
+
+def _ok(job):
+    return {"response": f"Feedback zu: {job['text'][:10]}", "model": "fake"}
+
+
+def _fail(job):
+    raise TimeoutError("model timed out")
+
+
+def _expire_lease(db, key):
+    db.execute("UPDATE jobs SET lease_until = 0 WHERE key = ?", (key,))
+
+
+def _make_ready(db, key):
+    db.execute("UPDATE jobs SET not_before = 0 WHERE key = ?", (key,))
+
+
+def test_submitting_twice_finds_the_same_job(db):
+    key = feedback_jobs.submit("s1", TEXT, db=db)
+    assert feedback_jobs.submit("s1", TEXT, db=db) == key
+    assert feedback_jobs.submit("s2", TEXT, db=db) != key  # another student, another job
+    assert db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 2
+
+
+def test_claim_takes_the_oldest_job_once(db):
+    first = feedback_jobs.submit("s1", TEXT, db=db)
+    feedback_jobs.submit("s2", TEXT, db=db)
+    job = feedback_jobs._claim(db, "w1")
+    assert (job["key"], job["status"], job["attempts"], job["worker"]) == (first, "running", 1, "w1")
+    assert job["lease_until"] > job["started"]
+    assert feedback_jobs._claim(db, "w2")["key"] != first
+    assert feedback_jobs._claim(db, "w3") is None
+
+
+def test_expired_lease_is_claimed_again(db):
+    key = feedback_jobs.submit("s1", TEXT, db=db)
+    feedback_jobs._claim(db, "w1")
+    assert feedback_jobs._claim(db, "w2") is None  # w1 still holds the lease
+    _expire_lease(db, key)
+    job = feedback_jobs._claim(db, "w2")
+    assert (job["worker"], job["attempts"]) == ("w2", 2)
+
+
+def test_run_one_stores_the_result(db):
+    key = feedback_jobs.submit("s1", TEXT, db=db)
+    assert feedback_jobs.run_one(db, "w1", _ok)
+    job = feedback_jobs.get(key, db)
+    assert (job["status"], job["result"], job["model"]) == ("done", "Feedback zu: Liebe Anna", "fake")
+    assert not feedback_jobs.run_one(db, "w1", _ok)
+
+
+def test_failed_attempt_is_retried_after_a_backoff(db):
+    key = feedback_jobs.submit("s1", TEXT, db=db)
+    feedback_jobs.run_one(db, "w1", _fail)
+    job = feedback_jobs.get(key, db)
+    assert job["status"] == "queued" and "TimeoutError" in job["error"]
+    assert job["not_before"] - job["created"] >= feedback_jobs.BACKOFF_SECONDS
+    assert feedback_jobs._claim(db, "w1") is None  # still backing off
+    _make_ready(db, key)
+    assert feedback_jobs.run_one(db, "w1", _ok)
+    job = feedback_jobs.get(key, db)
+    assert (job["status"], job["attempts"], job["error"]) == ("done", 2, None)
+
+
+def test_backoff_doubles(db):
+    key = feedback_jobs.submit("s1", TEXT, db=db)
+    delays = []
+    for _ in range(2):
+        _make_ready(db, key)
+        feedback_jobs.run_one(db, "w1", _fail)
+        job = feedback_jobs.get(key, db)
+        delays.append(job["not_before"] - job["started"])
+    assert delays[1] > delays[0] * 1.3
+
+
+def test_job_fails_after_max_attempts(db):
+    key = feedback_jobs.submit("s1", TEXT, db=db)
+    for _ in range(feedback_jobs.MAX_ATTEMPTS):
+        _make_ready(db, key)
+        assert feedback_jobs.run_one(db, "w1", _fail)
+    job = feedback_jobs.get(key, db)
+    assert (job["status"], job["attempts"]) == ("failed", feedback_jobs.MAX_ATTEMPTS)
+    _make_ready(db, key)
+    assert feedback_jobs._claim(db, "w1") is None
+    # Asking again after a final failure starts over
+    feedback_jobs.submit("s1", TEXT, db=db)
+    assert (feedback_jobs.get(key, db)["status"], feedback_jobs.get(key, db)["attempts"]) == ("queued", 0)
+
+
+def test_worker_lost_on_the_last_attempt_fails_the_job(db):
+    key = feedback_jobs.submit("s1", TEXT, db=db)
+    for _ in range(feedback_jobs.MAX_ATTEMPTS):
+        assert feedback_jobs._claim(db, "w1")["key"] == key
+        _expire_lease(db, key)  # the worker died
+    assert feedback_jobs._claim(db, "w2") is None
+    job = feedback_jobs.get(key, db)
+    assert job["status"] == "failed"
+    assert job["error"] == f"worker lost on attempt {feedback_jobs.MAX_ATTEMPTS}"
+
+
+def test_late_result_of_a_replaced_worker_is_ignored(db):
+    key = feedback_jobs.submit("s1", TEXT, db=db)
+
+    def slow(job):  # w1's lease runs out while the model is still busy, and w2 takes over
+        _expire_lease(db, key)
+        assert feedback_jobs._claim(db, "w2")["key"] == key
+        return _ok(job)
+
+    feedback_jobs.run_one(db, "w1", slow)
+    job = feedback_jobs.get(key, db)
+    assert (job["status"], job["worker"], job["result"]) == ("running", "w2", None)
+
+
+def test_stats_and_gauges(db):
+    done = feedback_jobs.submit("s1", TEXT, db=db)
+    feedback_jobs.submit("s2", TEXT, db=db)
+    feedback_jobs.run_one(db, "w1", _ok)
+    report = feedback_jobs.stats(db)
+    assert (report["queued"], report["running"], report["done"], report["failed"]) == (1, 0, 1, 0)
+    assert feedback_jobs.get(done, db)["status"] == "done"
+    assert report["completed_per_minute"] > 0
+    metrics = llm_metrics.render_prometheus()
+    assert "frenzguru_feedback_jobs_queued{} 1" in metrics
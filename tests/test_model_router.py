@@ -0,0 +1,57 @@
+import llm_metrics
+import model_router
+
+ROUTE = model_router.ROUTES[model_router.QA]
+
+
+def _call(wall_seconds, error=None, queue_seconds=0.0):
+    response = None if error else {"total_duration": int((wall_seconds - queue_seconds) * 1e9)}
+    llm_metrics.record_call(response, model=ROUTE.model, wall_seconds=wall_seconds, template="t",
+                            template_version="1", route=model_router.QA, error=error)
+
+
+def test_primary_model_without_history():
+    assert model_router.choose(model_router.QA) == (ROUTE.model, False)
+
+
+def test_too_few_samples_keep_the_primary():
+    for _ in range(model_router.SLO_MIN_SAMPLES - 1):
+        _call(ROUTE.slo_seconds * 3)
+    assert model_router.choose(model_router.QA) == (ROUTE.model, False)
+
+
+def test_slow_calls_downgrade():
+    for _ in range(model_router.SLO_MIN_SAMPLES):
+        _call(ROUTE.slo_seconds * 2)
+    assert model_router.choose(model_router.QA) == (ROUTE.fallback, True)
+
+
+def test_queue_time_downgrades():
+    for _ in range(model_router.SLO_MIN_SAMPLES):
+        _call(ROUTE.max_queue_seconds + 1.5, queue_seconds=ROUTE.max_queue_seconds + 1)
+    assert model_router.choose(model_router.QA) == (ROUTE.fallback, True)
+
+
+def test_failed_calls_downgrade():
+    for _ in range(model_router.SLO_MIN_SAMPLES):
+        _call(0.1, error=TimeoutError("timed out"))
+    assert model_router.choose(model_router.QA) == (ROUTE.fallback, True)
+
+
+def test_fast_calls_keep_the_primary():
+    for _ in range(20):
+        _call(ROUTE.slo_seconds / 4)
+    _call(0.1, error=TimeoutError("timed out"))  # one failure among many is within the p95
+    assert model_router.choose(model_router.QA) == (ROUTE.model, False)
+
+
+def test_busy_primary_downgrades():
+    model_router._in_flight[ROUTE.model] = ROUTE.max_in_flight
+    assert model_router.choose(model_router.QA) == (ROUTE.fallback, True)
+
+
+def test_other_routes_are_not_affected():
+    for _ in range(model_router.SLO_MIN_SAMPLES):
+        _call(ROUTE.slo_seconds * 2)
+    feedback = model_router.ROUTES[model_router.FEEDBACK]
+    assert model_router.choose(model_router.FEEDBACK) == (feedback.model, False)
@@ -0,0 +1,128 @@
+import threading
+import time
+
+import pytest
+
+import conversations
+import llm
+import model_router
+import prefetch
+import response_cache
+
+TEMPLATE = prefetch.TEMPLATE
+QUESTION = "Welche Redemittel passen zu dieser Schreibaufgabe?"
+
+
+class FakeOllama:
+    """Counts model calls; streams `chunks` chunks of `text`, then a final one."""
+
+    def __init__(self, text="Antwort vom Modell", chunks=3, delay=0.0):
+        self.text, self.chunks, self.delay = text, chunks, delay
+        self.calls = 0
+
+    def generate(self, model, prompt, options=None, stream=False, **kwargs):
+        self.calls += 1
+        if stream:
+            return self._stream()
+        return {"response": self.text, "done": True, "model": model}
+
+    def _stream(self):
+        for _ in range(self.chunks):
+            time.sleep(self.delay)
+            yield {"response": self.text}
+        yield {"response": "", "done": True}
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    fake = FakeOllama()
+    monkeypatch.setattr(llm.ollama, "generate", fake.generate)
+    return fake
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = response_cache.ResponseCache()
+    monkeypatch.setattr(response_cache, "CACHE", cache)
+    cache.put(TEMPLATE.name, TEMPLATE.version, TEMPLATE.render(QUESTION), "Vorab berechnet", "llama3.2:3b")
+    return cache
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = conversations.ConversationStore(spill_path=str(tmp_path / "conversations.db"))
+    monkeypatch.setattr(conversations, "STORE", store)
+    return store
+
+
+def _ask(conversation=None):
+    return model_router.generate(model_router.QA, TEMPLATE.render(QUESTION), template=TEMPLATE.name,
+                                 template_version=TEMPLATE.version, system=TEMPLATE.system,
+                                 conversation=conversation)
+
+
+def test_first_question_is_answered_from_the_cache(ollama, cache, store):
+    with store.session("s1") as conversation:
+        assert _ask(conversation)["response"] == "Vorab berechnet"
+        assert conversation.turns == [[TEMPLATE.render(QUESTION), "Vorab berechnet"]]
+    assert ollama.calls == 0
+    assert cache.report()["hits"] == 1
+
+
+def test_follow_up_bypasses_the_cache(ollama, cache, store):
+    with store.session("s1") as conversation:
+        conversation.update("llama3.2:3b", "Was heißt wegen?", {"response": "because of"})
+        assert _ask(conversation)["response"] == "Antwort vom Modell"
+    assert ollama.calls == 1
+    assert cache.report()["lookups"] == 0  # a bypass does not count as a miss
+
+
+def test_without_conversation_the_cache_is_used(ollama, cache):
+    assert _ask()["response"] == "Vorab berechnet"
+    assert ollama.calls == 0
+
+
+def test_no_prefetch_for_sessions_with_turns(store, monkeypatch):
+    prefetcher = prefetch.Prefetcher(response_cache.ResponseCache())
+    prefetcher._thread = threading.Thread()  # keep the worker from starting
+    monkeypatch.setattr(prefetch, "PREFETCHER", prefetcher)
+    monkeypatch.setattr(prefetch, "ENABLED", True)
+    exercise = {"task": "Schreiben Sie eine E-Mail.", "hints": "Dank, Frage"}
+    with store.session("s1") as conversation:
+        conversation.update("llama3.2:3b", "Frage", {"response": "Antwort"})
+
+    assert prefetch.submit("Schreiben", exercise, "s1")  # the buttons are still shown
+    assert not prefetcher._jobs
+    prefetch.submit("Schreiben", exercise, "new-session")
+    assert len(prefetcher._jobs) == prefetcher.top
+
+
+def test_running_job_is_not_queued_again():
+    prefetcher = prefetch.Prefetcher(response_cache.ResponseCache())
+    prefetcher._thread = threading.Thread()
+    exercise = {"task": "Schreiben Sie eine E-Mail.", "hints": "Dank, Frage"}
+    first = prefetch.predict("Schreiben", exercise)[0]
+    prompt = TEMPLATE.render(first.text)
+    prefetcher._running = prefetch._Job(first.text, model_router.QA, prompt)
+    prefetcher.submit("Schreiben", exercise)
+    assert prompt not in prefetcher._jobs
+    assert len(prefetcher._jobs) == prefetcher.top - 1
+
+
+def test_prefetch_stops_while_the_model_reasons(monkeypatch):
+    fake = FakeOllama(text="<think>hmm ", chunks=1000, delay=0.005)  # never leaves the reasoning
+    monkeypatch.setattr(llm.ollama, "generate", fake.generate)
+    prefetcher = prefetch.Prefetcher(response_cache.ResponseCache())
+    job = prefetch._Job(QUESTION, model_router.QA, TEMPLATE.render(QUESTION))
+    threading.Timer(0.05, model_router.busy.set).start()
+    start = time.monotonic()
+    assert prefetcher._run(job) is False
+    assert time.monotonic() - start < 1  # the full answer would take 5 s
+    assert not prefetcher.cache.contains(TEMPLATE.name, TEMPLATE.version, job.prompt)
+
+
+def test_finished_prefetch_fills_the_cache(ollama):
+    prefetcher = prefetch.Prefetcher(response_cache.ResponseCache())
+    job = prefetch._Job(QUESTION, model_router.QA, TEMPLATE.render(QUESTION))
+    assert prefetcher._run(job) is True
+    assert prefetcher.cache.contains(TEMPLATE.name, TEMPLATE.version, job.prompt)
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+import reading_grader
+
+FULL = ("Der Frühling geht von März bis Mai, die Tage werden länger und die Blumen blühen. "
+        "Im Sommer machen viele Urlaub an der Ostsee.")
+HALF = "Der Frühling geht von März bis Mai und die Tage werden länger."
+
+
+@pytest.fixture
+def no_references(monkeypatch):
+    monkeypatch.setattr(reading_grader, "references", lambda: None)
+
+
+@pytest.fixture
+def references(monkeypatch):
+    """Two reference rows for exercise 0; `_embed` returns the first one for every answer."""
+    matrix = np.eye(2, 4, dtype=np.float32)
+    refs = reading_grader.References(matrix, np.array([0, 0], dtype=np.int32), "test")
+    monkeypatch.setattr(reading_grader, "references", lambda: refs)
+    monkeypatch.setattr(reading_grader, "_embed", lambda texts: np.tile(matrix[0], (len(list(texts)), 1)))
+
+
+def test_keywords_only_without_references(no_references):
+    full, half, empty = reading_grader.grade_batch(0, [FULL, HALF, ""], judge=False)
+    assert (full.source, full.verdict, full.score, full.missing) == ("keywords", "richtig", 1.0, ())
+    assert half.coverage == pytest.approx(0.5) and half.verdict == "unsicher"
+    assert half.missing == ("Blumen", "Urlaub", "Nordsee")
+    assert (empty.score, empty.verdict) == (0.0, "falsch")
+
+
+def test_keywords_when_embedding_fails(references, monkeypatch):
+    def unreachable(texts):
+        raise ConnectionError("ollama is down")
+
+    monkeypatch.setattr(reading_grader, "_embed", unreachable)
+    grades = reading_grader.grade_batch(0, [FULL, HALF], judge=False)
+    assert [g.source for g in grades] == ["keywords", "keywords"]
+    assert [g.similarity for g in grades] == [0.0, 0.0]
+    assert grades[0].verdict == "richtig"
+
+
+def test_embedding_and_keywords_combined(references):
+    full, half, empty = reading_grader.grade_batch(0, [FULL, HALF, ""], judge=False)
+    assert full.source == "embedding" and full.similarity == pytest.approx(1.0)
+    expected = reading_grader.SIMILARITY_WEIGHT + (1 - reading_grader.SIMILARITY_WEIGHT) * 0.5
+    assert half.score == pytest.approx(expected, abs=1e-3)
+    assert empty.similarity == 0.0 and empty.verdict == "falsch"  # not embedded
+
+
+def test_only_borderline_answers_go_to_the_judge(no_references, monkeypatch):
+    judged = []
+
+    def judge(index, answer, score):
+        judged.append(answer)
+        return True, "passt"
+
+    monkeypatch.setattr(reading_grader, "_judge", judge)
+    full, half = reading_grader.grade_batch(0, [FULL, HALF])
+    assert judged == [HALF]
+    assert (half.verdict, half.source, half.reason) == ("richtig", "llm", "passt")
+    assert full.source == "keywords"
+
+
+def test_undecided_judge_keeps_the_verdict_open(no_references, monkeypatch):
+    monkeypatch.setattr(reading_grader, "_judge", lambda index, answer, score: None)
+    assert reading_grader.grade(0, HALF).verdict == "unsicher"
+
+
+def test_missing_reference_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(reading_grader, "REFERENCES_PATH", tmp_path / "missing.npz")
+    monkeypatch.setattr(reading_grader, "_references", None)
+    assert reading_grader.references() is None
+
+
+def test_stale_reference_file_is_ignored(tmp_path, monkeypatch):
+    path = tmp_path / "reading_references.npz"
+    np.savez(path, matrix=np.eye(2, dtype=np.float32), exercise=np.array([0, 1]), version="old")
+    monkeypatch.setattr(reading_grader, "REFERENCES_PATH", path)
+    monkeypatch.setattr(reading_grader, "_references", None)
+    assert reading_grader.references() is None
+
+
+def test_unknown_exercise():
+    with pytest.raises(KeyError):
+        reading_grader.grade_batch(99, ["x"])